@@ -0,0 +1,185 @@
+from collections import Counter, defaultdict
+from functools import lru_cache
+import threading
+import numpy as np
+import pandas as pd
+from config import ALERTAS_DATA_PATH, ALERTAS_EXPORT_CHUNK
+
+# ============================================================
+# DATOS DE ALERTAS EN MEMORIA CON ÍNDICES PRECALCULADOS
+# ============================================================
+
+# Datos de ejemplo (en producción vendrían de la API o de ALERTAS_DATA_PATH)
+ALERTAS_DEMO = {
+    'Municipio': ['Cartagena', 'Barranquilla', 'Santa Marta', 'Magangué', 'Turbaco', 'Soledad', 'Malambo', 'Ciénaga', 'Sabanalarga', 'Baranoa'],
+    'Departamento': ['Bolívar', 'Atlántico', 'Magdalena', 'Bolívar', 'Bolívar', 'Atlántico', 'Atlántico', 'Magdalena', 'Atlántico', 'Atlántico'],
+    'Tasa_Proyectada': [45.2, 38.7, 32.1, 51.3, 28.4, 41.8, 35.2, 29.7, 33.5, 27.8],
+    'Cluster': [2, 2, 1, 3, 1, 2, 2, 1, 2, 1],
+    'Nivel_Alerta': ['Alto', 'Alto', 'Medio', 'Crítico', 'Medio', 'Alto', 'Alto', 'Medio', 'Alto', 'Medio'],
+    'Poblacion_Menores': [185430, 234567, 98234, 45678, 23456, 156789, 87654, 56789, 34567, 28901]
+}
+
+# Opción de ordenamiento -> (columna, descendente)
+SORT_KEYS = {
+    'tasa_desc': ('Tasa_Proyectada', True),
+    'tasa_asc': ('Tasa_Proyectada', False),
+    'municipio_asc': ('Municipio', False),
+    'poblacion_desc': ('Poblacion_Menores', True)
+}
+
+NIVELES_ALERTA = ['Crítico', 'Alto', 'Medio', 'Bajo']
+
+_EMPTY = np.empty(0, dtype=np.intp)
+
+
+class AlertasAgregados:
+    """
+    Conteos de municipios por nivel y por (departamento, nivel). Se calculan
+    una vez y luego se actualizan de forma incremental al cambiar un municipio.
+    """
+
+    def __init__(self, departamentos, niveles):
+        self.por_nivel = Counter(niveles)
+        self.por_departamento = defaultdict(Counter)
+        for departamento, nivel in zip(departamentos, niveles):
+            self.por_departamento[departamento][nivel] += 1
+
+    def counts(self, departamento='all'):
+        """Conteo por nivel, global o de un departamento (sin recorrer la tabla)"""
+        if departamento == 'all':
+            source = self.por_nivel
+        else:
+            source = self.por_departamento.get(departamento, Counter())
+        return {nivel: source.get(nivel, 0) for nivel in NIVELES_ALERTA}
+
+    def move(self, departamento, nivel_anterior, nivel_nuevo):
+        if nivel_anterior == nivel_nuevo:
+            return
+        self.por_nivel[nivel_anterior] -= 1
+        self.por_nivel[nivel_nuevo] += 1
+        self.por_departamento[departamento][nivel_anterior] -= 1
+        self.por_departamento[departamento][nivel_nuevo] += 1
+
+
+class AlertasIndex:
+    """
+    Tabla de alertas cargada una vez, con índices departamento -> ids,
+    nivel -> ids y una permutación pre-ordenada por cada opción de orden.
+    Filtrar + ordenar es una intersección de índices, sin recorrer la tabla.
+
+    Las consultas no toman el lock: update_municipio nunca modifica en sitio
+    lo que ellas leen, sino que reemplaza de una vez el par (orden, rango)
+    de cada opción y el diccionario by_nivel completo.
+    """
+
+    def __init__(self, data):
+        self.data = data.reset_index(drop=True)
+        self.by_departamento = self._build_index('Departamento')
+        self.by_nivel = self._build_index('Nivel_Alerta')
+        self.orders = {}
+        for option, (column, descending) in SORT_KEYS.items():
+            values = self.data[column].to_numpy()
+            # Las columnas con orden descendente son numéricas
+            self._set_order(option, np.argsort(-values if descending else values, kind='stable'))
+        self.agregados = AlertasAgregados(
+            self.data['Departamento'].tolist(), self.data['Nivel_Alerta'].tolist()
+        )
+        self._lock = threading.Lock()
+
+    def _set_order(self, option, order):
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        # Una sola asignación: una consulta nunca ve un orden con el rango de otro
+        self.orders[option] = (order, rank)
+
+    def _build_index(self, column):
+        return {
+            key: np.sort(ids).astype(np.intp)
+            for key, ids in self.data.groupby(column, sort=False).indices.items()
+        }
+
+    def update_municipio(self, row_id, tasa, nivel):
+        """
+        Actualiza la tasa y el nivel de un municipio. Conteos, índice de nivel
+        y permutaciones por tasa se ajustan sin recalcular la tabla completa.
+        """
+        with self._lock:
+            departamento = self.data.at[row_id, 'Departamento']
+            nivel_anterior = self.data.at[row_id, 'Nivel_Alerta']
+
+            if nivel != nivel_anterior:
+                by_nivel = dict(self.by_nivel)
+                old_ids = by_nivel[nivel_anterior]
+                by_nivel[nivel_anterior] = np.delete(old_ids, np.searchsorted(old_ids, row_id))
+                new_ids = by_nivel.get(nivel, _EMPTY)
+                by_nivel[nivel] = np.insert(new_ids, np.searchsorted(new_ids, row_id), row_id)
+                # Los dos niveles cambian a la vez para las consultas en curso
+                self.by_nivel = by_nivel
+                self.agregados.move(departamento, nivel_anterior, nivel)
+                self.data.at[row_id, 'Nivel_Alerta'] = nivel
+
+            self.data.at[row_id, 'Tasa_Proyectada'] = tasa
+            values = self.data['Tasa_Proyectada'].to_numpy()
+            for option, (column, descending) in SORT_KEYS.items():
+                if column != 'Tasa_Proyectada':
+                    continue
+                # Sacar la fila de la permutación y reinsertarla por búsqueda binaria
+                order, rank = self.orders[option]
+                order = np.delete(order, rank[row_id])
+                keys = -values[order] if descending else values[order]
+                position = np.searchsorted(keys, -tasa if descending else tasa, side='right')
+                self._set_order(option, np.insert(order, position, row_id))
+
+    def __len__(self):
+        return len(self.data)
+
+    def query(self, departamento='all', nivel='all', sort_option='tasa_desc'):
+        """Ids de fila que cumplen los filtros, en el orden solicitado"""
+        order, rank = self.orders.get(sort_option, (None, None))
+        candidates = []
+        if departamento != 'all':
+            candidates.append(self.by_departamento.get(departamento, _EMPTY))
+        if nivel != 'all':
+            candidates.append(self.by_nivel.get(nivel, _EMPTY))
+
+        if not candidates:
+            return order if order is not None else np.arange(len(self.data))
+
+        ids = candidates[0]
+        for other in candidates[1:]:
+            ids = np.intersect1d(ids, other, assume_unique=True)
+
+        if rank is None:
+            return ids
+        return ids[np.argsort(rank[ids], kind='stable')]
+
+    def rows(self, ids):
+        """Materializa solo las filas pedidas (p. ej. una página)"""
+        return self.data.iloc[ids]
+
+    def iter_csv(self, ids, chunk_size=ALERTAS_EXPORT_CHUNK):
+        """
+        CSV de las filas `ids` en bloques de `chunk_size` filas, para
+        transmitirlo sin construir el archivo completo en memoria.
+        """
+        # BOM para que Excel reconozca UTF-8 (tildes y eñes)
+        yield '\ufeff' + ','.join(self.data.columns) + '\n'
+        for start in range(0, len(ids), chunk_size):
+            yield self.data.iloc[ids[start:start + chunk_size]].to_csv(header=False, index=False)
+
+    def top(self, n, sort_option='tasa_desc'):
+        """Primeras n filas según una permutación pre-ordenada"""
+        order, _ = self.orders[sort_option]
+        return self.data.iloc[order[:n]]
+
+
+def load_alertas_data():
+    if ALERTAS_DATA_PATH:
+        return pd.read_csv(ALERTAS_DATA_PATH)
+    return pd.DataFrame(ALERTAS_DEMO)
+
+
+@lru_cache(maxsize=1)
+def get_alertas_index():
+    """Índice de alertas del proceso (se carga una sola vez)"""
+    return AlertasIndex(load_alertas_data())
@@ -1,8 +1,10 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, Field, create_model
+from typing import Any, Dict, List
 import joblib
 import numpy as np
+from esquema import CAMPOS_NUMERICOS, CAMPOS_CATEGORICOS, ORDEN_CATBOOST, validar_lote
 
 # ============================================================
 # CONFIGURACIÓN GENERAL
@@ -18,6 +20,10 @@ app = FastAPI(
     version="2.0.1"
 )
 
+# Respuestas comprimidas (p. ej. predicciones por lotes de miles de filas);
+# las pequeñas se envían tal cual
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # ============================================================
 # FUNCIÓN PARA CARGA SEGURA DE MODELOS
 # ============================================================
@@ -43,25 +49,29 @@ scaler = cargar_modelo("scaler.pkl")  # Obligatorio para transformar entradas de
 # ============================================================
 # ESTRUCTURA DE ENTRADA PARA CATBOOST
 # ============================================================
-class CatBoostInput(BaseModel):
+# Generada desde esquema.py (mismas reglas que la validación del formulario)
+CatBoostInput = create_model(
+    'CatBoostInput',
+    __doc__=(
+        "Estructura esperada por el modelo CatBoost.\n"
+        "Las variables deben coincidir exactamente con las usadas durante el entrenamiento."
+    ),
+    **{campo: (float, Field(ge=regla['min'], le=regla['max'])) for campo, regla in CAMPOS_NUMERICOS.items()},
+    **{campo: (str, Field(min_length=1)) for campo in CAMPOS_CATEGORICOS}
+)
+
+
+class CatBoostBatchInput(BaseModel):
     """
-    Estructura esperada por el modelo CatBoost.
-    Las variables deben coincidir exactamente con las usadas durante el entrenamiento.
+    Varios registros CatBoost para puntuar en una sola llamada al modelo
+    (escenarios del simulador). Se validan en bloque con NumPy (validar_lote).
     """
-    poblacion_menores: float
-    porc_poblacion_urbana: float
-    porc_poblacion_rural: float
-    ipm: float
-    cobertura_acueducto: float
-    cobertura_alcantarillado: float
-    cobertura_energia: float
-    pib_per_capita: float
-    tasa_homicidio: float
-    sexo_victima: str
-    grupo_edad_victima: str
-    ciclo_vital: str
-    escolaridad: str
-    depto_hecho_dane: str
+    registros: List[Dict[str, Any]]
+
+
+def fila_catboost(data: CatBoostInput):
+    """Vector de entrada en el orden de entrenamiento del modelo CatBoost"""
+    return [getattr(data, campo) for campo in ORDEN_CATBOOST]
 
 
 # ============================================================
@@ -75,22 +85,7 @@ def predict_catboost(data: CatBoostInput):
     if modelo_catboost is None:
         raise HTTPException(status_code=500, detail="Modelo CatBoost no cargado.")
 
-    valores = [[
-        data.poblacion_menores,
-        data.porc_poblacion_urbana,
-        data.porc_poblacion_rural,
-        data.ipm,
-        data.cobertura_acueducto,
-        data.cobertura_alcantarillado,
-        data.cobertura_energia,
-        data.pib_per_capita,
-        data.tasa_homicidio,
-        data.sexo_victima,
-        data.grupo_edad_victima,
-        data.ciclo_vital,
-        data.escolaridad,
-        data.depto_hecho_dane
-    ]]
+    valores = [fila_catboost(data)]
 
     try:
         pred = modelo_catboost.predict(valores)[0]
@@ -100,6 +95,38 @@ def predict_catboost(data: CatBoostInput):
     return {"prediccion": float(pred)}
 
 
+@app.post("/predict/catboost/batch")
+def predict_catboost_batch(data: CatBoostBatchInput):
+    """
+    Predice varios registros con una sola llamada a modelo_catboost.predict.
+    Devuelve las predicciones en el mismo orden de los registros.
+    """
+    if modelo_catboost is None:
+        raise HTTPException(status_code=500, detail="Modelo CatBoost no cargado.")
+
+    if not data.registros:
+        return {"predicciones": []}
+
+    matriz, errores = validar_lote(data.registros)
+    if errores:
+        raise HTTPException(status_code=422, detail=[
+            {"fila": fila, "campo": campo, "mensaje": mensaje} for fila, campo, mensaje in errores[:20]
+        ])
+
+    # Numéricos ya validados + categóricos, en el orden de entrenamiento
+    valores = [
+        fila + [registro[campo] for campo in CAMPOS_CATEGORICOS]
+        for fila, registro in zip(matriz.tolist(), data.registros)
+    ]
+
+    try:
+        preds = modelo_catboost.predict(valores)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error en predicción CatBoost: {e}")
+
+    return {"predicciones": [float(p) for p in preds]}
+
+
 # ============================================================
 # ESTRUCTURA DE ENTRADA PARA KMEANS
 # ============================================================
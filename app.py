@@ -1,20 +1,26 @@
 from dash import Dash, html, dcc
 import dash_bootstrap_components as dbc
-from config import COLORS
+from config import COLORS, HEALTH_POLL_INTERVAL
 from components import create_navbar, create_sidebar, create_content_area
 from callbacks import register_callbacks
+from background import background_manager
+from routes import register_routes, carpeta_assets, iconos_externos
+from layout_cache import register_layout, get_layout, warm_layouts, layout_sizes
 import os
 
 # ============================================================
 # INICIALIZACIÓN DE LA APLICACIÓN
 # ============================================================
+# assets_dist/ (CSS depurado y con hash, build_assets.py) si está al día
+ASSETS_FOLDER = carpeta_assets()
+
 app = Dash(
     __name__, 
-    external_stylesheets=[
-        dbc.themes.BOOTSTRAP,
-        "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/bootstrap-icons.css",
-    ],
+    assets_folder=ASSETS_FOLDER,
+    # Bootstrap Icons: subconjunto local de assets_dist/; CDN solo si se configura ICONOS_CDN_URL
+    external_stylesheets=[dbc.themes.BOOTSTRAP, *iconos_externos(ASSETS_FOLDER)],
     suppress_callback_exceptions=True,
+    background_callback_manager=background_manager,
     title="Dashboard NNA",
     update_title="Cargando...",
     meta_tags=[
@@ -46,6 +52,9 @@ server = app.server
 # ============================================================
 # CONFIGURACIÓN DE STORES - Estado Global de la Aplicación
 # ============================================================
+# Los stores de resultados (features K-Means, predicción, clustering,
+# simulación) solo guardan la clave de sesión; los datos viven en el
+# servidor (sesion.py) y se leen con cargar_sesion
 app_stores = html.Div([
     # Store de salud de la API
     dcc.Store(id='api-health-store', storage_type='session'),
@@ -62,6 +71,9 @@ app_stores = html.Div([
     # Store de resultados de clustering
     dcc.Store(id='cluster-result-store', storage_type='memory'),
     
+    # Store del último escenario simulado (lo usa el informe)
+    dcc.Store(id='simulacion-result-store', storage_type='memory'),
+    
     # Store de configuración de usuario
     dcc.Store(
         id='user-config-store',
@@ -80,8 +92,8 @@ app_stores = html.Div([
     # Store para controlar el sidebar mobile
     dcc.Store(id='sidebar-state-store', data={'isOpen': False}, storage_type='memory'),
     
-    # Interval para health check
-    dcc.Interval(id='health-check-interval', interval=30000, n_intervals=0),
+    # Interval para leer la instantánea de health check del servidor
+    dcc.Interval(id='health-check-interval', interval=int(HEALTH_POLL_INTERVAL * 1000), n_intervals=0),
     
     # Interval para auto-refresh de datos
     dcc.Interval(id='data-refresh-interval', interval=300000, n_intervals=0, disabled=True),
@@ -93,6 +105,8 @@ app_stores = html.Div([
 # ============================================================
 # LOADING OVERLAY - Pantalla de carga inicial
 # ============================================================
+# assets/metricas.js lo oculta en cuanto Dash pinta el layout; la animación
+# fadeOut con retraso largo solo es un respaldo si ese script no corre
 loading_overlay = html.Div(
     id='loading-overlay',
     children=[
@@ -135,7 +149,7 @@ loading_overlay = html.Div(
         'justifyContent': 'center',
         'opacity': 1,
         'transition': 'opacity 0.5s ease-out',
-        'animation': 'fadeOut 0.5s ease-out 1.5s forwards'
+        'animation': 'fadeOut 0.5s ease-out 10s forwards'
     }
 )
 
@@ -355,6 +369,8 @@ welcome_content = html.Div([
     ], className="container-fluid px-4 mt-5")
 ], className="fade-in", style={'padding': '40px 20px'})
 
+register_layout('welcome', lambda: welcome_content)
+
 # ============================================================
 # LAYOUT PRINCIPAL - Estructura de la Aplicación
 # ============================================================
@@ -394,7 +410,7 @@ app.layout = html.Div([
         # Contenido dinámico
         html.Div(
             id='main-content',
-            children=welcome_content,
+            children=get_layout('welcome'),
             style={
                 'padding': '20px',
                 'minHeight': '100vh'
@@ -419,6 +435,10 @@ app.layout = html.Div([
 # REGISTRO DE CALLBACKS
 # ============================================================
 register_callbacks(app)
+register_routes(app)
+
+# Pre-serializar layouts estáticos al arrancar cada proceso
+warm_layouts()
 
 # ============================================================
 # CONFIGURACIÓN DEL SERVIDOR
@@ -437,6 +457,7 @@ if __name__ == '__main__':
     print(f"🐛 Debug:       {DEBUG_MODE}")
     print(f"🌐 URL Local:   http://{HOST}:{PORT}")
     print(f"📱 URL Red:     http://localhost:{PORT}")
+    print(f"📦 Layouts:     {sum(layout_sizes().values()) / 1024:.1f} KB pre-serializados")
     print("=" * 60)
     print("✅ Aplicación lista. Abre el navegador en la URL indicada.")
     print("=" * 60 + "\n")
@@ -0,0 +1,178 @@
+/* ============================================================
+   CALLBACKS CLIENTSIDE - Interacciones puramente de UI
+   Se registran desde callbacks.py con ClientsideFunction y no
+   generan round trip al servidor.
+   ============================================================ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    ui: {
+        // Apertura/cierre del sidebar en mobile
+        toggleSidebar: function (toggleClicks, closeClicks, overlayClicks, navClicks, currentClass) {
+            var noUpdate = window.dash_clientside.no_update;
+            var ctx = window.dash_clientside.callback_context;
+            if (!ctx.triggered || !ctx.triggered.length) {
+                return [noUpdate, noUpdate];
+            }
+
+            var triggerId = ctx.triggered[0].prop_id.split('.')[0];
+
+            // Al navegar se cierra el sidebar
+            if (triggerId.indexOf('nav-button') !== -1) {
+                return ['', ''];
+            }
+
+            if (['sidebar-toggle-btn', 'sidebar-close-btn', 'sidebar-overlay'].indexOf(triggerId) !== -1) {
+                if (currentClass && currentClass.indexOf('open') !== -1) {
+                    return ['', ''];
+                }
+                return ['open', 'show'];
+            }
+
+            return [noUpdate, noUpdate];
+        },
+
+        // Etiquetas de los sliders del simulador (+5, -10, 0)
+        sliderLabels: function (pib, homicidio, servicios, ipm) {
+            return [pib, homicidio, servicios, ipm].map(function (x) {
+                if (x === null || x === undefined || x === 0) {
+                    return '0';
+                }
+                return x > 0 ? '+' + x : String(x);
+            });
+        },
+
+        // % población rural = 100 - % urbana
+        poblacionRural: function (urbana) {
+            if (urbana !== null && urbana !== undefined && urbana >= 0 && urbana <= 100) {
+                return Math.round((100 - urbana) * 10) / 10;
+            }
+            return null;
+        },
+
+        // Restablecer sliders del simulador
+        resetSimulador: function (n) {
+            return [0, 0, 0, 0];
+        },
+
+        // Estimación en vivo del simulador: interpolación multilineal sobre la
+        // superficie de respuesta precalculada (sin peticiones al servidor)
+        simLive: function (pib, homicidio, servicios, ipm, superficie) {
+            if (!superficie || !superficie.valores) {
+                return ['—', 'Calcule una predicción base'];
+            }
+
+            var punto = [pib, homicidio, servicios, ipm].map(function (x) { return x || 0; });
+            var ejes = superficie.ejes;
+            var indices = [], pesos = [], pasos = [];
+            var paso = 1;
+
+            for (var d = ejes.length - 1; d >= 0; d--) {
+                pasos[d] = paso;
+                paso *= ejes[d].length;
+            }
+
+            for (var d = 0; d < ejes.length; d++) {
+                var eje = ejes[d];
+                var x = Math.min(Math.max(punto[d], eje[0]), eje[eje.length - 1]);
+                var i = 0;
+                while (i < eje.length - 2 && x > eje[i + 1]) {
+                    i++;
+                }
+                indices.push(i);
+                pesos.push((x - eje[i]) / (eje[i + 1] - eje[i]));
+            }
+
+            // Suma ponderada de las 2^d esquinas de la celda
+            var valor = 0;
+            for (var esquina = 0; esquina < (1 << ejes.length); esquina++) {
+                var peso = 1, offset = 0;
+                for (var d = 0; d < ejes.length; d++) {
+                    var alto = (esquina >> d) & 1;
+                    peso *= alto ? pesos[d] : 1 - pesos[d];
+                    offset += (indices[d] + alto) * pasos[d];
+                }
+                if (peso > 0) {
+                    valor += peso * superficie.valores[offset];
+                }
+            }
+
+            var cambio = valor - superficie.base;
+            var relativo = superficie.base ? (cambio / superficie.base) * 100 : 0;
+            return [
+                '≈ ' + valor.toFixed(1),
+                (cambio >= 0 ? '+' : '') + cambio.toFixed(1) + ' (' + (relativo >= 0 ? '+' : '') + relativo.toFixed(1) + '%)'
+            ];
+        },
+
+        // Validación del formulario de predicción con las reglas de esquema.py.
+        // Argumentos: n_clicks, valores en esquema.orden, esquema. Devuelve
+        // (invalid, feedback) por campo numérico, la alerta y la solicitud
+        // validada (no_update si hay errores: nada llega al servidor).
+        validarPrediccion: function (nClicks) {
+            var args = Array.prototype.slice.call(arguments, 1);
+            var esquema = args.pop();
+            var valores = {};
+            esquema.orden.forEach(function (campo, i) {
+                valores[campo] = args[i];
+            });
+
+            var salida = [], errores = [];
+            esquema.numericos.forEach(function (regla) {
+                var valor = valores[regla.campo];
+                var mensaje = '';
+                if (valor === null || valor === undefined || valor === '') {
+                    mensaje = esquema.requerido;
+                } else if (valor < regla.min) {
+                    mensaje = regla.mensaje_min;
+                } else if (valor > regla.max) {
+                    mensaje = regla.mensaje_max;
+                }
+                salida.push(mensaje !== '', mensaje);
+                if (mensaje) {
+                    errores.push(regla.etiqueta);
+                }
+            });
+            esquema.categoricos.forEach(function (regla) {
+                if (!valores[regla.campo]) {
+                    errores.push(regla.etiqueta);
+                }
+            });
+
+            if (errores.length) {
+                salida.push({
+                    namespace: 'dash_bootstrap_components', type: 'Alert',
+                    props: {
+                        color: 'danger', className: 'mt-3', style: {borderRadius: '12px'},
+                        children: [
+                            {
+                                namespace: 'dash_html_components', type: 'H6',
+                                props: {
+                                    className: 'alert-heading mb-2', style: {fontSize: '14px', fontWeight: '600'},
+                                    children: [
+                                        {namespace: 'dash_html_components', type: 'I', props: {className: 'bi bi-exclamation-triangle-fill me-2'}},
+                                        'Por favor corrija los siguientes campos:'
+                                    ]
+                                }
+                            },
+                            {
+                                namespace: 'dash_html_components', type: 'Ul',
+                                props: {
+                                    className: 'mb-0', style: {marginLeft: '20px'},
+                                    children: errores.map(function (error) {
+                                        return {namespace: 'dash_html_components', type: 'Li', props: {children: error, style: {fontSize: '13px'}}};
+                                    })
+                                }
+                            }
+                        ]
+                    }
+                });
+                salida.push(window.dash_clientside.no_update);
+                return salida;
+            }
+
+            salida.push(null);
+            // n_clicks en la solicitud: cada clic dispara la predicción aunque la entrada no cambie
+            salida.push({n: nClicks, entrada: valores});
+            return salida;
+        }
+    }
+});
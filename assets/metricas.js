@@ -0,0 +1,87 @@
+/* ============================================================
+   MÉTRICAS DE CARGA - Primer pintado e interactividad
+   Mide la carga inicial y la envía con sendBeacon a /metricas/carga
+   (routes.py). El overlay de carga se oculta en cuanto Dash pinta el
+   layout, en lugar de esperar un tiempo fijo.
+     ttfb:          primer byte del HTML
+     fcp:           primer pintado del navegador (el overlay)
+     primer_pintado: layout de la app pintado (skeletons incluidos)
+     tti:           sin callbacks pendientes durante QUIETUD_MS
+   Tiempos en ms desde el inicio de la navegación.
+   ============================================================ */
+(function () {
+    var QUIETUD_MS = 500;
+    var LIMITE_MS = 30000;
+    var INTERVALO_MS = 50;
+
+    var metricas = {};
+    var finCarga = null;
+
+    function ahora() {
+        return Math.round(performance.now());
+    }
+
+    // Store redux del renderer de Dash: isLoading es true mientras haya callbacks pendientes
+    function dashCargando() {
+        var stores = window.dash_stores;
+        if (!stores || !stores.length) {
+            return true;
+        }
+        return Boolean(stores[0].getState().isLoading);
+    }
+
+    function ocultarOverlay() {
+        var overlay = document.getElementById('loading-overlay');
+        if (!overlay) {
+            return;
+        }
+        overlay.style.opacity = '0';
+        overlay.style.pointerEvents = 'none';
+        setTimeout(function () {
+            overlay.style.display = 'none';
+        }, 500);
+    }
+
+    function enviar() {
+        var navegacion = performance.getEntriesByType('navigation')[0];
+        var pintado = performance.getEntriesByName('first-contentful-paint')[0];
+        metricas.ttfb = navegacion ? Math.round(navegacion.responseStart) : null;
+        metricas.fcp = pintado ? Math.round(pintado.startTime) : null;
+
+        var config = JSON.parse(document.getElementById('_dash-config').textContent);
+        var url = (config.requests_pathname_prefix || '/') + 'metricas/carga';
+        if (navigator.sendBeacon) {
+            navigator.sendBeacon(url, JSON.stringify(metricas));
+        }
+    }
+
+    function vigilar() {
+        var t = ahora();
+
+        if (metricas.primer_pintado === undefined) {
+            if (document.getElementById('main-content')) {
+                metricas.primer_pintado = t;
+                finCarga = t;
+                ocultarOverlay();
+            }
+        } else if (dashCargando()) {
+            finCarga = null;
+        } else if (finCarga === null) {
+            finCarga = t;
+        } else if (t - finCarga >= QUIETUD_MS) {
+            metricas.tti = finCarga;
+            enviar();
+            return;
+        }
+
+        if (t > LIMITE_MS) {
+            // La app no quedó quieta: se envía lo medido y se libera la pantalla
+            ocultarOverlay();
+            enviar();
+            return;
+        }
+        setTimeout(vigilar, INTERVALO_MS);
+    }
+
+    vigilar();
+})();
@@ -0,0 +1,30 @@
+import diskcache
+from dash import DiskcacheManager
+from config import BACKGROUND_CACHE_DIR, BACKGROUND_EXPIRE, RESULTADOS_TTL
+
+# ============================================================
+# CALLBACKS EN SEGUNDO PLANO (COLA EN DISCO + WORKERS)
+# ============================================================
+# Los callbacks pesados (lotes del modelo, Monte Carlo, informes) se
+# registran con background=True: Dash los ejecuta en un proceso worker y el
+# navegador consulta el avance, así el worker web queda libre para los
+# callbacks interactivos. La misma caché en disco guarda resultados
+# memoizados que deben sobrevivir entre procesos (un lru_cache no sirve:
+# cada trabajo corre en un proceso distinto).
+
+cache = diskcache.Cache(BACKGROUND_CACHE_DIR)
+
+background_manager = DiskcacheManager(cache, expire=BACKGROUND_EXPIRE)
+
+
+def memoizar(nombre, expire=RESULTADOS_TTL):
+    """
+    Memoiza una función en la caché en disco compartida. Si la función lanza
+    una excepción (p. ej. API caída) no se guarda nada y se reintenta.
+    """
+    return cache.memoize(name=nombre, expire=expire, tag='resultados')
+
+
+def limpiar_resultados():
+    """Elimina los resultados memoizados (p. ej. tras reentrenar un modelo)"""
+    return cache.evict('resultados')
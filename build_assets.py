@@ -0,0 +1,354 @@
+import argparse
+import glob
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import tarfile
+import urllib.request
+import brotli
+from config import COMPRESION_MIN_BYTES, ASSETS_DIST_DIR, ICONOS_FUENTE_DIR, ICONOS_VERSION
+
+# ============================================================
+# CONSTRUCCIÓN DE ASSETS ESTÁTICOS
+# ============================================================
+# Uso (antes de desplegar y tras cambiar assets/ o los layouts):
+#   python build_assets.py
+#
+# 1. Depura las hojas de estilo: se descartan los selectores cuyas clases o
+#    ids no aparecen en el código (layouts Python y JS de assets/), sin
+#    contar las clases que agregan los componentes dbc/dcc ni las de estado
+#    que se ponen en tiempo de ejecución (SAFELIST).
+# 2. Minifica el CSS y copia cada asset a ASSETS_DIST_DIR con el hash del
+#    contenido en el nombre (styles.<hash>.css); manifest.json mapea
+#    nombre original -> nombre con hash. app.py sirve esa carpeta si existe
+#    y routes.py la marca como caché inmutable de un año.
+# 3. Subconjunto de Bootstrap Icons: a partir de la copia local de la
+#    distribución (ICONOS_FUENTE_DIR) se genera una fuente woff2 y una hoja
+#    de estilo solo con los iconos bi-* que aparecen en el código. Así no se
+#    depende del CDN (despliegue sin internet) ni se descarga el set completo.
+# 4. Genera junto a cada asset de texto sus variantes .br y .gz con
+#    compresión máxima. routes.configurar_compresion las sirve directamente
+#    según Accept-Encoding, sin comprimir de nuevo en cada petición. Las
+#    variantes más antiguas que su original se ignoran al servir.
+
+EXTENSIONES = ('.css', '.js', '.svg', '.json', '.html', '.txt')
+MANIFEST = 'manifest.json'
+
+# Archivos del proyecto donde se buscan las clases en uso
+FUENTES = ['*.py', os.path.join('pages', '*.py'), os.path.join('assets', '*.js')]
+
+# Clases que los componentes dbc/dcc agregan al renderizar (no aparecen en el código)
+COLORES = ['primary', 'secondary', 'success', 'danger', 'warning', 'info', 'light', 'dark']
+CLASES_COMPONENTES = {
+    'Card': ['card'], 'CardBody': ['card-body'], 'CardHeader': ['card-header'],
+    'Button': ['btn', 'btn-sm', 'btn-lg', 'btn-close']
+              + [f'btn-{c}' for c in COLORES] + [f'btn-outline-{c}' for c in COLORES],
+    'Alert': ['alert', 'alert-dismissible', 'btn-close'] + [f'alert-{c}' for c in COLORES],
+    'Badge': ['badge'] + [f'bg-{c}' for c in COLORES],
+    'Input': ['form-control'], 'Label': ['form-label'], 'Select': ['form-select'],
+    'Switch': ['form-check-input'], 'Checklist': ['form-check-input'], 'RadioItems': ['form-check-input'],
+    'InputGroup': ['input-group'], 'InputGroupText': ['input-group-text'],
+    'Navbar': ['navbar'], 'NavbarBrand': ['navbar-brand'],
+    'Modal': ['modal', 'modal-backdrop', 'modal-content', 'btn-close'],
+    'ModalHeader': ['modal-header'], 'ModalTitle': ['modal-title'],
+    'ModalBody': ['modal-body'], 'ModalFooter': ['modal-footer'],
+    'Spinner': ['spinner-border', 'spinner-border-sm'],
+    'Progress': ['progress', 'progress-bar'],
+    'Tooltip': ['tooltip', 'tooltip-inner', 'tooltip-arrow'],
+    'DropdownMenu': ['dropdown-menu', 'dropdown-item', 'dropdown-divider'],
+    'Graph': ['js-plotly-plot', 'plotly', 'modebar', 'modebar-btn'],
+    'Dropdown': ['Select-control', 'Select-menu-outer', 'Select-option'],
+    'Pagination': ['pagination', 'page-item', 'page-link'],
+}
+
+# Clases de estado que Bootstrap, Dash o clientside.js ponen en tiempo de ejecución
+SAFELIST = {'active', 'show', 'open', 'fade', 'collapsing', 'disabled', 'scrolled', 'is-focused', 'is-selected'}
+SAFELIST_PREFIJOS = ('Select-', 'rc-slider', 'dash-', '_dash', 'modebar', 'plotly', 'js-plotly')
+
+
+def precomprimir(path, minimo):
+    """Escribe path.br y path.gz si el archivo supera `minimo` bytes; devuelve los tamaños"""
+    with open(path, 'rb') as archivo:
+        datos = archivo.read()
+    if len(datos) < minimo:
+        return None
+
+    variantes = {
+        '.br': brotli.compress(datos, quality=11),
+        '.gz': gzip.compress(datos, compresslevel=9, mtime=0)
+    }
+    tamanos = {'original': len(datos)}
+    for extension, comprimido in variantes.items():
+        # Una variante que no ahorra bytes no se sirve
+        if len(comprimido) >= len(datos):
+            continue
+        with open(path + extension, 'wb') as archivo:
+            archivo.write(comprimido)
+        tamanos[extension] = len(comprimido)
+    return tamanos
+
+
+# ============================================================
+# DEPURACIÓN Y MINIFICACIÓN DE CSS
+# ============================================================
+def clases_en_uso(patrones=FUENTES):
+    """Identificadores que aparecen en el código + clases de los componentes usados"""
+    usados = set()
+    for patron in patrones:
+        for path in glob.glob(patron):
+            with open(path, encoding='utf-8') as archivo:
+                texto = archivo.read()
+            usados.update(re.findall(r'[A-Za-z_][\w-]*', texto))
+            for componente in re.findall(r'\b(?:dbc|dcc|html)\.(\w+)\(', texto):
+                usados.update(CLASES_COMPONENTES.get(componente, []))
+    return usados
+
+
+def _selector_en_uso(selector, usados):
+    # Lo que va dentro de :not(...) no tiene que existir
+    selector = re.sub(r':not\([^)]*\)', '', selector)
+    for nombre in re.findall(r'[.#](-?[A-Za-z_][\w-]*)', selector):
+        if nombre not in usados and nombre not in SAFELIST and not nombre.startswith(SAFELIST_PREFIJOS):
+            return False
+    return True
+
+
+def _separar(texto, separador=','):
+    """Divide por `separador` fuera de paréntesis y comillas"""
+    partes, actual, nivel, comilla = [], [], 0, None
+    for caracter in texto:
+        if comilla:
+            comilla = None if caracter == comilla else comilla
+        elif caracter in '"\'':
+            comilla = caracter
+        elif caracter == '(':
+            nivel += 1
+        elif caracter == ')':
+            nivel -= 1
+        elif caracter == separador and nivel == 0:
+            partes.append(''.join(actual))
+            actual = []
+            continue
+        actual.append(caracter)
+    partes.append(''.join(actual))
+    return partes
+
+
+def _bloques(css):
+    """(preludio, cuerpo) de cada regla de primer nivel; cuerpo None en sentencias '@...;'"""
+    i, inicio, comilla, parentesis = 0, 0, None, 0
+    while i < len(css):
+        caracter = css[i]
+        if comilla:
+            comilla = None if caracter == comilla else comilla
+        elif caracter in '"\'':
+            comilla = caracter
+        elif caracter == '(':
+            parentesis += 1
+        elif caracter == ')':
+            parentesis -= 1
+        elif caracter == ';' and parentesis == 0:
+            yield css[inicio:i].strip(), None
+            inicio = i + 1
+        elif caracter == '{':
+            nivel, j = 1, i + 1
+            while nivel and j < len(css):
+                nivel += {'{': 1, '}': -1}.get(css[j], 0)
+                j += 1
+            yield css[inicio:i].strip(), css[i + 1:j - 1]
+            i = inicio = j
+            continue
+        i += 1
+
+
+def _minificar_declaraciones(cuerpo):
+    cuerpo = re.sub(r'\s+', ' ', cuerpo).strip()
+    cuerpo = re.sub(r'\s*([;{},])\s*', r'\1', cuerpo)
+    cuerpo = re.sub(r'([\w-]+)\s*:\s*', r'\1:', cuerpo)
+    return cuerpo.rstrip(';')
+
+
+def depurar_css(css, usados):
+    """CSS sin los selectores que no están en uso, minificado"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    salida = []
+    for preludio, cuerpo in _bloques(css):
+        preludio = re.sub(r'\s+', ' ', preludio)
+        if cuerpo is None:
+            if preludio:
+                salida.append(preludio + ';')
+        elif preludio.startswith(('@media', '@supports')):
+            interno = depurar_css(cuerpo, usados)
+            if interno:
+                salida.append(f"{preludio}{{{interno}}}")
+        elif preludio.startswith('@'):
+            # @keyframes, @font-face...: se conservan enteros
+            if '{' in cuerpo:
+                interno = ''.join(f"{sub}{{{_minificar_declaraciones(decl)}}}" for sub, decl in _bloques(cuerpo))
+            else:
+                interno = _minificar_declaraciones(cuerpo)
+            salida.append(f"{preludio}{{{interno}}}")
+        else:
+            selectores = [s.strip() for s in _separar(preludio) if _selector_en_uso(s, usados)]
+            if selectores:
+                salida.append(f"{','.join(selectores)}{{{_minificar_declaraciones(cuerpo)}}}")
+    return ''.join(salida)
+
+
+# ============================================================
+# NOMBRES CON HASH (CACHÉ INMUTABLE)
+# ============================================================
+def nombre_con_hash(nombre, datos):
+    base, extension = os.path.splitext(nombre)
+    return f"{base}.{hashlib.sha256(datos).hexdigest()[:10]}{extension}"
+
+
+def construir_dist(origen, destino, usados):
+    """Copia los assets de `origen` a `destino` (CSS depurado) con hash; devuelve el manifest"""
+    os.makedirs(destino, exist_ok=True)
+    # Las versiones anteriores se eliminan: solo queda la del último build
+    for anterior in os.listdir(destino):
+        path = os.path.join(destino, anterior)
+        if os.path.isfile(path):
+            os.remove(path)
+
+    manifest = {}
+    for nombre in sorted(os.listdir(origen)):
+        path = os.path.join(origen, nombre)
+        if not os.path.isfile(path) or nombre.endswith(('.br', '.gz')):
+            continue
+        with open(path, 'rb') as archivo:
+            datos = archivo.read()
+        if nombre.endswith('.css'):
+            css = depurar_css(datos.decode('utf-8'), usados)
+            print(f"  {path}: {len(datos) / 1024:.1f} KB -> {len(css) / 1024:.1f} KB depurado y minificado")
+            datos = css.encode('utf-8')
+        manifest[nombre] = nombre_con_hash(nombre, datos)
+        with open(os.path.join(destino, manifest[nombre]), 'wb') as archivo:
+            archivo.write(datos)
+    return manifest
+
+
+# ============================================================
+# SUBCONJUNTO DE BOOTSTRAP ICONS
+# ============================================================
+ICONOS_CSS = 'bootstrap-icons.css'
+ICONOS_FUENTE = os.path.join('fonts', 'bootstrap-icons.woff2')
+
+
+def descargar_iconos(destino, version=ICONOS_VERSION, url=None):
+    """
+    Copia en `destino` la hoja de estilo, la fuente woff2 y la licencia (MIT)
+    del paquete npm de Bootstrap Icons, para versionarlas en vendor/
+    """
+    url = url or f"https://registry.npmjs.org/bootstrap-icons/-/bootstrap-icons-{version}.tgz"
+    with urllib.request.urlopen(url, timeout=60) as respuesta:
+        paquete = tarfile.open(fileobj=io.BytesIO(respuesta.read()), mode='r:gz')
+    archivos = {
+        'package/font/bootstrap-icons.css': ICONOS_CSS,
+        'package/font/fonts/bootstrap-icons.woff2': ICONOS_FUENTE,
+        'package/LICENSE': 'LICENSE'
+    }
+    for miembro, nombre in archivos.items():
+        path = os.path.join(destino, nombre)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as archivo:
+            archivo.write(paquete.extractfile(miembro).read())
+    print(f"✅ Bootstrap Icons {version} copiado en {destino}")
+
+
+def iconos_en_uso(patrones=FUENTES):
+    """Clases bi-* que aparecen en el código"""
+    iconos = set()
+    for patron in patrones:
+        for path in glob.glob(patron):
+            with open(path, encoding='utf-8') as archivo:
+                iconos.update(re.findall(r'\bbi-[a-z0-9]+(?:-[a-z0-9]+)*', archivo.read()))
+    return iconos
+
+
+def subconjunto_fuente(path, codigos):
+    """Fuente woff2 con solo los glifos de `codigos` (fontTools)"""
+    from fontTools import subset
+
+    opciones = subset.Options()
+    opciones.flavor = 'woff2'
+    fuente = subset.load_font(path, opciones)
+    subsetter = subset.Subsetter(opciones)
+    subsetter.populate(unicodes=codigos)
+    subsetter.subset(fuente)
+    salida = io.BytesIO()
+    subset.save_font(fuente, salida, opciones)
+    return salida.getvalue()
+
+
+def construir_iconos(origen, destino, iconos):
+    """
+    Escribe en `destino` la fuente y la hoja de estilo reducidas a `iconos`,
+    con hash en el nombre. Devuelve las entradas del manifest ({} si no hay
+    copia local de Bootstrap Icons en `origen`).
+    """
+    path_css, path_fuente = os.path.join(origen, ICONOS_CSS), os.path.join(origen, ICONOS_FUENTE)
+    if not (os.path.isfile(path_css) and os.path.isfile(path_fuente)):
+        print(f"⚠️ [iconos] No se encontró {path_css} ni {path_fuente}; no se generan iconos "
+              "(python build_assets.py --descargar-iconos para copiarlos)")
+        return {}
+
+    with open(path_css, encoding='utf-8') as archivo:
+        # Se conservan @font-face, la regla base .bi y solo los .bi-* en uso
+        css = depurar_css(archivo.read(), iconos | {'bi'})
+    codigos = [int(codigo, 16) for codigo in re.findall(r'content:"\\([0-9a-fA-F]+)"', css)]
+    faltantes = sorted(i for i in iconos if f".{i}::before" not in css)
+    if faltantes:
+        print(f"⚠️ [iconos] No existen en esta versión de Bootstrap Icons: {', '.join(faltantes)}")
+
+    fuente = subconjunto_fuente(path_fuente, codigos)
+    manifest = {'bootstrap-icons.woff2': nombre_con_hash('bootstrap-icons.woff2', fuente)}
+    css = re.sub(r'src:[^;}]+', f'src:url("{manifest["bootstrap-icons.woff2"]}") format("woff2")', css)
+    manifest[ICONOS_CSS] = nombre_con_hash(ICONOS_CSS, css.encode('utf-8'))
+
+    with open(os.path.join(destino, manifest['bootstrap-icons.woff2']), 'wb') as archivo:
+        archivo.write(fuente)
+    with open(os.path.join(destino, manifest[ICONOS_CSS]), 'w', encoding='utf-8') as archivo:
+        archivo.write(css)
+    print(f"  {len(codigos)} iconos: fuente {os.path.getsize(path_fuente) / 1024:.1f} KB -> {len(fuente) / 1024:.1f} KB")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Depura, minifica, pone hash y precomprime los assets")
+    parser.add_argument('--assets', default='assets')
+    parser.add_argument('--salida', default=ASSETS_DIST_DIR)
+    parser.add_argument('--iconos', default=ICONOS_FUENTE_DIR, help="Carpeta font/ de la distribución de Bootstrap Icons")
+    parser.add_argument('--minimo', type=int, default=COMPRESION_MIN_BYTES)
+    parser.add_argument('--descargar-iconos', action='store_true',
+                        help="Descarga Bootstrap Icons en --iconos antes de construir (requiere internet)")
+    args = parser.parse_args()
+
+    if args.descargar_iconos:
+        descargar_iconos(args.iconos)
+
+    manifest = construir_dist(args.assets, args.salida, clases_en_uso())
+    manifest.update(construir_iconos(args.iconos, args.salida, iconos_en_uso()))
+    with open(os.path.join(args.salida, MANIFEST), 'w', encoding='utf-8') as archivo:
+        json.dump(manifest, archivo, indent=2)
+    print(f"📦 {len(manifest)} assets con hash en {args.salida}")
+
+    for raiz, _, archivos in os.walk(args.salida):
+        for nombre in sorted(archivos):
+            if not nombre.endswith(EXTENSIONES):
+                continue
+            path = os.path.join(raiz, nombre)
+            tamanos = precomprimir(path, args.minimo)
+            if tamanos:
+                detalle = " · ".join(f"{ext} {t / 1024:.1f} KB" for ext, t in tamanos.items() if ext != 'original')
+                print(f"  {path}: {tamanos['original'] / 1024:.1f} KB -> {detalle}")
+
+    print("✅ Assets precomprimidos")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,27 +1,68 @@
-from dash import Input, Output, State, callback_context, ALL, html, dcc
+from functools import partial
+from urllib.parse import urlencode
+from dash import Input, Output, State, ClientsideFunction, callback_context, ALL, html, dcc
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
 import pandas as pd
 import dash
-from config import COLORS, DEPARTAMENTOS
+from config import COLORS, DEPARTAMENTOS, UMBRALES_RIESGO
 from utils import (
-    check_api_health, predict_catboost, get_risk_level, create_gauge_chart, 
+    get_api_health_snapshot, predict_catboost, get_risk_level, 
     get_kmeans_features, predict_kmeans, get_vulnerability_level
 )
+from reportes import generar_informe, pdf_recomendaciones
+from sesion import guardar_sesion, cargar_sesion
+from esquema import CAMPOS_FORMULARIO, CAMPOS_NUMERICOS, ORDEN_CATBOOST, ETIQUETAS, validar_registro
+from figuras import patch_gauge, patch_cluster_map, create_tornado_chart, create_incertidumbre_chart
+from simulacion import (
+    simular_escenarios, ajustar_entrada, analisis_sensibilidad, superficie_respuesta, monte_carlo,
+    NOMBRES_VARIABLES
+)
 from pages.prediccion import create_prediction_module
 from pages.clusters import create_clusters_module
-from pages.alertas import create_alertas_module, create_alertas_table
+from pages.alertas import (
+    create_alertas_module, create_alertas_table, create_alertas_bar_chart, paginate_alertas,
+    alertas_page_info, ALERTAS_COUNT_IDS
+)
+from alertas_data import get_alertas_index, NIVELES_ALERTA
 from pages.simulador import create_simulador_module
 from pages.informe import create_informe_module
-from pages.recomendaciones import create_recomendaciones_module
+from pages.recomendaciones import (
+    create_recomendaciones_module, create_recomendaciones_content, clave_recomendaciones,
+    patch_tasa_recomendaciones, clave_desde_store
+)
+from layout_cache import register_layout, get_layout
+
+# Páginas estáticas: se pre-serializan una vez por proceso (layout_cache)
+register_layout('prediccion', create_prediction_module)
+register_layout('clusters', create_clusters_module)
+register_layout('recomendaciones', create_recomendaciones_module)
+register_layout('simulador', create_simulador_module)
+
+# Salidas del shell de resultados de predicción cuando no hay resultado:
+# se oculta y el gauge/slots conservan su contenido
+OCULTAR_RESULTADOS = ({'display': 'none'}, dash.no_update, dash.no_update, dash.no_update)
+
+# Fábricas de página por módulo. Informe usa un shell cacheado y solo
+# reconstruye su slot dinámico; alertas se pinta como skeleton y sus datos
+# llegan por callbacks diferidos.
+MODULE_FACTORIES = {
+    'prediccion': partial(get_layout, 'prediccion'),
+    'clusters': partial(get_layout, 'clusters'),
+    'alertas': create_alertas_module,
+    'recomendaciones': partial(get_layout, 'recomendaciones'),
+    'simulador': partial(get_layout, 'simulador'),
+    'informe': create_informe_module
+}
 
 def register_callbacks(app):
     """
     Registra todos los callbacks de la aplicación
     """
     
-    # Callback para toggle del sidebar en mobile
-    @app.callback(
+    # Callback clientside para toggle del sidebar en mobile (assets/clientside.js)
+    app.clientside_callback(
+        ClientsideFunction(namespace='ui', function_name='toggleSidebar'),
         [
             Output('sidebar', 'className'),
             Output('sidebar-overlay', 'className')
@@ -37,29 +78,6 @@ def register_callbacks(app):
         ],
         prevent_initial_call=True
     )
-    def toggle_sidebar(toggle_clicks, close_clicks, overlay_clicks, nav_clicks, current_class):
-        """
-        Controla apertura/cierre del sidebar en mobile
-        """
-        ctx = callback_context
-        
-        if not ctx.triggered:
-            return dash.no_update, dash.no_update
-        
-        trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        
-        # Si se clickeó un botón de navegación, cerrar sidebar en mobile
-        if 'nav-button' in trigger_id:
-            return '', ''  # Cerrar sidebar
-        
-        # Toggle del sidebar
-        if trigger_id in ['sidebar-toggle-btn', 'sidebar-close-btn', 'sidebar-overlay']:
-            if current_class and 'open' in current_class:
-                return '', ''  # Cerrar
-            else:
-                return 'open', 'show'  # Abrir
-        
-        return dash.no_update, dash.no_update
     
     
     # ========================================================================
@@ -70,8 +88,8 @@ def register_callbacks(app):
         Input('health-check-interval', 'n_intervals')
     )
     def update_api_health(n):
-        """Verificar estado de conexión con la API"""
-        health = check_api_health()
+        """Leer la instantánea de salud compartida (sin llamar a la API)"""
+        health = get_api_health_snapshot()
         if health and health.get('estado') == 'API funcionando correctamente':
             badge = dbc.Badge(
                 [html.I(className="bi bi-check-circle-fill me-2"), "API Conectada"], 
@@ -91,17 +109,13 @@ def register_callbacks(app):
     # VALIDACIONES FORMULARIO DE PREDICCIÓN
     # ========================================================================
     
-    # Callback para calcular automáticamente población rural
-    @app.callback(
+    # Callback clientside para calcular automáticamente población rural
+    app.clientside_callback(
+        ClientsideFunction(namespace='ui', function_name='poblacionRural'),
         Output("porc_poblacion_rural", "value"),
         Input("porc_poblacion_urbana", "value"),
         prevent_initial_call=True
     )
-    def calcular_poblacion_rural(urbana):
-        """Calcular automáticamente población rural basada en urbana"""
-        if urbana is not None and 0 <= urbana <= 100:
-            return round(100 - urbana, 1)
-        return None
 
     # ========================================================================
     # NAVEGACIÓN ENTRE MÓDULOS
@@ -115,212 +129,69 @@ def register_callbacks(app):
     def navigate_modules(n_clicks, current_module):
         """Manejar navegación entre módulos del dashboard"""
         if not any(n_clicks): 
-            return current_module, create_prediction_module()
+            return current_module, MODULE_FACTORIES['prediccion']()
         
         ctx = callback_context
         if not ctx.triggered: 
-            return current_module, create_prediction_module()
+            return current_module, MODULE_FACTORIES['prediccion']()
         
         button_id = ctx.triggered[0]['prop_id'].split('.')[0]
         module = eval(button_id)['index']
         
-        module_map = {
-            'prediccion': create_prediction_module(),
-            'clusters': create_clusters_module(),
-            'alertas': create_alertas_module(),
-            'recomendaciones': create_recomendaciones_module(),
-            'simulador': create_simulador_module(),
-            'informe': create_informe_module()
-        }
-        
-        return module, module_map.get(module, create_prediction_module())
+        # Solo se construye la página solicitada
+        factory = MODULE_FACTORIES.get(module, MODULE_FACTORIES['prediccion'])
+        return module, factory()
 
     # ========================================================================
     # PREDICCIÓN CATBOOST - COMPLETO
     # ========================================================================
+    # La validación del formulario corre en el navegador con las reglas de
+    # esquema.py (store 'esquema-prediccion'); solo una entrada válida llega
+    # al servidor, a través de prediction-request-store.
+    app.clientside_callback(
+        ClientsideFunction(namespace='ui', function_name='validarPrediccion'),
+        [salida for campo in CAMPOS_FORMULARIO
+         for salida in (Output(campo, 'invalid'), Output(f'feedback-{campo}', 'children'))]
+        + [Output('validation-alert', 'children'), Output('prediction-request-store', 'data')],
+        Input('btn-predict', 'n_clicks'),
+        [State(campo, 'value') for campo in ORDEN_CATBOOST] + [State('esquema-prediccion', 'data')],
+        prevent_initial_call=True
+    )
+
     @app.callback(
         [Output('prediction-results', 'children'), 
          Output('prediction-loading', 'children'), 
          Output('prediction-result-store', 'data'),
-         Output("poblacion_menores", "invalid"),
-         Output("feedback-poblacion_menores", "children"),
-         Output("porc_poblacion_urbana", "invalid"),
-         Output("feedback-porc_poblacion_urbana", "children"),
-         Output("ipm", "invalid"),
-         Output("feedback-ipm", "children"),
-         Output("cobertura_acueducto", "invalid"),
-         Output("feedback-cobertura_acueducto", "children"),
-         Output("cobertura_alcantarillado", "invalid"),
-         Output("feedback-cobertura_alcantarillado", "children"),
-         Output("cobertura_energia", "invalid"),
-         Output("feedback-cobertura_energia", "children"),
-         Output("pib_per_capita", "invalid"),
-         Output("feedback-pib_per_capita", "children"),
-         Output("tasa_homicidio", "invalid"),
-         Output("feedback-tasa_homicidio", "children"),
-         Output("validation-alert", "children")],
-        Input('btn-predict', 'n_clicks'),
-        [State('poblacion_menores', 'value'), 
-         State('porc_poblacion_urbana', 'value'), 
-         State('porc_poblacion_rural', 'value'),
-         State('ipm', 'value'), 
-         State('cobertura_acueducto', 'value'), 
-         State('cobertura_alcantarillado', 'value'),
-         State('cobertura_energia', 'value'), 
-         State('pib_per_capita', 'value'), 
-         State('tasa_homicidio', 'value'),
-         State('sexo_victima', 'value'), 
-         State('grupo_edad_victima', 'value'), 
-         State('ciclo_vital', 'value'),
-         State('escolaridad', 'value'), 
-         State('depto_hecho_dane', 'value')],
+         Output('prediction-results-shell', 'style'),
+         Output('prediction-gauge', 'figure'),
+         Output('prediction-resumen', 'children'),
+         Output('prediction-info', 'children')],
+        Input('prediction-request-store', 'data'),
         prevent_initial_call=True
     )
-    def make_prediction(n_clicks, pob, urb, rur, ipm, acue, alc, ener, pib_val, hom, 
-                       sexo, edad, ciclo, escol, depto):
+    def make_prediction(request):
         """Realizar predicción con modelo CatBoost y mostrar resultados completos"""
         
-        if n_clicks is None: 
-            return None, "", None, False, "", False, "", False, "", False, "", False, "", False, "", False, "", False, "", None
-        
-        # VALIDACIÓN INTEGRADA
-        errores = []
-        validaciones = []
-        
-        # Validar población menores
-        if pob is None or pob == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("Población menores")
-        elif pob < 0:
-            validaciones.extend([True, "No puede ser negativo"])
-            errores.append("Población menores")
-        elif pob > 10000000:
-            validaciones.extend([True, "Valor muy alto (máx: 10M)"])
-            errores.append("Población menores")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar % población urbana
-        if urb is None or urb == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("% Población urbana")
-        elif urb < 0 or urb > 100:
-            validaciones.extend([True, "Debe estar entre 0-100%"])
-            errores.append("% Población urbana")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar IPM
-        if ipm is None or ipm == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("IPM")
-        elif ipm < 0 or ipm > 1:
-            validaciones.extend([True, "Debe estar entre 0-1"])
-            errores.append("IPM")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar cobertura acueducto
-        if acue is None or acue == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("Cobertura acueducto")
-        elif acue < 0 or acue > 100:
-            validaciones.extend([True, "Debe estar entre 0-100%"])
-            errores.append("Cobertura acueducto")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar cobertura alcantarillado
-        if alc is None or alc == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("Cobertura alcantarillado")
-        elif alc < 0 or alc > 100:
-            validaciones.extend([True, "Debe estar entre 0-100%"])
-            errores.append("Cobertura alcantarillado")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar cobertura energía
-        if ener is None or ener == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("Cobertura energía")
-        elif ener < 0 or ener > 100:
-            validaciones.extend([True, "Debe estar entre 0-100%"])
-            errores.append("Cobertura energía")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar PIB per cápita
-        if pib_val is None or pib_val == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("PIB per cápita")
-        elif pib_val < 0:
-            validaciones.extend([True, "No puede ser negativo"])
-            errores.append("PIB per cápita")
-        elif pib_val > 1000000000:
-            validaciones.extend([True, "Valor muy alto (máx: 1,000M)"])
-            errores.append("PIB per cápita")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar tasa homicidio
-        if hom is None or hom == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("Tasa homicidio")
-        elif hom < 0:
-            validaciones.extend([True, "No puede ser negativo"])
-            errores.append("Tasa homicidio")
-        elif hom > 500:
-            validaciones.extend([True, "Valor muy alto (máx: 500)"])
-            errores.append("Tasa homicidio")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar campos categóricos
-        if not sexo:
-            errores.append("Sexo de la víctima")
-        if not edad:
-            errores.append("Grupo de edad")
-        if not ciclo:
-            errores.append("Ciclo vital")
-        if not escol:
-            errores.append("Escolaridad")
-        if not depto:
-            errores.append("Departamento")
-        
-        # Si hay errores, mostrar alerta y retornar sin hacer predicción
+        if not request: 
+            return None, "", None, *OCULTAR_RESULTADOS
+        
+        # Defensa: el navegador ya validó con el mismo esquema
+        errores = validar_registro(request['entrada'])
         if errores:
             alert = dbc.Alert([
                 html.H6([
                     html.I(className="bi bi-exclamation-triangle-fill me-2"),
                     "Por favor corrija los siguientes campos:"
                 ], className="alert-heading mb-2", style={'fontSize': '14px', 'fontWeight': '600'}),
-                html.Ul([html.Li(error, style={'fontSize': '13px'}) for error in errores], 
+                html.Ul([html.Li(f"{ETIQUETAS[campo]}: {mensaje}", style={'fontSize': '13px'}) for campo, mensaje in errores.items()],
                        className="mb-0", style={'marginLeft': '20px'})
             ], color="danger", className="mt-3", style={'borderRadius': '12px'})
-            validaciones.append(alert)
-            return None, "", None, *validaciones
+            return alert, "", None, *OCULTAR_RESULTADOS
         
-        # SI NO HAY ERRORES, PROCEDER CON LA PREDICCIÓN
-        # Limpiar validaciones (todos en False)
-        validaciones.append(None)  # validation-alert
-        
-        # Preparar datos para la API
+        # Preparar datos para la API (orden de entrenamiento)
         data = {
-            "poblacion_menores": float(pob), 
-            "porc_poblacion_urbana": float(urb), 
-            "porc_poblacion_rural": float(rur), 
-            "ipm": float(ipm), 
-            "cobertura_acueducto": float(acue), 
-            "cobertura_alcantarillado": float(alc), 
-            "cobertura_energia": float(ener), 
-            "pib_per_capita": float(pib_val), 
-            "tasa_homicidio": float(hom), 
-            "sexo_victima": sexo, 
-            "grupo_edad_victima": edad, 
-            "ciclo_vital": ciclo, 
-            "escolaridad": escol, 
-            "depto_hecho_dane": depto
+            campo: float(request['entrada'][campo]) if campo in CAMPOS_NUMERICOS else request['entrada'][campo]
+            for campo in ORDEN_CATBOOST
         }
         
         # Llamar a la API
@@ -331,201 +202,68 @@ def register_callbacks(app):
                 html.I(className="bi bi-exclamation-triangle-fill me-2"),
                 "Error al conectar con la API. Verifique la conexión."
             ], color="danger", dismissable=True, className="fade-in")
-            return error_alert, "", None, False, "", False, "", False, "", False, "", False, "", False, "", False, "", False, "", None
+            return error_alert, "", None, *OCULTAR_RESULTADOS
         
         # Extraer predicción
         prediccion = result.get('prediccion', 0)
         nivel, color = get_risk_level(prediccion)
         
-        # Crear gráfico gauge
-        gauge = create_gauge_chart(prediccion, "Tasa Proyectada por 100,000 hab.")
+        # Slots dinámicos del shell de resultados (el gauge se actualiza con Patch)
+        resumen = html.Div([
+            html.H6("Nivel de Riesgo Estimado", 
+                   style={'color': COLORS['text_muted'], 
+                         'fontSize': '14px', 'marginBottom': '12px'}),
+            dbc.Badge(
+                [html.I(className="bi bi-shield-fill me-2"), nivel],
+                color=color.replace('#', ''),
+                style={'fontSize': '20px', 'padding': '12px 24px', 
+                      'fontWeight': '600'}
+            ),
+            
+            html.Hr(style={'margin': '24px 0'}),
+            
+            # Interpretación
+            html.Div([
+                html.H6("Interpretación", 
+                       style={'color': COLORS['text'], 
+                             'fontWeight': '600', 'marginBottom': '12px'}),
+                html.P(
+                    f"La tasa proyectada es de {prediccion:.2f} casos por cada 100,000 habitantes menores de edad.",
+                    style={'fontSize': '14px', 'color': COLORS['neutral'], 
+                          'lineHeight': '1.6'}
+                ),
+                html.P(
+                    f"Este municipio se clasifica en nivel de riesgo {nivel.lower()}.",
+                    style={'fontSize': '14px', 'color': COLORS['neutral'], 
+                          'lineHeight': '1.6', 'marginBottom': '0'}
+                )
+            ])
+        ])
         
-        # Construir resultado completo con toda la información
-        results = html.Div([
-            dbc.Card([
-                dbc.CardBody([
-                    # Título
-                    html.H5([
-                        html.I(className="bi bi-check-circle-fill me-2", 
-                              style={'color': COLORS['secondary']}),
-                        "Resultados de la Predicción"
-                    ], style={'color': COLORS['text'], 'fontWeight': '600', 
-                             'marginBottom': '24px'}),
-                    
-                    # Sección principal: Gauge + Badge
-                    dbc.Row([
-                        dbc.Col([
-                            dcc.Graph(figure=gauge, config={'displayModeBar': False})
-                        ], md=6),
-                        dbc.Col([
-                            html.Div([
-                                html.H6("Nivel de Riesgo Estimado", 
-                                       style={'color': COLORS['text_muted'], 
-                                             'fontSize': '14px', 'marginBottom': '12px'}),
-                                dbc.Badge(
-                                    [html.I(className="bi bi-shield-fill me-2"), nivel],
-                                    color=color.replace('#', ''),
-                                    style={'fontSize': '20px', 'padding': '12px 24px', 
-                                          'fontWeight': '600'}
-                                ),
-                                
-                                html.Hr(style={'margin': '24px 0'}),
-                                
-                                # Interpretación
-                                html.Div([
-                                    html.H6("Interpretación", 
-                                           style={'color': COLORS['text'], 
-                                                 'fontWeight': '600', 'marginBottom': '12px'}),
-                                    html.P(
-                                        f"La tasa proyectada es de {prediccion:.2f} casos por cada 100,000 habitantes menores de edad.",
-                                        style={'fontSize': '14px', 'color': COLORS['neutral'], 
-                                              'lineHeight': '1.6'}
-                                    ),
-                                    html.P(
-                                        f"Este municipio se clasifica en nivel de riesgo {nivel.lower()}.",
-                                        style={'fontSize': '14px', 'color': COLORS['neutral'], 
-                                              'lineHeight': '1.6', 'marginBottom': '0'}
-                                    )
-                                ])
-                            ], style={'marginTop': '16px'})
-                        ], md=6)
-                    ]),
-                    
-                    html.Hr(style={'margin': '32px 0', 'borderColor': COLORS['border']}),
-                    
-                    # Variables de Mayor Impacto
-                    html.Div([
-                        html.H6([
-                            html.I(className="bi bi-bar-chart-fill me-2"),
-                            "Variables de Mayor Impacto"
-                        ], style={'color': COLORS['text'], 'fontWeight': '600', 
-                                 'marginBottom': '16px'}),
-                        
-                        dbc.Row([
-                            dbc.Col([
-                                dbc.Card([
-                                    dbc.CardBody([
-                                        html.I(className="bi bi-exclamation-octagon-fill", 
-                                              style={'fontSize': '24px', 'color': COLORS['danger']}),
-                                        html.H6("Tasa de Homicidio", className="mt-2 mb-1",
-                                               style={'fontSize': '14px', 'fontWeight': '600'}),
-                                        dbc.Badge("Impacto Alto", color="danger", 
-                                                 style={'fontSize': '11px'})
-                                    ], className="text-center py-3")
-                                ], className="stat-card", 
-                                   style={'borderLeftColor': COLORS['danger'], 
-                                         'borderLeftWidth': '4px'})
-                            ], md=3, className="mb-3"),
-                            
-                            dbc.Col([
-                                dbc.Card([
-                                    dbc.CardBody([
-                                        html.I(className="bi bi-graph-down", 
-                                              style={'fontSize': '24px', 'color': COLORS['warning']}),
-                                        html.H6("IPM", className="mt-2 mb-1",
-                                               style={'fontSize': '14px', 'fontWeight': '600'}),
-                                        dbc.Badge("Impacto Alto", color="warning", 
-                                                 style={'fontSize': '11px'})
-                                    ], className="text-center py-3")
-                                ], className="stat-card", 
-                                   style={'borderLeftColor': COLORS['warning'], 
-                                         'borderLeftWidth': '4px'})
-                            ], md=3, className="mb-3"),
-                            
-                            dbc.Col([
-                                dbc.Card([
-                                    dbc.CardBody([
-                                        html.I(className="bi bi-cash-stack", 
-                                              style={'fontSize': '24px', 'color': COLORS['info']}),
-                                        html.H6("PIB per cápita", className="mt-2 mb-1",
-                                               style={'fontSize': '14px', 'fontWeight': '600'}),
-                                        dbc.Badge("Impacto Medio", color="info", 
-                                                 style={'fontSize': '11px'})
-                                    ], className="text-center py-3")
-                                ], className="stat-card", 
-                                   style={'borderLeftColor': COLORS['info'], 
-                                         'borderLeftWidth': '4px'})
-                            ], md=3, className="mb-3"),
-                            
-                            dbc.Col([
-                                dbc.Card([
-                                    dbc.CardBody([
-                                        html.I(className="bi bi-building", 
-                                              style={'fontSize': '24px', 'color': COLORS['secondary']}),
-                                        html.H6("Cobertura Servicios", className="mt-2 mb-1",
-                                               style={'fontSize': '14px', 'fontWeight': '600'}),
-                                        dbc.Badge("Impacto Medio", color="success", 
-                                                 style={'fontSize': '11px'})
-                                    ], className="text-center py-3")
-                                ], className="stat-card", 
-                                   style={'borderLeftColor': COLORS['secondary'], 
-                                         'borderLeftWidth': '4px'})
-                            ], md=3, className="mb-3")
-                        ])
-                    ]),
-                    
-                    html.Hr(style={'margin': '32px 0', 'borderColor': COLORS['border']}),
-                    
-                    # Información adicional
-                    html.Div([
-                        html.H6([
-                            html.I(className="bi bi-info-circle-fill me-2"),
-                            "Información del Análisis"
-                        ], style={'color': COLORS['text'], 'fontWeight': '600', 
-                                 'marginBottom': '16px'}),
-                        
-                        dbc.Row([
-                            dbc.Col([
-                                html.Div([
-                                    html.Small("Departamento:", 
-                                              style={'color': COLORS['text_muted'], 
-                                                    'fontSize': '12px', 'display': 'block'}),
-                                    html.P(depto, 
-                                          style={'fontSize': '14px', 'fontWeight': '600', 
-                                                'color': COLORS['text'], 'marginBottom': '0'})
-                                ])
-                            ], md=3),
-                            
-                            dbc.Col([
-                                html.Div([
-                                    html.Small("Perfil de Víctima:", 
-                                              style={'color': COLORS['text_muted'], 
-                                                    'fontSize': '12px', 'display': 'block'}),
-                                    html.P(f"{sexo} - {edad}", 
-                                          style={'fontSize': '14px', 'fontWeight': '600', 
-                                                'color': COLORS['text'], 'marginBottom': '0'})
-                                ])
-                            ], md=3),
-                            
-                            dbc.Col([
-                                html.Div([
-                                    html.Small("Población Menores:", 
-                                              style={'color': COLORS['text_muted'], 
-                                                    'fontSize': '12px', 'display': 'block'}),
-                                    html.P(f"{int(pob):,}", 
-                                          style={'fontSize': '14px', 'fontWeight': '600', 
-                                                'color': COLORS['text'], 'marginBottom': '0'})
-                                ])
-                            ], md=3),
-                            
-                            dbc.Col([
-                                html.Div([
-                                    html.Small("Nivel de Riesgo:", 
-                                              style={'color': COLORS['text_muted'], 
-                                                    'fontSize': '12px', 'display': 'block'}),
-                                    html.P(nivel, 
-                                          style={'fontSize': '14px', 'fontWeight': '600', 
-                                                'color': color, 'marginBottom': '0'})
-                                ])
-                            ], md=3)
-                        ])
-                    ])
-                    
-                ], style={'padding': '32px'})
-            ], className="shadow-sm fade-in", style={'borderRadius': '16px'})
+        def info_item(etiqueta, valor, valor_color=COLORS['text']):
+            return dbc.Col([
+                html.Div([
+                    html.Small(etiqueta, 
+                              style={'color': COLORS['text_muted'], 
+                                    'fontSize': '12px', 'display': 'block'}),
+                    html.P(valor, 
+                          style={'fontSize': '14px', 'fontWeight': '600', 
+                                'color': valor_color, 'marginBottom': '0'})
+                ])
+            ], md=3)
+        
+        info = dbc.Row([
+            info_item("Departamento:", data['depto_hecho_dane']),
+            info_item("Perfil de Víctima:", f"{data['sexo_victima']} - {data['grupo_edad_victima']}"),
+            info_item("Población Menores:", f"{int(data['poblacion_menores']):,}"),
+            info_item("Nivel de Riesgo:", nivel, color)
         ])
         
-        return results, "", result
+        # El store guarda también la entrada completa: el simulador la reutiliza como línea base
+        store = guardar_sesion('prediccion', {'prediccion': prediccion, 'entrada': data})
+        
+        return (None, "", store,
+                {'display': 'block'}, patch_gauge(prediccion), resumen, info)
     # ========================================================================
     # RESTO DE CALLBACKS (clusters, alertas, simulador, recomendaciones)
     # ========================================================================
@@ -540,15 +278,19 @@ def register_callbacks(app):
     )
     def load_kmeans_features(active_module):
         """Cargar features del modelo KMeans cuando se activa el módulo"""
-        return get_kmeans_features() if active_module == 'clusters' else []
+        if active_module != 'clusters':
+            return None
+        features = get_kmeans_features()
+        return guardar_sesion('kmeans-features', features) if features else None
 
     @app.callback(
         [Output('kmeans-inputs-container', 'children'), 
          Output('kmeans-features-info', 'children')], 
         Input('kmeans-features-store', 'data')
     )
-    def create_kmeans_inputs(features):
+    def create_kmeans_inputs(features_key):
         """Generar inputs dinámicos para KMeans basados en features"""
+        features = cargar_sesion(features_key)
         if not features: 
             return html.Div([
                 dbc.Spinner(color="primary", size="sm"), 
@@ -595,28 +337,13 @@ def register_callbacks(app):
          Output('kmeans-loading', 'children'), 
          Output('cluster-result-store', 'data')],
         Input('btn-kmeans', 'n_clicks'), 
-        State({'type': 'kmeans-input', 'index': ALL}, 'value'), 
+        [State({'type': 'kmeans-input', 'index': ALL}, 'value'),
+         State('kmeans-features-store', 'data')], 
         prevent_initial_call=True
     )
-    def make_kmeans_prediction(n_clicks, input_values):
+    def make_kmeans_prediction(n_clicks, input_values, features_key):
         """Realizar predicción con KMeans y visualizar clusters"""
-        
-        # Figura vacía por defecto
-        empty_fig = go.Figure()
-        empty_fig.update_layout(
-            xaxis={'visible': False}, 
-            yaxis={'visible': False}, 
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            height=500,
-            annotations=[{
-                'text': 'Presione "Asignar Cluster" para ver la visualización',
-                'xref': 'paper',
-                'yref': 'paper',
-                'showarrow': False,
-                'font': {'size': 14, 'color': COLORS['text_muted']}
-            }]
-        )
+        features = cargar_sesion(features_key)
         
         # Validación
         if not input_values or len(input_values) != 6: 
@@ -624,7 +351,7 @@ def register_callbacks(app):
                 html.I(className="bi bi-exclamation-triangle-fill me-2"),
                 f"Error: Se requieren exactamente 6 valores (recibidos: {len(input_values) if input_values else 0})"
             ], color="danger", className="fade-in", 
-               style={'borderRadius': '12px', 'fontSize': '14px'}), empty_fig, "", None
+               style={'borderRadius': '12px', 'fontSize': '14px'}), dash.no_update, "", None
         
         # Predicción
         result = predict_kmeans([float(v) for v in input_values])
@@ -634,7 +361,7 @@ def register_callbacks(app):
                 html.I(className="bi bi-exclamation-triangle-fill me-2"),
                 "Error al conectar con la API. Verifique la conexión."
             ], color="danger", className="fade-in",
-               style={'borderRadius': '12px', 'fontSize': '14px'}), empty_fig, "", None
+               style={'borderRadius': '12px', 'fontSize': '14px'}), dash.no_update, "", None
         
         cluster = result.get('cluster_asignado', 0)
         nivel, color = get_vulnerability_level(cluster)
@@ -673,146 +400,81 @@ def register_callbacks(app):
             ], style={'padding': '28px'})
         ], className="shadow-sm fade-in", style={'borderRadius': '16px'})
         
-        # Scatter Plot mejorado
-        cluster_colors = {
-            0: COLORS['secondary'],
-            1: COLORS['info'],
-            2: COLORS['warning'],
-            3: COLORS['danger']
-        }
-        
-        fig = go.Figure()
-        
-        # Punto del usuario
-        fig.add_trace(go.Scatter(
-            x=[input_values[0]], 
-            y=[input_values[1]], 
-            mode='markers', 
-            marker=dict(size=20, color=color, symbol='star', 
-                       line=dict(width=2, color='white')),
-            name='Tu Municipio',
-            hovertemplate='<b>Tu Municipio</b><br>PC1: %{x:.2f}<br>PC2: %{y:.2f}<extra></extra>'
-        ))
-        
-        # Puntos de referencia de otros clusters
-        ref_points = {
-            0: ([15, 20, 18], [50, 55, 52]),
-            1: ([25, 30, 27], [60, 65, 62]),
-            2: ([35, 40, 37], [70, 75, 72]),
-            3: ([45, 50, 47], [80, 85, 82])
-        }
+        # El mapa base ya está en el layout: solo se mueve el punto del usuario
+        fig = patch_cluster_map([float(v) for v in input_values], color)
         
-        for clust, (x_vals, y_vals) in ref_points.items():
-            fig.add_trace(go.Scatter(
-                x=x_vals,
-                y=y_vals,
-                mode='markers',
-                marker=dict(size=10, color=cluster_colors.get(clust, COLORS['neutral']), 
-                           opacity=0.6),
-                name=f'Cluster {clust}',
-                hovertemplate=f'<b>Cluster {clust}</b><br>PC1: %{{x:.2f}}<br>PC2: %{{y:.2f}}<extra></extra>'
-            ))
+        # El store conserva la entrada para el informe
+        store = guardar_sesion('cluster', {**result, 'valores': [float(v) for v in input_values], 'features': features or []})
         
-        fig.update_layout(
-            title={
-                'text': 'Análisis de Componentes Principales (PCA)',
-                'font': {'size': 16, 'color': COLORS['text'], 'family': 'Inter, sans-serif'},
-                'x': 0.5,
-                'xanchor': 'center'
-            },
-            xaxis_title='Componente Principal 1',
-            yaxis_title='Componente Principal 2',
-            plot_bgcolor='rgba(248, 250, 252, 0.5)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font={'family': 'Inter, sans-serif', 'color': COLORS['neutral']},
-            height=500,
-            hovermode='closest',
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                bgcolor="rgba(255,255,255,0.8)",
-                bordercolor=COLORS['border'],
-                borderwidth=1
-            ),
-            xaxis=dict(
-                gridcolor=COLORS['border'],
-                showgrid=True,
-                zeroline=True,
-                zerolinecolor=COLORS['border']
-            ),
-            yaxis=dict(
-                gridcolor=COLORS['border'],
-                showgrid=True,
-                zeroline=True,
-                zerolinecolor=COLORS['border']
-            )
-        )
-        
-        return result_card, fig, "", result
+        return result_card, fig if fig is not None else dash.no_update, "", store
 
     # ========================================================================
     # ALERTAS
     # ========================================================================
+    # La página se monta con skeletons; estos callbacks (sin
+    # prevent_initial_call) se disparan al montarla y llenan cada slot.
+    @app.callback(
+        Output('alertas-bar-chart-container', 'children'),
+        Input('alertas-bar-chart-container', 'id')
+    )
+    def load_alertas_bar_chart(_):
+        """Gráfico top 10, diferido para no bloquear el primer pintado"""
+        return dcc.Graph(id="alertas-bar-chart", config={'displayModeBar': False},
+                         figure=create_alertas_bar_chart(get_alertas_index().top(10)))
+
     @app.callback(
-        Output('alertas-table-container', 'children'), 
+        [Output('alertas-table-container', 'children'),
+         Output('alertas-pagination', 'max_value'),
+         Output('alertas-pagination', 'active_page'),
+         Output('alertas-table-info', 'children')], 
         [Input('filter-departamento', 'value'), 
          Input('filter-nivel', 'value'), 
-         Input('sort-column', 'value')]
+         Input('sort-column', 'value'),
+         Input('alertas-pagination', 'active_page')]
     )
-    def update_alertas_table(depto_filter, nivel_filter, sort_option):
-        """Filtrar y ordenar tabla de alertas"""
-        
-        # Datos de ejemplo (en producción vendrían de la API)
-        data = pd.DataFrame({
-            'Municipio': ['Cartagena', 'Barranquilla', 'Santa Marta', 'Magangué', 'Turbaco', 
-                         'Soledad', 'Malambo', 'Ciénaga', 'Sabanalarga', 'Baranoa'],
-            'Departamento': ['Bolívar', 'Atlántico', 'Magdalena', 'Bolívar', 'Bolívar', 
-                            'Atlántico', 'Atlántico', 'Magdalena', 'Atlántico', 'Atlántico'],
-            'Tasa_Proyectada': [45.2, 38.7, 32.1, 51.3, 28.4, 41.8, 35.2, 29.7, 33.5, 27.8],
-            'Cluster': [2, 2, 1, 3, 1, 2, 2, 1, 2, 1],
-            'Nivel_Alerta': ['Alto', 'Alto', 'Medio', 'Crítico', 'Medio', 
-                            'Alto', 'Alto', 'Medio', 'Alto', 'Medio'],
-            'Poblacion_Menores': [185430, 234567, 98234, 45678, 23456, 
-                                 156789, 87654, 56789, 34567, 28901]
-        })
-        
-        # Aplicar filtros
-        if depto_filter != 'all': 
-            data = data[data['Departamento'] == depto_filter]
-        if nivel_filter != 'all': 
-            data = data[data['Nivel_Alerta'] == nivel_filter]
-        
-        # Aplicar ordenamiento
-        if sort_option == 'tasa_desc': 
-            data = data.sort_values('Tasa_Proyectada', ascending=False)
-        elif sort_option == 'tasa_asc':
-            data = data.sort_values('Tasa_Proyectada', ascending=True)
-        elif sort_option == 'municipio_asc':
-            data = data.sort_values('Municipio', ascending=True)
-        elif sort_option == 'poblacion_desc':
-            data = data.sort_values('Poblacion_Menores', ascending=False)
+    def update_alertas_table(depto_filter, nivel_filter, sort_option, active_page):
+        """Filtrar, ordenar y paginar la tabla de alertas en el servidor"""
+        
+        # Un cambio de filtro u orden vuelve a la primera página
+        trigger = callback_context.triggered[0]['prop_id'] if callback_context.triggered else ''
+        if not trigger.startswith('alertas-pagination'):
+            active_page = 1
+        
+        # Filtro + orden por intersección de índices precalculados
+        index = get_alertas_index()
+        ids = index.query(depto_filter, nivel_filter, sort_option)
         
         # Mensaje si no hay resultados
-        if data.empty:
+        if len(ids) == 0:
             return dbc.Alert([
                 html.I(className="bi bi-info-circle me-2"),
                 "No se encontraron municipios con los filtros seleccionados"
-            ], color="info", style={'borderRadius': '12px', 'fontSize': '14px'})
+            ], color="info", style={'borderRadius': '12px', 'fontSize': '14px'}), 1, 1, ""
         
-        return create_alertas_table(data)
+        # Solo se envían al navegador las filas de la página visible
+        page_ids, page, total_pages = paginate_alertas(ids, active_page)
+        return (create_alertas_table(index.rows(page_ids)), total_pages, page,
+                alertas_page_info(page, len(ids), len(page_ids)))
 
     @app.callback(
-        Output('btn-export-alertas', 'children'), 
-        Input('btn-export-alertas', 'n_clicks'), 
-        prevent_initial_call=True
+        [Output(ALERTAS_COUNT_IDS[nivel], 'children') for nivel in NIVELES_ALERTA],
+        Input('filter-departamento', 'value')
+    )
+    def update_alertas_counts(depto_filter):
+        """Conteos por nivel desde los agregados incrementales (sin recorrer la tabla)"""
+        counts = get_alertas_index().agregados.counts(depto_filter or 'all')
+        return [f"{counts[nivel]:,}" for nivel in NIVELES_ALERTA]
+
+    @app.callback(
+        Output('btn-export-alertas', 'href'), 
+        [Input('filter-departamento', 'value'), 
+         Input('filter-nivel', 'value'), 
+         Input('sort-column', 'value')]
     )
-    def export_alertas(n): 
-        """Simular exportación de alertas"""
-        return [html.I(className="bi bi-check-circle me-2"), "¡Exportado!"]
+    def export_alertas_href(depto_filter, nivel_filter, sort_option): 
+        """Enlace de exportación con los filtros y orden actuales de la tabla"""
+        query = urlencode({'departamento': depto_filter, 'nivel': nivel_filter, 'orden': sort_option})
+        return app.get_relative_path(f'/exportar/alertas.csv?{query}')
 
     @app.callback(
         [Output('modal-detalle-alerta', 'is_open'), 
@@ -834,50 +496,72 @@ def register_callbacks(app):
     # ========================================================================
     # SIMULADOR
     # ========================================================================
-    @app.callback(
+    # Etiquetas de sliders y reset: callbacks clientside (assets/clientside.js)
+    app.clientside_callback(
+        ClientsideFunction(namespace='ui', function_name='sliderLabels'),
         [Output(f'sim-{x}-value', 'children') for x in ['pib', 'homicidio', 'servicios', 'ipm']], 
         [Input(f'sim-{x}', 'value') for x in ['pib', 'homicidio', 'servicios', 'ipm']]
     )
-    def update_sliders(pib, hom, serv, ipm): 
-        """Actualizar valores mostrados en sliders del simulador"""
-        return [f"{x:+d}" if x !=0 else "0" for x in [pib, hom, serv, ipm]]
 
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace='ui', function_name='resetSimulador'),
         [Output(f'sim-{x}', 'value') for x in ['pib', 'homicidio', 'servicios', 'ipm']], 
         Input('btn-reset-simulador', 'n_clicks'), 
         prevent_initial_call=True
     )
-    def reset_simulador(n): 
-        """Restablecer sliders del simulador a cero"""
-        return 0, 0, 0, 0
 
     @app.callback(
-        Output('simulador-results', 'children'), 
+        [Output('simulador-results', 'children'),
+         Output('simulacion-result-store', 'data')], 
         Input('btn-simular', 'n_clicks'), 
         [State('sim-pib', 'value'), 
          State('sim-homicidio', 'value'), 
          State('sim-servicios', 'value'), 
          State('sim-ipm', 'value'), 
+         State('sim-incertidumbre', 'value'),
          State('prediction-result-store', 'data')], 
+        background=True,
+        running=[(Output('btn-simular', 'disabled'), True, False),
+                 (Output('sim-progress-container', 'style'), {'display': 'block'}, {'display': 'none'})],
+        progress=[Output('sim-progress', 'value'), Output('sim-progress', 'label')],
+        cancel=[Input('btn-cancelar-simulacion', 'n_clicks')],
         prevent_initial_call=True
     )
-    def run_simulation(n, pib_c, hom_c, serv_c, ipm_c, base_pred):
-        """Ejecutar simulación de escenarios"""
+    def run_simulation(set_progress, n, pib_c, hom_c, serv_c, ipm_c, incertidumbre, base_key):
+        """Ejecutar simulación de escenarios (en segundo plano, con avance y cancelación)"""
         
+        base_pred = cargar_sesion(base_key)
         if not base_pred: 
             return dbc.Alert([
                 html.I(className="bi bi-exclamation-triangle-fill me-2"),
                 "Primero debe ejecutar una predicción base en el módulo de Predicción CatBoost"
             ], color="warning", className="fade-in",
-               style={'borderRadius': '12px', 'fontSize': '14px'})
+               style={'borderRadius': '12px', 'fontSize': '14px'}), dash.no_update
+        
+        if not base_pred.get('entrada'):
+            return dbc.Alert([
+                html.I(className="bi bi-exclamation-triangle-fill me-2"),
+                "La predicción base no incluye los datos de entrada. Vuelva a calcular la predicción."
+            ], color="warning", className="fade-in",
+               style={'borderRadius': '12px', 'fontSize': '14px'}), dash.no_update
         
         base = base_pred.get('prediccion', 0)
+        cambios = {'pib': pib_c or 0, 'homicidio': hom_c or 0, 'servicios': serv_c or 0, 'ipm': ipm_c or 0}
+        
+        # Escenario combinado + uno por variable, en una sola llamada por lotes al modelo
+        set_progress((5, "Escenarios"))
+        resultado = simular_escenarios(base_pred['entrada'], cambios)
+        
+        if resultado is None:
+            return dbc.Alert([
+                html.I(className="bi bi-exclamation-triangle-fill me-2"),
+                "Error al conectar con la API. Verifique la conexión."
+            ], color="danger", className="fade-in",
+               style={'borderRadius': '12px', 'fontSize': '14px'}), dash.no_update
         
-        # Calcular impactos
-        impacto = (pib_c/100 * -0.15) + (hom_c/100 * 0.35) + (serv_c/100 * -0.10) + (ipm_c/100 * 0.25)
-        simulado = base * (1 + impacto)
+        simulado = resultado['simulado']
         diferencia = simulado - base
-        porcentaje_cambio = (diferencia / base) * 100
+        porcentaje_cambio = (diferencia / base) * 100 if base else 0
         
         # Determinar colores
         nivel_base, color_base = get_risk_level(base)
@@ -903,7 +587,90 @@ def register_callbacks(app):
             yaxis=dict(gridcolor=COLORS['border'], showgrid=True)
         )
         
-        return html.Div([
+        # Efecto individual de cada variable modificada (escenarios por variable)
+        efectos = []
+        if resultado['por_variable']:
+            variables = list(resultado['por_variable'])
+            deltas = [resultado['por_variable'][v] - base for v in variables]
+            fig_efectos = go.Figure(go.Bar(
+                x=deltas, y=[NOMBRES_VARIABLES[v] for v in variables], orientation='h',
+                marker_color=[COLORS['danger'] if d > 0 else COLORS['secondary'] for d in deltas],
+                text=[f'{d:+.1f}' for d in deltas], textposition='auto'
+            ))
+            fig_efectos.update_layout(
+                height=80 + 50 * len(variables),
+                margin=dict(l=20, r=20, t=20, b=40),
+                plot_bgcolor='rgba(248, 250, 252, 0.5)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                xaxis_title='Cambio en la tasa (por 100,000)',
+                font={'family': 'Inter, sans-serif', 'color': COLORS['neutral']},
+                xaxis=dict(gridcolor=COLORS['border'], showgrid=True, zeroline=True, zerolinecolor=COLORS['neutral'])
+            )
+            efectos = [
+                html.Hr(style={'margin': '24px 0', 'borderColor': COLORS['border']}),
+                html.H6("Efecto individual por variable", 
+                       style={'color': COLORS['text'], 'fontWeight': '600', 'marginBottom': '12px'}),
+                dcc.Graph(figure=fig_efectos, config={'displayModeBar': False})
+            ]
+        
+        # Modo incertidumbre: distribución Monte Carlo del escenario simulado
+        bandas = []
+        mc = None
+        if incertidumbre:
+            set_progress((20, "Monte Carlo"))
+            mc = monte_carlo(
+                ajustar_entrada(base_pred['entrada'], cambios),
+                al_avanzar=lambda f: set_progress((20 + int(75 * min(f, 1)), "Monte Carlo"))
+            )
+            if mc is None:
+                bandas = [dbc.Alert("No fue posible calcular la incertidumbre (API no disponible).",
+                                    color="warning", className="mt-4", style={'borderRadius': '12px', 'fontSize': '14px'})]
+            else:
+                p = mc['percentiles']
+                bandas = [
+                    html.Hr(style={'margin': '24px 0', 'borderColor': COLORS['border']}),
+                    html.H6("Incertidumbre del escenario", 
+                           style={'color': COLORS['text'], 'fontWeight': '600', 'marginBottom': '4px'}),
+                    html.Small(f"{mc['n']:,} muestras en {mc['tiempo']:.1f} s · mediana {p[50]:.1f} · "
+                               f"P25–P75 {p[25]:.1f}–{p[75]:.1f} · P5–P95 {p[5]:.1f}–{p[95]:.1f}",
+                               style={'color': COLORS['text_muted'], 'fontSize': '12px'}),
+                    dbc.Row([
+                        dbc.Col([
+                            html.Div([
+                                html.Small(f"P(riesgo {nivel.lower()})", style={'color': COLORS['text_muted'], 'fontSize': '12px'}),
+                                html.H4(f"{prob:.0%}", style={'color': color_nivel, 'fontWeight': '700', 'marginBottom': '0'})
+                            ], className="text-center")
+                        ], md=4)
+                        for (nivel, prob), color_nivel in zip(
+                            mc['prob_niveles'].items(), [COLORS['secondary'], COLORS['warning'], COLORS['danger']]
+                        )
+                    ], className="my-3"),
+                    # Probabilidad de cruzar cada umbral de riesgo
+                    dbc.Row([
+                        dbc.Col([
+                            html.Div([
+                                html.Small(f"P(tasa ≥ {UMBRALES_RIESGO[umbral]:g})", style={'color': COLORS['text_muted'], 'fontSize': '12px'}),
+                                html.H5(f"{mc['prob_superar'][umbral]:.0%}", style={'color': color_umbral, 'fontWeight': '700', 'marginBottom': '0'})
+                            ], className="text-center")
+                        ], md=6)
+                        for umbral, color_umbral in [('bajo', COLORS['warning']), ('medio', COLORS['danger'])]
+                    ], className="mb-3"),
+                    dcc.Graph(figure=create_incertidumbre_chart(mc), config={'displayModeBar': False})
+                ]
+        
+        # Resumen del escenario para el informe
+        escenario = {
+            'cambios': cambios, 'base': base, 'simulado': simulado,
+            'por_variable': resultado['por_variable'],
+            'incertidumbre': None
+        }
+        if incertidumbre and mc is not None:
+            escenario['incertidumbre'] = {
+                'n': mc['n'], 'percentiles': mc['percentiles'], 'prob_niveles': mc['prob_niveles'],
+                'prob_superar': mc['prob_superar']
+            }
+        
+        resultados = html.Div([
             dbc.Card([
                 dbc.CardBody([
                     html.H5([
@@ -941,62 +708,182 @@ def register_callbacks(app):
                         ], md=4)
                     ], className="mb-4"),
                     
-                    dcc.Graph(figure=fig, config={'displayModeBar': False})
+                    dcc.Graph(figure=fig, config={'displayModeBar': False}),
+                    *efectos,
+                    *bandas
                 ], style={'padding': '28px'})
             ], className="shadow-sm fade-in", style={'borderRadius': '16px'})
         ])
+        
+        return resultados, guardar_sesion('simulacion', escenario)
+
+    @app.callback(
+        Output('sim-superficie-base', 'data'),
+        Input('prediction-result-store', 'data')
+    )
+    def gate_response_surface(base_key):
+        """
+        Al abrir el simulador (o al cambiar la predicción) deja pasar la clave
+        solo si hay línea base; así no se encola un trabajo en segundo plano vacío
+        """
+        base_pred = cargar_sesion(base_key)
+        if not base_pred or not base_pred.get('entrada'):
+            return dash.no_update
+        return base_key
+
+    @app.callback(
+        Output('sim-superficie-store', 'data'),
+        Input('sim-superficie-base', 'data'),
+        background=True,
+        prevent_initial_call=True
+    )
+    def load_response_surface(base_key):
+        """Superficie de respuesta de la línea base (memoizada, en segundo plano)"""
+        base_pred = cargar_sesion(base_key)
+        if not base_pred or not base_pred.get('entrada'):
+            return None
+        return superficie_respuesta(base_pred['entrada'])
+
+    app.clientside_callback(
+        ClientsideFunction(namespace='ui', function_name='simLive'),
+        [Output('sim-live-valor', 'children'), Output('sim-live-cambio', 'children')],
+        [Input(f'sim-{x}', 'drag_value') for x in ['pib', 'homicidio', 'servicios', 'ipm']],
+        Input('sim-superficie-store', 'data')
+    )
+
+    @app.callback(
+        Output('sensibilidad-container', 'children'),
+        Input('btn-sensibilidad', 'n_clicks'),
+        State('prediction-result-store', 'data'),
+        background=True,
+        running=[(Output('btn-sensibilidad', 'disabled'), True, False)],
+        prevent_initial_call=True
+    )
+    def run_sensitivity(n, base_key):
+        """Tornado de sensibilidad (un lote por línea base, cacheado)"""
+        
+        base_pred = cargar_sesion(base_key)
+        if not base_pred or not base_pred.get('entrada'):
+            return dbc.Alert([
+                html.I(className="bi bi-exclamation-triangle-fill me-2"),
+                "Primero debe ejecutar una predicción base en el módulo de Predicción CatBoost"
+            ], color="warning", className="fade-in",
+               style={'borderRadius': '12px', 'fontSize': '14px'})
+        
+        sensibilidad = analisis_sensibilidad(base_pred['entrada'])
+        
+        if sensibilidad is None:
+            return dbc.Alert([
+                html.I(className="bi bi-exclamation-triangle-fill me-2"),
+                "Error al conectar con la API. Verifique la conexión."
+            ], color="danger", className="fade-in",
+               style={'borderRadius': '12px', 'fontSize': '14px'})
+        
+        return dcc.Graph(figure=create_tornado_chart(sensibilidad), config={'displayModeBar': False})
+    # ========================================================================
+    # INFORME
+    # ========================================================================
+    @app.callback(
+        Output('informe-resultado', 'children'),
+        Input('btn-generar-informe', 'n_clicks'),
+        [State('informe-titulo', 'value'),
+         State('informe-municipio', 'value'),
+         State('informe-responsable', 'value'),
+         State('prediction-result-store', 'data'),
+         State('cluster-result-store', 'data'),
+         State('simulacion-result-store', 'data')],
+        background=True,
+        running=[(Output('btn-generar-informe', 'disabled'), True, False),
+                 (Output('informe-loading', 'children'), "Generando informe...", "")],
+        prevent_initial_call=True
+    )
+    def generate_report(n, titulo, municipio, responsable, prediccion, cluster, simulacion):
+        """Generar informe HTML + PDF de la sesión (en segundo plano)"""
+        
+        sesion = {'prediccion': cargar_sesion(prediccion), 'cluster': cargar_sesion(cluster),
+                  'simulacion': cargar_sesion(simulacion)}
+        metadatos = {'titulo': titulo or "Informe de Análisis Predictivo", 'municipio': municipio, 'responsable': responsable}
+        informe = generar_informe(sesion, metadatos)
+        
+        if informe is None:
+            return dbc.Alert([
+                html.I(className="bi bi-exclamation-triangle-fill me-2"),
+                "No hay análisis en la sesión. Ejecute al menos una predicción antes de generar el informe."
+            ], color="warning", className="fade-in",
+               style={'borderRadius': '12px', 'fontSize': '14px'})
+        
+        return dbc.Alert([
+            html.H6([html.I(className="bi bi-check-circle-fill me-2"), "Informe generado"], 
+                   className="alert-heading", style={'fontWeight': '600'}),
+            html.P(f"Secciones: {', '.join(informe['secciones'])} "
+                   f"({informe['reutilizadas']} reutilizadas de la caché).", 
+                   style={'fontSize': '13px'}),
+            dbc.Button([html.I(className="bi bi-file-earmark-pdf me-2"), "Descargar PDF"], 
+                       href=app.get_relative_path(f"/reportes/{informe['pdf']}"), external_link=True,
+                       color="success", className="me-2"),
+            dbc.Button([html.I(className="bi bi-filetype-html me-2"), "Ver HTML"], 
+                       href=app.get_relative_path(f"/reportes/{informe['html']}"), external_link=True,
+                       target="_blank", color="primary", outline=True)
+        ], color="success", className="fade-in", style={'borderRadius': '12px'})
+
     # ========================================================================
     # RECOMENDACIONES
     # ========================================================================
     @app.callback(
-        Output('recomendaciones-container', 'children'),
+        [Output('recomendaciones-container', 'children'),
+         Output('recomendaciones-clave-store', 'data')],
         Input('btn-generar-recomendaciones', 'n_clicks'),
         [State('nivel-detalle-recomendaciones', 'value'),
          State('prioridad-enfoque', 'value'),
-         State('prediction-result-store', 'data')],
+         State('prediction-result-store', 'data'),
+         State('recomendaciones-clave-store', 'data')],
         prevent_initial_call=True
     )
-    def generar_recomendaciones(n_clicks, nivel_detalle, prioridad, prediction_data):
+    def generar_recomendaciones(n_clicks, nivel_detalle, prioridad, prediction_key, clave_mostrada):
         """Generar recomendaciones basadas en la predicción actual"""
         
+        prediction_data = cargar_sesion(prediction_key)
         if not prediction_data:
             return dbc.Alert([
                 html.I(className="bi bi-exclamation-triangle-fill me-2"),
                 "Para generar recomendaciones, primero debe realizar una predicción en el módulo de Predicción CatBoost."
             ], color="warning", className="fade-in",
-               style={'borderRadius': '12px', 'fontSize': '14px'})
+               style={'borderRadius': '12px', 'fontSize': '14px'}), None
         
         # Extraer datos de la predicción
         tasa_proyectada = prediction_data.get('prediccion', 0)
+        entrada = prediction_data.get('entrada') or {}
         nivel_riesgo, _ = get_risk_level(tasa_proyectada)
+        clave = clave_recomendaciones(nivel_riesgo, nivel_detalle, prioridad,
+                                      entrada.get('ipm'), entrada.get('tasa_homicidio'))
         
-        # Importar la función auxiliar
-        from pages.recomendaciones import create_recomendaciones_content
+        # Mismo contenido ya en pantalla: solo se actualiza la tarjeta de resumen
+        if clave_desde_store(clave_mostrada) == clave:
+            return patch_tasa_recomendaciones(clave, tasa_proyectada), dash.no_update
         
-        # Generar contenido
         content = create_recomendaciones_content(
             nivel_riesgo=nivel_riesgo,
             tasa_proyectada=tasa_proyectada,
             nivel_detalle=nivel_detalle,
-            prioridad=prioridad
+            prioridad=prioridad,
+            ipm=entrada.get('ipm'),
+            tasa_homicidio=entrada.get('tasa_homicidio')
         )
         
-        return content
+        return content, clave
     
     @app.callback(
-        Output('btn-download-recomendaciones', 'children'),
+        Output('recomendaciones-download', 'data'),
         Input('btn-download-recomendaciones', 'n_clicks'),
+        [State('recomendaciones-clave-store', 'data'),
+         State('prediction-result-store', 'data')],
         prevent_initial_call=True
     )
-    def download_recomendaciones(n):
-        """Simular descarga de recomendaciones en PDF"""
-        if n:
-            return [
-                html.I(className="bi bi-check-circle-fill me-2"),
-                "PDF Generado - Descargando..."
-            ]
-        return [
-            html.I(className="bi bi-file-pdf me-2"),
-            "Descargar Recomendaciones en PDF"
-        ]
+    def download_recomendaciones(n, clave, prediction_key):
+        """PDF de las recomendaciones mostradas (cacheado por clave y tramo de tasa)"""
+        prediction_data = cargar_sesion(prediction_key)
+        if not n or not clave or not prediction_data:
+            return dash.no_update
+        contenido, _ = pdf_recomendaciones(clave_desde_store(clave), prediction_data.get('prediccion', 0))
+        return dcc.send_bytes(contenido, f"recomendaciones_{clave[0].lower()}_{clave[1]}_{clave[2]}.pdf")
 
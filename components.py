@@ -188,3 +188,13 @@ def create_content_area():
         children=[],
         style={'display': 'none'}
     )
+
+def create_skeleton(height, width='100%', count=1, gap='12px'):
+    """
+    Bloques 'skeleton' (animación shimmer de styles.css) que ocupan el lugar
+    de un contenido costoso mientras un callback diferido lo calcula
+    """
+    return html.Div([
+        html.Div(className="skeleton", style={'height': height, 'width': width})
+        for _ in range(count)
+    ], style={'display': 'flex', 'flexDirection': 'column', 'gap': gap})
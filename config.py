@@ -3,6 +3,67 @@ import os
 # API URL
 API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
 
+# Health check compartido (segundos): cada proceso del servidor consulta /health
+# en segundo plano y los callbacks solo leen la última instantánea
+HEALTH_POLL_INTERVAL = float(os.getenv("HEALTH_POLL_INTERVAL", "30"))
+HEALTH_STALE_AFTER = float(os.getenv("HEALTH_STALE_AFTER", "90"))
+
+# Datos de alertas (CSV con las columnas de alertas_data.ALERTAS_DEMO); si no
+# se define se usan los datos de ejemplo
+ALERTAS_DATA_PATH = os.getenv("ALERTAS_DATA_PATH")
+
+# Tabla de alertas: filas por página (se filtra, ordena y pagina en el servidor)
+ALERTAS_PAGE_SIZE = int(os.getenv("ALERTAS_PAGE_SIZE", "25"))
+
+# Exportación de alertas: filas por bloque del CSV transmitido
+ALERTAS_EXPORT_CHUNK = int(os.getenv("ALERTAS_EXPORT_CHUNK", "500"))
+
+# Compresión de respuestas (br/gzip): no se comprimen respuestas más pequeñas
+# que esto. Los assets estáticos se precomprimen con build_assets.py
+COMPRESION_MIN_BYTES = int(os.getenv("COMPRESION_MIN_BYTES", "500"))
+
+# Assets depurados, minificados y con hash en el nombre (build_assets.py);
+# si la carpeta tiene manifest.json, Dash la sirve en lugar de assets/
+ASSETS_DIST_DIR = os.getenv("ASSETS_DIST_DIR", "assets_dist")
+ASSETS_MAX_AGE = 31536000  # un año: el nombre cambia si cambia el contenido
+
+# Copia local de Bootstrap Icons (carpeta font/ de la distribución oficial:
+# bootstrap-icons.css y fonts/bootstrap-icons.woff2). build_assets.py genera
+# a partir de ella el subconjunto con los iconos usados; para copiarla una vez
+# (con internet): python build_assets.py --descargar-iconos. Sin subconjunto
+# local no se cargan iconos, salvo que se defina ICONOS_CDN_URL (opcional,
+# solo para despliegues con internet), p. ej.
+# https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.0/font/bootstrap-icons.css
+ICONOS_VERSION = "1.11.0"
+ICONOS_FUENTE_DIR = os.getenv("ICONOS_FUENTE_DIR", os.path.join("vendor", "bootstrap-icons"))
+ICONOS_CDN_URL = os.getenv("ICONOS_CDN_URL", "")
+
+# Proyección PCA precalculada del KMeans (ver proyeccion_pca.py)
+PCA_PROYECCION_PATH = os.getenv("PCA_PROYECCION_PATH", "pca_kmeans.npz")
+
+# Callbacks en segundo plano: cola/caché en disco compartida por los procesos
+# del servidor y sus workers. BACKGROUND_EXPIRE: segundos que se conservan los
+# resultados de los trabajos; RESULTADOS_TTL: resultados memoizados (lotes del modelo)
+BACKGROUND_CACHE_DIR = os.getenv("BACKGROUND_CACHE_DIR", os.path.join("cache", "background"))
+BACKGROUND_EXPIRE = int(os.getenv("BACKGROUND_EXPIRE", "600"))
+RESULTADOS_TTL = int(os.getenv("RESULTADOS_TTL", "3600"))
+
+# Estado de sesión en el servidor (sesion.py): los dcc.Store guardan solo la
+# clave; SESION_TTL = segundos sin uso antes de desalojar una entrada
+SESION_CACHE_DIR = os.getenv("SESION_CACHE_DIR", os.path.join("cache", "sesiones"))
+SESION_TTL = int(os.getenv("SESION_TTL", "7200"))
+
+# Métricas de carga enviadas por el navegador (assets/metricas.js): se
+# conservan en memoria las últimas METRICAS_CARGA_MAX por proceso
+METRICAS_CARGA_MAX = int(os.getenv("METRICAS_CARGA_MAX", "1000"))
+
+# Informes generados (HTML y PDF); se sirven en /reportes/<archivo>
+REPORTES_DIR = os.getenv("REPORTES_DIR", "reportes")
+
+# PDF de recomendaciones: se cachea por tramo de tasa (la tasa impresa se
+# redondea a este paso), así usuarios con tasas casi iguales comparten el PDF
+RECOMENDACIONES_PDF_TRAMO = float(os.getenv("RECOMENDACIONES_PDF_TRAMO", "0.5"))
+
 # Paleta de colores
 COLORS = {
     'primary': '#3b82f6', 'secondary': '#10b981', 'danger': '#ef4444',
@@ -22,6 +83,41 @@ COLORS_ALPHA = {
 UMBRALES_RIESGO = {'bajo': 15, 'medio': 30, 'alto': float('inf')}
 UMBRALES_CLUSTER = {0: 'Bajo', 1: 'Medio', 2: 'Alto', 3: 'Crítico'}
 
+# Rango plausible (mínimo, máximo) de cada variable numérica CatBoost para el
+# análisis de sensibilidad. % población rural no aparece: se deriva de la urbana.
+RANGOS_SENSIBILIDAD = {
+    'poblacion_menores': (1000, 2000000),
+    'porc_poblacion_urbana': (0, 100),
+    'ipm': (0, 1),
+    'cobertura_acueducto': (0, 100),
+    'cobertura_alcantarillado': (0, 100),
+    'cobertura_energia': (0, 100),
+    'pib_per_capita': (3000000, 100000000),
+    'tasa_homicidio': (0, 150)
+}
+
+# Puntos evaluados por variable en el análisis de sensibilidad (incluye extremos)
+SENSIBILIDAD_PUNTOS = int(os.getenv("SENSIBILIDAD_PUNTOS", "9"))
+
+# Superficie de respuesta del simulador: filas por llamada al endpoint por lotes
+SUPERFICIE_LOTE = int(os.getenv("SUPERFICIE_LOTE", "250"))
+
+# Modo incertidumbre (Monte Carlo): ruido relativo (desviación estándar como
+# fracción del valor) de las entradas que son estimaciones, y presupuesto de
+# latencia que decide cuántas muestras se alcanzan a puntuar
+RUIDO_RELATIVO = {
+    'tasa_homicidio': 0.15,
+    'ipm': 0.10,
+    'pib_per_capita': 0.10,
+    'poblacion_menores': 0.05,
+    'cobertura_acueducto': 0.05,
+    'cobertura_alcantarillado': 0.05,
+    'cobertura_energia': 0.05
+}
+MONTE_CARLO_PRESUPUESTO = float(os.getenv("MONTE_CARLO_PRESUPUESTO", "2.0"))  # segundos
+MONTE_CARLO_LOTE = int(os.getenv("MONTE_CARLO_LOTE", "500"))
+MONTE_CARLO_MAX = int(os.getenv("MONTE_CARLO_MAX", "5000"))
+
 # Opciones
 SEXO_OPTIONS = ['F', 'M']
 GRUPO_EDAD_OPTIONS = ['0-4', '5-9', '10-14', '15-17']
@@ -0,0 +1,144 @@
+import numpy as np
+
+# ============================================================
+# ESQUEMA ÚNICO DE LAS VARIABLES DE ENTRADA (CATBOOST)
+# ============================================================
+# Fuente única de las reglas de validación. De aquí salen:
+#   - la validación clientside del formulario (esquema_cliente -> store
+#     'esquema-prediccion', leído por ui.validarPrediccion en clientside.js)
+#   - el modelo pydantic de /predict/catboost (api.py)
+#   - la validación vectorizada (NumPy) de /predict/catboost/batch
+# Este módulo no importa Dash ni config: lo usan también la API y los scripts.
+
+MENSAJE_REQUERIDO = "Este campo es requerido"
+MENSAJE_NEGATIVO = "No puede ser negativo"
+
+# Campos numéricos: etiqueta, rango válido y mensajes fuera de rango.
+# 'formulario': False para los que no se validan en el formulario (derivados).
+CAMPOS_NUMERICOS = {
+    'poblacion_menores': {
+        'etiqueta': "Población menores", 'min': 0, 'max': 10_000_000,
+        'mensaje_max': "Valor muy alto (máx: 10M)"
+    },
+    'porc_poblacion_urbana': {
+        'etiqueta': "% Población urbana", 'min': 0, 'max': 100,
+        'mensaje_min': "Debe estar entre 0-100%", 'mensaje_max': "Debe estar entre 0-100%"
+    },
+    'porc_poblacion_rural': {
+        'etiqueta': "% Población rural", 'min': 0, 'max': 100, 'formulario': False
+    },
+    'ipm': {
+        'etiqueta': "IPM", 'min': 0, 'max': 1,
+        'mensaje_min': "Debe estar entre 0-1", 'mensaje_max': "Debe estar entre 0-1"
+    },
+    'cobertura_acueducto': {
+        'etiqueta': "Cobertura acueducto", 'min': 0, 'max': 100,
+        'mensaje_min': "Debe estar entre 0-100%", 'mensaje_max': "Debe estar entre 0-100%"
+    },
+    'cobertura_alcantarillado': {
+        'etiqueta': "Cobertura alcantarillado", 'min': 0, 'max': 100,
+        'mensaje_min': "Debe estar entre 0-100%", 'mensaje_max': "Debe estar entre 0-100%"
+    },
+    'cobertura_energia': {
+        'etiqueta': "Cobertura energía", 'min': 0, 'max': 100,
+        'mensaje_min': "Debe estar entre 0-100%", 'mensaje_max': "Debe estar entre 0-100%"
+    },
+    'pib_per_capita': {
+        'etiqueta': "PIB per cápita", 'min': 0, 'max': 1_000_000_000,
+        'mensaje_max': "Valor muy alto (máx: 1,000M)"
+    },
+    'tasa_homicidio': {
+        'etiqueta': "Tasa homicidio", 'min': 0, 'max': 500,
+        'mensaje_max': "Valor muy alto (máx: 500)"
+    }
+}
+
+# Campos categóricos (texto no vacío)
+CAMPOS_CATEGORICOS = {
+    'sexo_victima': {'etiqueta': "Sexo de la víctima"},
+    'grupo_edad_victima': {'etiqueta': "Grupo de edad"},
+    'ciclo_vital': {'etiqueta': "Ciclo vital"},
+    'escolaridad': {'etiqueta': "Escolaridad"},
+    'depto_hecho_dane': {'etiqueta': "Departamento"}
+}
+
+ETIQUETAS = {campo: regla['etiqueta'] for campo, regla in {**CAMPOS_NUMERICOS, **CAMPOS_CATEGORICOS}.items()}
+
+# Orden exacto de las columnas en el entrenamiento de CatBoost
+ORDEN_CATBOOST = list(CAMPOS_NUMERICOS) + list(CAMPOS_CATEGORICOS)
+
+# Campos que se validan en el formulario (con FormFeedback propio)
+CAMPOS_FORMULARIO = [c for c, regla in CAMPOS_NUMERICOS.items() if regla.get('formulario', True)]
+
+_MINIMOS = np.array([regla['min'] for regla in CAMPOS_NUMERICOS.values()], dtype=float)
+_MAXIMOS = np.array([regla['max'] for regla in CAMPOS_NUMERICOS.values()], dtype=float)
+
+
+def mensaje_error(campo, valor):
+    """Mensaje de error de un campo numérico o None si el valor es válido"""
+    regla = CAMPOS_NUMERICOS[campo]
+    if valor is None or valor == "":
+        return MENSAJE_REQUERIDO
+    if valor < regla['min']:
+        return regla.get('mensaje_min', MENSAJE_NEGATIVO)
+    if valor > regla['max']:
+        return regla.get('mensaje_max', f"Debe ser menor o igual a {regla['max']}")
+    return None
+
+
+def validar_registro(registro):
+    """{campo: mensaje} con los errores de un registro (vacío si es válido)"""
+    errores = {}
+    for campo in CAMPOS_NUMERICOS:
+        mensaje = mensaje_error(campo, registro.get(campo))
+        if mensaje:
+            errores[campo] = mensaje
+    for campo in CAMPOS_CATEGORICOS:
+        if not registro.get(campo):
+            errores[campo] = MENSAJE_REQUERIDO
+    return errores
+
+
+def esquema_cliente():
+    """Reglas en JSON para la validación del formulario en el navegador"""
+    return {
+        'requerido': MENSAJE_REQUERIDO,
+        'numericos': [
+            {
+                'campo': campo, 'etiqueta': regla['etiqueta'], 'min': regla['min'], 'max': regla['max'],
+                'mensaje_min': regla.get('mensaje_min', MENSAJE_NEGATIVO),
+                'mensaje_max': regla.get('mensaje_max', f"Debe ser menor o igual a {regla['max']}")
+            }
+            for campo, regla in CAMPOS_NUMERICOS.items() if campo in CAMPOS_FORMULARIO
+        ],
+        'categoricos': [{'campo': campo, 'etiqueta': regla['etiqueta']} for campo, regla in CAMPOS_CATEGORICOS.items()],
+        'orden': ORDEN_CATBOOST
+    }
+
+
+def validar_lote(registros):
+    """
+    Valida muchos registros a la vez: los numéricos se convierten en una
+    matriz float y se comparan con los rangos del esquema en bloque.
+    Devuelve (matriz, errores) con errores como lista de (fila, campo, mensaje).
+    """
+    try:
+        matriz = np.array([[r[c] for c in CAMPOS_NUMERICOS] for r in registros], dtype=float)
+    except KeyError as e:
+        return None, [(None, e.args[0], MENSAJE_REQUERIDO)]
+    except (TypeError, ValueError):
+        return None, [(None, None, "Valores numéricos inválidos")]
+
+    matriz = matriz.reshape(len(registros), len(CAMPOS_NUMERICOS))
+    campos = list(CAMPOS_NUMERICOS)
+    errores = []
+    filas, columnas = np.nonzero(np.isnan(matriz) | (matriz < _MINIMOS) | (matriz > _MAXIMOS))
+    for fila, columna in zip(filas.tolist(), columnas.tolist()):
+        campo = campos[columna]
+        errores.append((fila, campo, mensaje_error(campo, matriz[fila, columna]) or "Valor inválido"))
+
+    for fila, registro in enumerate(registros):
+        for campo in CAMPOS_CATEGORICOS:
+            if not isinstance(registro.get(campo), str) or not registro[campo]:
+                errores.append((fila, campo, MENSAJE_REQUERIDO))
+    return matriz, errores
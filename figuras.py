@@ -0,0 +1,216 @@
+from functools import lru_cache
+from dash import Patch
+import plotly.graph_objects as go
+from config import COLORS, COLORS_ALPHA, UMBRALES_RIESGO
+from utils import get_risk_level
+from proyeccion_pca import cargar_proyeccion, proyectar
+
+# ============================================================
+# FÁBRICA DE FIGURAS: BASE UNA VEZ + ACTUALIZACIONES PARCIALES
+# ============================================================
+# Las figuras base (layout, ejes, trazas fijas) se construyen una vez por
+# proceso y viajan con el layout de la página. Los callbacks solo devuelven
+# un dash.Patch con los valores que cambian (punto del usuario, valor del
+# gauge), así la respuesta y el re-render en el navegador son mínimos.
+
+GAUGE_TITLE = "Tasa Proyectada por 100,000 hab."
+
+# Un color por cluster del KMeans (el modelo tiene 6 clusters)
+CLUSTER_PALETTE = [COLORS['secondary'], COLORS['info'], COLORS['warning'],
+                   COLORS['danger'], '#8b5cf6', '#ec4899']
+
+
+# ============================================================
+# GAUGE DE PREDICCIÓN
+# ============================================================
+@lru_cache(maxsize=None)
+def create_gauge_base(title=GAUGE_TITLE, max_value=100):
+    """Gauge sin valor (0); el valor y el color se aplican con patch_gauge"""
+    _, color = get_risk_level(0)
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=0,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': title, 'font': {'size': 16, 'color': COLORS['text'], 'family': 'Inter, sans-serif'}},
+        number={'suffix': " /100k", 'font': {'size': 32, 'color': COLORS['text'], 'family': 'Inter, sans-serif'}},
+        gauge={
+            'axis': {'range': [None, max_value], 'tickwidth': 1, 'tickcolor': COLORS['border'], 'tickfont': {'size': 11, 'color': COLORS['neutral']}},
+            'bar': {'color': color, 'thickness': 0.7},
+            'bgcolor': 'white',
+            'borderwidth': 2,
+            'bordercolor': COLORS['border'],
+            'steps': [
+                {'range': [0, UMBRALES_RIESGO['bajo']], 'color': COLORS_ALPHA['secondary_10']},
+                {'range': [UMBRALES_RIESGO['bajo'], UMBRALES_RIESGO['medio']], 'color': COLORS_ALPHA['warning_10']},
+                {'range': [UMBRALES_RIESGO['medio'], max_value], 'color': COLORS_ALPHA['danger_10']}
+            ],
+            'threshold': {'line': {'color': color, 'width': 3}, 'thickness': 0.8, 'value': 0}
+        }
+    ))
+
+    fig.update_layout(
+        height=320, margin=dict(l=20, r=20, t=50, b=20),
+        paper_bgcolor='rgba(0,0,0,0)', font={'family': 'Inter, sans-serif'}
+    )
+    return fig.to_dict()
+
+
+def patch_gauge(value):
+    """Patch del gauge base: valor, color de la barra y umbral"""
+    _, color = get_risk_level(value)
+    patch = Patch()
+    patch['data'][0]['value'] = value
+    patch['data'][0]['gauge']['bar']['color'] = color
+    patch['data'][0]['gauge']['threshold']['value'] = value
+    patch['data'][0]['gauge']['threshold']['line']['color'] = color
+    return patch
+
+
+# ============================================================
+# MAPA PCA DE CLUSTERS
+# ============================================================
+def _empty_figure(text):
+    fig = go.Figure()
+    fig.update_layout(
+        xaxis={'visible': False}, yaxis={'visible': False},
+        plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', height=500,
+        annotations=[{'text': text, 'xref': 'paper', 'yref': 'paper', 'showarrow': False,
+                      'font': {'size': 14, 'color': COLORS['text_muted']}}]
+    )
+    return fig.to_dict()
+
+
+@lru_cache(maxsize=1)
+def create_cluster_map_base():
+    """
+    Mapa PCA de clusters (Scattergl) a partir de la proyección precalculada.
+    La traza 0 es el punto del usuario (vacía); centroides y municipios por
+    cluster no cambian entre predicciones. Sin proyección devuelve un aviso.
+    """
+    proyeccion = cargar_proyeccion()
+    if proyeccion is None:
+        return _empty_figure('Proyección PCA no disponible (ejecute proyeccion_pca.py)')
+
+    traces = [go.Scattergl(
+        x=[], y=[], mode='markers', name='Tu Municipio',
+        marker=dict(size=20, symbol='star', color=COLORS['neutral'], line=dict(width=2, color='white')),
+        hovertemplate='<b>Tu Municipio</b><br>PC1: %{x:.2f}<br>PC2: %{y:.2f}<extra></extra>'
+    )]
+
+    puntos, etiquetas = proyeccion['puntos'], proyeccion['etiquetas']
+    for clust in range(len(proyeccion['centroides'])):
+        color = CLUSTER_PALETTE[clust % len(CLUSTER_PALETTE)]
+        miembros = puntos[etiquetas == clust]
+        if len(miembros):
+            traces.append(go.Scattergl(
+                x=miembros[:, 0], y=miembros[:, 1], mode='markers',
+                marker=dict(size=6, color=color, opacity=0.5),
+                name=f'Cluster {clust}', legendgroup=f'cluster-{clust}',
+                hovertemplate=f'<b>Cluster {clust}</b><br>PC1: %{{x:.2f}}<br>PC2: %{{y:.2f}}<extra></extra>'
+            ))
+        traces.append(go.Scattergl(
+            x=proyeccion['centroides'][clust:clust + 1, 0], y=proyeccion['centroides'][clust:clust + 1, 1],
+            mode='markers', marker=dict(size=14, color=color, symbol='diamond', line=dict(width=1, color='white')),
+            name=f'Centroide {clust}', legendgroup=f'cluster-{clust}',
+            hovertemplate=f'<b>Centroide cluster {clust}</b><br>PC1: %{{x:.2f}}<br>PC2: %{{y:.2f}}<extra></extra>'
+        ))
+
+    varianza = proyeccion['varianza_explicada']
+    fig = go.Figure(traces)
+    fig.update_layout(
+        title={'text': 'Análisis de Componentes Principales (PCA)',
+               'font': {'size': 16, 'color': COLORS['text'], 'family': 'Inter, sans-serif'},
+               'x': 0.5, 'xanchor': 'center'},
+        xaxis_title=f'Componente Principal 1 ({varianza[0]:.0%})',
+        yaxis_title=f'Componente Principal 2 ({varianza[1]:.0%})',
+        plot_bgcolor='rgba(248, 250, 252, 0.5)', paper_bgcolor='rgba(0,0,0,0)',
+        font={'family': 'Inter, sans-serif', 'color': COLORS['neutral']},
+        height=500, hovermode='closest', showlegend=True,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1,
+                    bgcolor="rgba(255,255,255,0.8)", bordercolor=COLORS['border'], borderwidth=1),
+        xaxis=dict(gridcolor=COLORS['border'], showgrid=True, zeroline=True, zerolinecolor=COLORS['border']),
+        yaxis=dict(gridcolor=COLORS['border'], showgrid=True, zeroline=True, zerolinecolor=COLORS['border'])
+    )
+    return fig.to_dict()
+
+
+def patch_cluster_map(valores, color):
+    """
+    Patch del mapa base: proyecta el punto del usuario con el mismo
+    scaler/PCA y solo reemplaza la traza 0. None si no hay proyección.
+    """
+    proyeccion = cargar_proyeccion()
+    if proyeccion is None:
+        return None
+    punto = proyectar(proyeccion, valores)[0]
+    patch = Patch()
+    patch['data'][0]['x'] = [float(punto[0])]
+    patch['data'][0]['y'] = [float(punto[1])]
+    patch['data'][0]['marker']['color'] = color
+    return patch
+
+
+# ============================================================
+# TORNADO DE SENSIBILIDAD
+# ============================================================
+def create_tornado_chart(sensibilidad):
+    """
+    Barras horizontales desde la predicción base hasta el mínimo y el máximo
+    alcanzados al recorrer cada variable; las más influyentes arriba.
+    """
+    base = sensibilidad['base']
+    variables = sensibilidad['variables'][::-1]
+    nombres = [v['nombre'] for v in variables]
+
+    fig = go.Figure([
+        go.Bar(
+            y=nombres, x=[v['minimo'] - base for v in variables], base=base, orientation='h',
+            name='Reduce la tasa', marker_color=COLORS['secondary'],
+            customdata=[v['valor_minimo'] for v in variables],
+            hovertemplate='<b>%{y}</b><br>Tasa: %{x:.1f}<br>Valor: %{customdata:,.2f}<extra></extra>'
+        ),
+        go.Bar(
+            y=nombres, x=[v['maximo'] - base for v in variables], base=base, orientation='h',
+            name='Aumenta la tasa', marker_color=COLORS['danger'],
+            customdata=[v['valor_maximo'] for v in variables],
+            hovertemplate='<b>%{y}</b><br>Tasa: %{x:.1f}<br>Valor: %{customdata:,.2f}<extra></extra>'
+        )
+    ])
+    fig.add_vline(x=base, line_width=2, line_color=COLORS['text'],
+                  annotation_text=f"Base {base:.1f}", annotation_position="top")
+    fig.update_layout(
+        height=120 + 40 * len(variables), barmode='overlay',
+        margin=dict(l=20, r=20, t=40, b=40),
+        plot_bgcolor='rgba(248, 250, 252, 0.5)', paper_bgcolor='rgba(0,0,0,0)',
+        xaxis_title='Tasa proyectada por 100,000 habitantes',
+        font={'family': 'Inter, sans-serif', 'color': COLORS['neutral']},
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        xaxis=dict(gridcolor=COLORS['border'], showgrid=True)
+    )
+    return fig
+
+
+# ============================================================
+# DISTRIBUCIÓN MONTE CARLO
+# ============================================================
+def create_incertidumbre_chart(mc):
+    """Histograma de las tasas simuladas con la banda P5-P95 y los umbrales de riesgo"""
+    p = mc['percentiles']
+    fig = go.Figure(go.Histogram(
+        x=mc['muestras'], nbinsx=40, marker_color=COLORS['primary'], opacity=0.75,
+        hovertemplate='Tasa: %{x}<br>Muestras: %{y}<extra></extra>'
+    ))
+    fig.add_vrect(x0=p[5], x1=p[95], fillcolor=COLORS_ALPHA['primary_10'], line_width=0,
+                  annotation_text="P5–P95", annotation_position="top left")
+    fig.add_vline(x=p[50], line_width=2, line_color=COLORS['text'])
+    for nombre, color in (('bajo', COLORS['warning']), ('medio', COLORS['danger'])):
+        fig.add_vline(x=UMBRALES_RIESGO[nombre], line_width=2, line_dash='dash', line_color=color)
+    fig.update_layout(
+        height=280, margin=dict(l=20, r=20, t=30, b=40), bargap=0.05,
+        plot_bgcolor='rgba(248, 250, 252, 0.5)', paper_bgcolor='rgba(0,0,0,0)',
+        xaxis_title='Tasa simulada por 100,000 habitantes', yaxis_title='Muestras',
+        font={'family': 'Inter, sans-serif', 'color': COLORS['neutral']},
+        showlegend=False, yaxis=dict(gridcolor=COLORS['border'], showgrid=True)
+    )
+    return fig
@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from utils import predict_catboost_batch
+from reportes import generar_informe, ESTILO_HTML
+from esquema import ORDEN_CATBOOST, CAMPOS_CATEGORICOS, validar_lote
+
+# ============================================================
+# GENERACIÓN MASIVA DE INFORMES POR MUNICIPIO
+# ============================================================
+# Uso:
+#   python generar_informes.py --entrada municipios.csv --salida reportes/2025T1
+#
+# El CSV trae una fila por municipio con la columna 'municipio' y las
+# variables de entrada del modelo CatBoost. Las predicciones se obtienen en
+# una sola pasada por lotes; los informes se renderizan en paralelo y las
+# secciones repetidas (p. ej. recomendaciones de un mismo nivel) salen de la
+# caché compartida. manifest.jsonl registra lo terminado para poder reanudar.
+
+HOJA_ESTILO = 'informe.css'
+MANIFEST = 'manifest.jsonl'
+
+
+def slug(texto):
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', texto.lower()).strip('_')
+
+
+def leer_manifest(directorio):
+    """Municipios ya generados cuyos archivos siguen en disco"""
+    path = os.path.join(directorio, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    terminados = {}
+    with open(path, encoding='utf-8') as archivo:
+        for linea in archivo:
+            registro = json.loads(linea)
+            if all(os.path.exists(os.path.join(directorio, registro[f])) for f in ('html', 'pdf')):
+                terminados[registro['clave']] = registro
+    return terminados
+
+
+def entrada_modelo(fila):
+    return {c: str(fila[c]) if c in CAMPOS_CATEGORICOS else float(fila[c]) for c in ORDEN_CATBOOST}
+
+
+def _generar_uno(tarea):
+    """Trabajo de un proceso del pool: renderiza y escribe un informe"""
+    clave, municipio, prediccion, metadatos, directorio = tarea
+    informe = generar_informe(
+        {'prediccion': prediccion}, dict(metadatos, municipio=municipio),
+        directorio=directorio, nombre_base=clave, hoja_estilo=HOJA_ESTILO
+    )
+    return dict(informe, clave=clave, municipio=municipio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un informe (HTML + PDF) por municipio")
+    parser.add_argument('--entrada', required=True, help="CSV con 'municipio' y las variables CatBoost")
+    parser.add_argument('--salida', default=os.path.join('reportes', 'lote'))
+    parser.add_argument('--procesos', type=int, default=os.cpu_count())
+    parser.add_argument('--lote', type=int, default=500, help="Filas por petición de predicción")
+    parser.add_argument('--titulo', default="Informe de Análisis Predictivo - Violencia Sexual NNA")
+    parser.add_argument('--responsable', default="")
+    args = parser.parse_args()
+
+    datos = pd.read_csv(args.entrada)
+    faltantes = [c for c in ['municipio', *ORDEN_CATBOOST] if c not in datos.columns]
+    if faltantes:
+        parser.error(f"Columnas faltantes en {args.entrada}: {', '.join(faltantes)}")
+
+    os.makedirs(args.salida, exist_ok=True)
+    # Recursos estáticos compartidos: una sola hoja de estilo para todos los HTML
+    with open(os.path.join(args.salida, HOJA_ESTILO), 'w', encoding='utf-8') as archivo:
+        archivo.write(ESTILO_HTML)
+
+    terminados = leer_manifest(args.salida)
+    datos['clave'] = [slug(f"{m}_{d}") for m, d in zip(datos['municipio'], datos['depto_hecho_dane'])]
+    # Filas distintas con la misma clave (p. ej. "Bogotá D.C." y "Bogota DC"):
+    # se desambiguan con el número de fila para no perder ningún informe
+    repetidas = datos['clave'].duplicated(keep=False)
+    if repetidas.any():
+        for clave, grupo in datos[repetidas].groupby('clave'):
+            print(f"  ⚠️ Clave repetida '{clave}' en las filas {', '.join(map(str, grupo.index))}: se agrega el número de fila")
+        datos.loc[repetidas, 'clave'] = [f"{c}_{i}" for c, i in zip(datos.loc[repetidas, 'clave'], datos.index[repetidas])]
+    pendientes = datos[~datos['clave'].isin(terminados)]
+    print(f"📋 {len(datos)} municipios · {len(terminados)} ya generados · {len(pendientes)} pendientes")
+    if pendientes.empty:
+        return
+
+    # Una sola pasada de predicción por lotes para todos los pendientes
+    entradas = [entrada_modelo(fila) for fila in pendientes.to_dict('records')]
+    _, errores = validar_lote(entradas)
+    if errores:
+        for fila, campo, mensaje in errores[:20]:
+            print(f"  ❌ {pendientes['municipio'].iloc[fila]}: {campo} - {mensaje}")
+        raise SystemExit(f"❌ {len(errores)} valores fuera del esquema; corrija el CSV antes de generar.")
+    predicciones = []
+    for inicio in range(0, len(entradas), args.lote):
+        lote = predict_catboost_batch(entradas[inicio:inicio + args.lote])
+        if lote is None:
+            raise SystemExit("❌ La API no respondió a la predicción por lotes; no se generó ningún informe.")
+        predicciones.extend(lote)
+
+    metadatos = {'titulo': args.titulo, 'responsable': args.responsable}
+    tareas = [
+        (clave, municipio, {'prediccion': pred, 'entrada': entrada}, metadatos, args.salida)
+        for clave, municipio, pred, entrada in zip(pendientes['clave'], pendientes['municipio'], predicciones, entradas)
+    ]
+
+    inicio = time.perf_counter()
+    fallos = []
+    with ProcessPoolExecutor(max_workers=args.procesos) as pool, \
+            open(os.path.join(args.salida, MANIFEST), 'a', encoding='utf-8') as manifest:
+        futuros = {pool.submit(_generar_uno, tarea): tarea[1] for tarea in tareas}
+        for i, futuro in enumerate(as_completed(futuros), 1):
+            try:
+                registro = futuro.result()
+            except Exception as e:
+                # Un informe que falla no detiene el lote: el resto se sigue registrando
+                fallos.append((futuros[futuro], e))
+                print(f"  ❌ {futuros[futuro]}: {type(e).__name__}: {e}")
+            else:
+                # Solo el proceso principal escribe el manifest (una línea por informe terminado)
+                manifest.write(json.dumps(
+                    {k: registro[k] for k in ('clave', 'municipio', 'html', 'pdf')}, ensure_ascii=False
+                ) + '\n')
+                manifest.flush()
+            if i % 50 == 0 or i == len(tareas):
+                print(f"  {i}/{len(tareas)} informes ({time.perf_counter() - inicio:.1f} s)")
+
+    if fallos:
+        detalle = "\n".join(f"  - {municipio}: {type(e).__name__}: {e}" for municipio, e in fallos)
+        raise SystemExit(
+            f"❌ {len(fallos)} de {len(tareas)} informes fallaron (vuelva a ejecutar para reintentarlos):\n{detalle}"
+        )
+    print(f"✅ Informes en {args.salida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import json
+import threading
+from plotly.io.json import to_json_plotly
+
+# ============================================================
+# CACHE DE LAYOUTS ESTÁTICOS PRE-SERIALIZADOS
+# ============================================================
+# Cada árbol estático se convierte a JSON una sola vez por proceso y se
+# guarda ya decodificado (dicts/listas). Devolverlo desde un callback evita
+# recorrer de nuevo cientos de componentes Dash en cada navegación. El
+# código y config.py solo cambian al reiniciar el proceso, así que no hay
+# nada que invalidar mientras corre.
+
+_registry = {}
+_lock = threading.Lock()
+
+
+def register_layout(name, factory):
+    """Registra un árbol estático; se construye en el primer get_layout"""
+    _registry[name] = {'factory': factory, 'payload': None, 'size': 0}
+
+
+def get_layout(name):
+    """Devuelve el layout pre-serializado (se construye en el primer uso)"""
+    entrada = _registry[name]
+    if entrada['payload'] is None:
+        with _lock:
+            if entrada['payload'] is None:
+                serialized = to_json_plotly(entrada['factory']())
+                entrada['size'] = len(serialized.encode('utf-8'))
+                entrada['payload'] = json.loads(serialized)
+                print(f"[layout-cache] {name}: {entrada['size'] / 1024:.1f} KB")
+    return entrada['payload']
+
+
+def warm_layouts():
+    """Serializa todos los layouts registrados (útil al arrancar el servidor)"""
+    for name in list(_registry):
+        get_layout(name)
+
+
+def layout_sizes():
+    """Tamaño serializado (bytes) de cada layout ya construido"""
+    return {name: e['size'] for name, e in _registry.items() if e['payload'] is not None}
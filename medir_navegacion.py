@@ -0,0 +1,113 @@
+import argparse
+import json
+import time
+import numpy as np
+from app import app
+import callbacks
+from pages.prediccion import create_prediction_module
+from pages.clusters import create_clusters_module
+from pages.alertas import _alertas_page, create_alertas_bar_chart, create_alertas_table, paginate_alertas
+from pages.recomendaciones import create_recomendaciones_module
+from pages.simulador import create_simulador_module
+from pages.informe import _informe_shell, create_informe_module
+from alertas_data import get_alertas_index
+
+# ============================================================
+# TIEMPO DE SERVIDOR POR CLIC DE NAVEGACIÓN
+# ============================================================
+# Uso:
+#   python medir_navegacion.py [--iteraciones 50] [--max-ms 10]
+#
+# Dispara navigate_modules por HTTP (/_dash-update-component, cliente de
+# prueba de Flask) para cada módulo y mide ms por clic, incluida la
+# serialización de la respuesta:
+#   antes:   la estrategia anterior, que construía las seis páginas
+#            completas en cada clic y devolvía una
+#   después: MODULE_FACTORIES tal como está (solo la página pedida, desde la
+#            caché de layouts)
+# Con --max-ms sale con error si algún módulo supera ese tiempo ('después').
+
+
+def _construir_alertas():
+    """Página de alertas con sus datos, como se armaba antes en cada clic"""
+    index = get_alertas_index()
+    primera, _, _ = paginate_alertas(index.query(), 1)
+    return _alertas_page(), create_alertas_bar_chart(index.top(10)), create_alertas_table(index.rows(primera))
+
+
+FABRICAS_SIN_CACHE = {
+    'prediccion': create_prediction_module,
+    'clusters': create_clusters_module,
+    'alertas': _construir_alertas,
+    'recomendaciones': create_recomendaciones_module,
+    'simulador': create_simulador_module,
+    'informe': lambda: (_informe_shell(), create_informe_module())
+}
+
+
+def _todas_las_paginas(module):
+    paginas = {nombre: fabrica() for nombre, fabrica in FABRICAS_SIN_CACHE.items()}
+    return paginas[module]
+
+
+def _peticion(module):
+    """Cuerpo de /_dash-update-component de un clic en el botón de `module`"""
+    return {
+        'output': '..active-module-store.data...main-content.children..',
+        'outputs': [
+            {'id': 'active-module-store', 'property': 'data'},
+            {'id': 'main-content', 'property': 'children'}
+        ],
+        'inputs': [[
+            {'id': {'index': m, 'type': 'nav-button'}, 'property': 'n_clicks', 'value': int(m == module)}
+            for m in callbacks.MODULE_FACTORIES
+        ]],
+        'state': [{'id': 'active-module-store', 'property': 'data', 'value': 'prediccion'}],
+        'changedPropIds': [json.dumps({'index': module, 'type': 'nav-button'}, separators=(',', ':')) + '.n_clicks']
+    }
+
+
+def medir(cliente, module, iteraciones):
+    """Mediana de ms por clic"""
+    cuerpo = _peticion(module)
+    cliente.post('/_dash-update-component', json=cuerpo)  # calentamiento
+    tiempos = []
+    for _ in range(iteraciones):
+        inicio = time.perf_counter()
+        respuesta = cliente.post('/_dash-update-component', json=cuerpo)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        if respuesta.status_code != 200:
+            raise SystemExit(f"❌ {module}: HTTP {respuesta.status_code}")
+    return float(np.median(tiempos))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el tiempo de servidor por clic de navegación")
+    parser.add_argument('--iteraciones', type=int, default=50)
+    parser.add_argument('--max-ms', type=float, default=None, help="Falla si algún módulo supera este tiempo")
+    args = parser.parse_args()
+
+    cliente = app.server.test_client()
+    actuales = dict(callbacks.MODULE_FACTORIES)
+
+    # Antes: cada clic construye todas las páginas
+    for module in actuales:
+        callbacks.MODULE_FACTORIES[module] = lambda module=module: _todas_las_paginas(module)
+    antes = {module: medir(cliente, module, args.iteraciones) for module in actuales}
+
+    callbacks.MODULE_FACTORIES.update(actuales)
+    despues = {module: medir(cliente, module, args.iteraciones) for module in actuales}
+
+    print(f"\n{'módulo':<18}{'antes':>10}{'después':>10}   (ms por clic, mediana de {args.iteraciones})")
+    for module in actuales:
+        print(f"{module:<18}{antes[module]:>10.1f}{despues[module]:>10.1f}")
+
+    if args.max_ms is not None:
+        lentos = [m for m, t in despues.items() if t > args.max_ms]
+        if lentos:
+            raise SystemExit(f"❌ Superan {args.max_ms} ms por clic: {', '.join(lentos)}")
+    print("✅ Navegación medida")
+
+
+if __name__ == '__main__':
+    main()
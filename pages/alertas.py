@@ -1,11 +1,25 @@
-from dash import html, dcc, ALL
+from dash import html, dcc, ALL, get_relative_path
 import dash_bootstrap_components as dbc
 import plotly.graph_objects as go
-import pandas as pd
-from config import COLORS, COLORS_ALPHA, DEPARTAMENTOS
+from config import COLORS, COLORS_ALPHA, DEPARTAMENTOS, ALERTAS_PAGE_SIZE
+from layout_cache import register_layout, get_layout
+from components import create_skeleton
 
-def create_alertas_bar_chart(data):
-    data_sorted = data.nlargest(10, 'Tasa_Proyectada')
+def alertas_page_info(page, total_rows, page_rows, page_size=ALERTAS_PAGE_SIZE):
+    if not total_rows:
+        return ""
+    start = (page - 1) * page_size + 1
+    return f"Mostrando {start}–{start + page_rows - 1} de {total_rows:,} municipios"
+
+def paginate_alertas(ids, page, page_size=ALERTAS_PAGE_SIZE):
+    """Devuelve (ids de la página, página efectiva, total de páginas)"""
+    total_pages = max(1, -(-len(ids) // page_size))
+    page = min(max(1, page or 1), total_pages)
+    start = (page - 1) * page_size
+    return ids[start:start + page_size], page, total_pages
+
+def create_alertas_bar_chart(data_sorted):
+    """Barras horizontales de las filas recibidas (ya ordenadas, p. ej. index.top(10))"""
     colors_map = {'Crítico': COLORS['danger'], 'Alto': COLORS['warning'], 'Medio': COLORS['info'], 'Bajo': COLORS['secondary']}
     bar_colors = [colors_map.get(nivel, COLORS['neutral']) for nivel in data_sorted['Nivel_Alerta']]
     
@@ -24,18 +38,19 @@ def create_alertas_bar_chart(data):
     return fig
 
 def create_alertas_table(data):
+    """Renderiza solo las filas recibidas (una página ya filtrada y ordenada)"""
     badge_colors = {'Crítico': ('danger', 'bi-exclamation-octagon-fill'), 'Alto': ('warning', 'bi-exclamation-triangle-fill'), 'Medio': ('info', 'bi-exclamation-circle-fill'), 'Bajo': ('success', 'bi-check-circle-fill')}
     rows = []
-    for idx, row in data.iterrows():
-        badge_color, badge_icon = badge_colors.get(row['Nivel_Alerta'], ('secondary', 'bi-circle'))
+    for row in data.itertuples():
+        badge_color, badge_icon = badge_colors.get(row.Nivel_Alerta, ('secondary', 'bi-circle'))
         rows.append(html.Tr([
-            html.Td(row['Municipio'], style={'fontWeight': '500', 'color': COLORS['text'], 'fontSize': '14px'}),
-            html.Td(row['Departamento'], style={'color': COLORS['neutral'], 'fontSize': '14px'}),
-            html.Td(f"{row['Tasa_Proyectada']:.1f}", style={'fontWeight': '600', 'color': COLORS['text'], 'fontSize': '14px'}),
-            html.Td(f"Cluster {row['Cluster']}", style={'color': COLORS['neutral'], 'fontSize': '14px'}),
-            html.Td(dbc.Badge([html.I(className=f"{badge_icon} me-1"), row['Nivel_Alerta']], color=badge_color, pill=True, style={'fontSize': '12px', 'fontWeight': '500', 'padding': '6px 12px'}), style={'textAlign': 'center'}),
-            html.Td(f"{row['Poblacion_Menores']:,}", style={'color': COLORS['neutral'], 'fontSize': '14px'}),
-            html.Td(dbc.Button(html.I(className="bi bi-eye"), id={'type': 'view-detail', 'index': idx}, color="primary", size="sm", outline=True, style={'padding': '4px 12px'}), style={'textAlign': 'center'})
+            html.Td(row.Municipio, style={'fontWeight': '500', 'color': COLORS['text'], 'fontSize': '14px'}),
+            html.Td(row.Departamento, style={'color': COLORS['neutral'], 'fontSize': '14px'}),
+            html.Td(f"{row.Tasa_Proyectada:.1f}", style={'fontWeight': '600', 'color': COLORS['text'], 'fontSize': '14px'}),
+            html.Td(f"Cluster {row.Cluster}", style={'color': COLORS['neutral'], 'fontSize': '14px'}),
+            html.Td(dbc.Badge([html.I(className=f"{badge_icon} me-1"), row.Nivel_Alerta], color=badge_color, pill=True, style={'fontSize': '12px', 'fontWeight': '500', 'padding': '6px 12px'}), style={'textAlign': 'center'}),
+            html.Td(f"{row.Poblacion_Menores:,}", style={'color': COLORS['neutral'], 'fontSize': '14px'}),
+            html.Td(dbc.Button(html.I(className="bi bi-eye"), id={'type': 'view-detail', 'index': row.Index}, color="primary", size="sm", outline=True, style={'padding': '4px 12px'}), style={'textAlign': 'center'})
         ], style={'borderBottom': f'1px solid {COLORS["border"]}'}))
     
     return html.Table([
@@ -43,43 +58,63 @@ def create_alertas_table(data):
         html.Tbody(rows)
     ], style={'width': '100%', 'borderCollapse': 'collapse'}, className="table-hover")
 
-def create_alertas_module():
-    alertas_data = pd.DataFrame({
-        'Municipio': ['Cartagena', 'Barranquilla', 'Santa Marta', 'Magangué', 'Turbaco', 'Soledad', 'Malambo', 'Ciénaga', 'Sabanalarga', 'Baranoa'],
-        'Departamento': ['Bolívar', 'Atlántico', 'Magdalena', 'Bolívar', 'Bolívar', 'Atlántico', 'Atlántico', 'Magdalena', 'Atlántico', 'Atlántico'],
-        'Tasa_Proyectada': [45.2, 38.7, 32.1, 51.3, 28.4, 41.8, 35.2, 29.7, 33.5, 27.8],
-        'Cluster': [2, 2, 1, 3, 1, 2, 2, 1, 2, 1],
-        'Nivel_Alerta': ['Alto', 'Alto', 'Medio', 'Crítico', 'Medio', 'Alto', 'Alto', 'Medio', 'Alto', 'Medio'],
-        'Poblacion_Menores': [185430, 234567, 98234, 45678, 23456, 156789, 87654, 56789, 34567, 28901]
-    })
-    
+# Tarjetas de resumen: (nivel, icono, color, etiqueta)
+STAT_CARDS = [
+    ('Crítico', 'bi-exclamation-octagon-fill', 'danger', "Municipios Críticos"),
+    ('Alto', 'bi-exclamation-triangle-fill', 'warning', "Alerta Alta"),
+    ('Medio', 'bi-exclamation-circle-fill', 'info', "Alerta Media"),
+    ('Bajo', 'bi-check-circle-fill', 'secondary', "Bajo Riesgo")
+]
+ALERTAS_COUNT_IDS = {'Crítico': 'alertas-count-critico', 'Alto': 'alertas-count-alto', 'Medio': 'alertas-count-medio', 'Bajo': 'alertas-count-bajo'}
+
+def create_alertas_stats(counts=None):
+    """Tarjetas con el número de municipios por nivel de alerta (skeleton si counts es None)"""
+    return dbc.Row([
+        dbc.Col([dbc.Card([dbc.CardBody([html.Div([html.I(className=f"bi {icon}", style={'fontSize': '32px', 'color': COLORS[color]}), html.H3(f"{counts.get(nivel, 0):,}" if counts is not None else html.Span(className="skeleton d-inline-block", style={'width': '64px', 'height': '36px'}), id=ALERTAS_COUNT_IDS[nivel], className="mb-0 mt-2", style={'color': COLORS[color], 'fontWeight': '700', 'fontSize': '36px'}), html.P(label, className="mb-0 mt-1", style={'color': COLORS['text_muted'], 'fontSize': '13px', 'fontWeight': '500'})], className="text-center")], style={'padding': '24px'})], className="shadow-sm stat-card", style={'borderRadius': '16px', 'borderLeftColor': COLORS[color], 'borderLeftWidth': '4px'})], md=3, className="mb-3")
+        for nivel, icon, color, label in STAT_CARDS
+    ], className="mb-4")
+
+def _alertas_page():
+    """
+    Página completa sin datos: los slots costosos (conteos, gráfico top 10 y
+    tabla) se muestran como skeleton y los llenan callbacks diferidos que se
+    disparan al montar la página. Así el layout no consulta el índice de
+    alertas y se pre-serializa una vez por proceso.
+    """
+    header = dbc.Row([dbc.Col([html.Div([html.H2([html.I(className="bi bi-exclamation-triangle-fill me-3", style={'color': COLORS['danger']}), "Alertas Tempranas"], style={'fontWeight': '700', 'color': COLORS['text'], 'marginBottom': '8px'}), html.P("Identificación de municipios que requieren atención prioritaria", style={'color': COLORS['text_muted'], 'fontSize': '15px', 'marginBottom': '0'})])])], className="mb-4")
+    table_header = html.Div([html.H5([html.I(className="bi bi-table me-2", style={'color': COLORS['primary']}), "Tabla de Alertas Municipales"], style={'color': COLORS['text'], 'fontWeight': '600', 'marginBottom': '0', 'flex': '1'}), dbc.Button([html.I(className="bi bi-download me-2"), "Exportar CSV"], id="btn-export-alertas", href=get_relative_path("/exportar/alertas.csv"), external_link=True, color="success", size="sm", outline=True, style={'fontWeight': '500'})], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '24px'})
+    filtros = dbc.Row([
+        dbc.Col([dbc.Label("Filtrar por Departamento"), dcc.Dropdown(id="filter-departamento", options=[{'label': 'Todos', 'value': 'all'}] + [{'label': d, 'value': d} for d in DEPARTAMENTOS], value='all', clearable=False)], md=4, className="mb-3"),
+        dbc.Col([dbc.Label("Filtrar por Nivel de Alerta"), dcc.Dropdown(id="filter-nivel", options=[{'label': 'Todos', 'value': 'all'}, {'label': 'Crítico', 'value': 'Crítico'}, {'label': 'Alto', 'value': 'Alto'}, {'label': 'Medio', 'value': 'Medio'}, {'label': 'Bajo', 'value': 'Bajo'}], value='all', clearable=False)], md=4, className="mb-3"),
+        dbc.Col([dbc.Label("Ordenar por"), dcc.Dropdown(id="sort-column", options=[{'label': 'Tasa Proyectada (Mayor a Menor)', 'value': 'tasa_desc'}, {'label': 'Tasa Proyectada (Menor a Mayor)', 'value': 'tasa_asc'}, {'label': 'Municipio (A-Z)', 'value': 'municipio_asc'}, {'label': 'Población Menores', 'value': 'poblacion_desc'}], value='tasa_desc', clearable=False)], md=4, className="mb-3")
+    ])
+    modal = dbc.Modal([
+        dbc.ModalHeader(dbc.ModalTitle("Detalle de Alerta"), close_button=True),
+        html.Div(id='modal-detalle-alerta-content')
+    ], id='modal-detalle-alerta', size='lg', is_open=False)
+
     return dbc.Container([
-        dbc.Row([dbc.Col([html.Div([html.H2([html.I(className="bi bi-exclamation-triangle-fill me-3", style={'color': COLORS['danger']}), "Alertas Tempranas"], style={'fontWeight': '700', 'color': COLORS['text'], 'marginBottom': '8px'}), html.P("Identificación de municipios que requieren atención prioritaria", style={'color': COLORS['text_muted'], 'fontSize': '15px', 'marginBottom': '0'})])])], className="mb-4"),
-        dbc.Row([
-            dbc.Col([dbc.Card([dbc.CardBody([html.Div([html.I(className="bi bi-exclamation-octagon-fill", style={'fontSize': '32px', 'color': COLORS['danger']}), html.H3("24", className="mb-0 mt-2", style={'color': COLORS['danger'], 'fontWeight': '700', 'fontSize': '36px'}), html.P("Municipios Críticos", className="mb-0 mt-1", style={'color': COLORS['text_muted'], 'fontSize': '13px', 'fontWeight': '500'})], className="text-center")], style={'padding': '24px'})], className="shadow-sm stat-card", style={'borderRadius': '16px', 'borderLeftColor': COLORS['danger'], 'borderLeftWidth': '4px'})], md=3, className="mb-3"),
-            dbc.Col([dbc.Card([dbc.CardBody([html.Div([html.I(className="bi bi-exclamation-triangle-fill", style={'fontSize': '32px', 'color': COLORS['warning']}), html.H3("48", className="mb-0 mt-2", style={'color': COLORS['warning'], 'fontWeight': '700', 'fontSize': '36px'}), html.P("Alerta Alta", className="mb-0 mt-1", style={'color': COLORS['text_muted'], 'fontSize': '13px', 'fontWeight': '500'})], className="text-center")], style={'padding': '24px'})], className="shadow-sm stat-card", style={'borderRadius': '16px', 'borderLeftColor': COLORS['warning'], 'borderLeftWidth': '4px'})], md=3, className="mb-3"),
-            dbc.Col([dbc.Card([dbc.CardBody([html.Div([html.I(className="bi bi-exclamation-circle-fill", style={'fontSize': '32px', 'color': COLORS['info']}), html.H3("87", className="mb-0 mt-2", style={'color': COLORS['info'], 'fontWeight': '700', 'fontSize': '36px'}), html.P("Alerta Media", className="mb-0 mt-1", style={'color': COLORS['text_muted'], 'fontSize': '13px', 'fontWeight': '500'})], className="text-center")], style={'padding': '24px'})], className="shadow-sm stat-card", style={'borderRadius': '16px', 'borderLeftColor': COLORS['info'], 'borderLeftWidth': '4px'})], md=3, className="mb-3"),
-            dbc.Col([dbc.Card([dbc.CardBody([html.Div([html.I(className="bi bi-check-circle-fill", style={'fontSize': '32px', 'color': COLORS['secondary']}), html.H3("163", className="mb-0 mt-2", style={'color': COLORS['secondary'], 'fontWeight': '700', 'fontSize': '36px'}), html.P("Bajo Riesgo", className="mb-0 mt-1", style={'color': COLORS['text_muted'], 'fontSize': '13px', 'fontWeight': '500'})], className="text-center")], style={'padding': '24px'})], className="shadow-sm stat-card", style={'borderRadius': '16px', 'borderLeftColor': COLORS['secondary'], 'borderLeftWidth': '4px'})], md=3, className="mb-3")
-        ], className="mb-4"),
-        dbc.Row([dbc.Col([dbc.Card([dbc.CardBody([html.H5([html.I(className="bi bi-bar-chart-fill me-2", style={'color': COLORS['danger']}), "Top 10 Municipios con Mayor Riesgo"], style={'color': COLORS['text'], 'fontWeight': '600', 'marginBottom': '20px'}), dcc.Graph(id="alertas-bar-chart", config={'displayModeBar': False}, figure=create_alertas_bar_chart(alertas_data))], style={'padding': '28px'})], className="shadow-sm", style={'borderRadius': '16px'})], md=12, className="mb-4")]),
+        header,
+        create_alertas_stats(),
+        dbc.Row([dbc.Col([dbc.Card([dbc.CardBody([html.H5([html.I(className="bi bi-bar-chart-fill me-2", style={'color': COLORS['danger']}), "Top 10 Municipios con Mayor Riesgo"], style={'color': COLORS['text'], 'fontWeight': '600', 'marginBottom': '20px'}), html.Div(id="alertas-bar-chart-container", children=create_skeleton('400px'))], style={'padding': '28px'})], className="shadow-sm", style={'borderRadius': '16px'})], md=12, className="mb-4")]),
         dbc.Row([
             dbc.Col([
                 dbc.Card([
                     dbc.CardBody([
-                        html.Div([html.H5([html.I(className="bi bi-table me-2", style={'color': COLORS['primary']}), "Tabla de Alertas Municipales"], style={'color': COLORS['text'], 'fontWeight': '600', 'marginBottom': '0', 'flex': '1'}), dbc.Button([html.I(className="bi bi-download me-2"), "Exportar CSV"], id="btn-export-alertas", color="success", size="sm", outline=True, style={'fontWeight': '500'})], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '24px'}),
-                        dbc.Row([
-                            dbc.Col([dbc.Label("Filtrar por Departamento"), dcc.Dropdown(id="filter-departamento", options=[{'label': 'Todos', 'value': 'all'}] + [{'label': d, 'value': d} for d in DEPARTAMENTOS], value='all', clearable=False)], md=4, className="mb-3"),
-                            dbc.Col([dbc.Label("Filtrar por Nivel de Alerta"), dcc.Dropdown(id="filter-nivel", options=[{'label': 'Todos', 'value': 'all'}, {'label': 'Crítico', 'value': 'Crítico'}, {'label': 'Alto', 'value': 'Alto'}, {'label': 'Medio', 'value': 'Medio'}, {'label': 'Bajo', 'value': 'Bajo'}], value='all', clearable=False)], md=4, className="mb-3"),
-                            dbc.Col([dbc.Label("Ordenar por"), dcc.Dropdown(id="sort-column", options=[{'label': 'Tasa Proyectada (Mayor a Menor)', 'value': 'tasa_desc'}, {'label': 'Tasa Proyectada (Menor a Mayor)', 'value': 'tasa_asc'}, {'label': 'Municipio (A-Z)', 'value': 'municipio_asc'}, {'label': 'Población Menores', 'value': 'poblacion_desc'}], value='tasa_desc', clearable=False)], md=4, className="mb-3")
-                        ]),
-                        html.Div(id="alertas-table-container", children=create_alertas_table(alertas_data), style={'maxHeight': '500px', 'overflowY': 'auto', 'marginTop': '20px'})
+                        table_header,
+                        filtros,
+                        html.Div(id="alertas-table-container", children=create_skeleton('40px', count=8), style={'maxHeight': '500px', 'overflowY': 'auto', 'marginTop': '20px'}),
+                        html.Div([html.Small(id="alertas-table-info", style={'color': COLORS['text_muted'], 'fontSize': '13px'}), dbc.Pagination(id="alertas-pagination", active_page=1, max_value=1, fully_expanded=False, previous_next=True, first_last=True, size="sm", class_name="mb-0")], style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'space-between', 'marginTop': '16px'})
                     ], style={'padding': '28px'})
                 ], className="shadow-sm", style={'borderRadius': '16px'})
             ])
         ]),
         # Modal para detalles
-        dbc.Modal([
-            dbc.ModalHeader(dbc.ModalTitle("Detalle de Alerta"), close_button=True),
-            html.Div(id='modal-detalle-alerta-content')
-        ], id='modal-detalle-alerta', size='lg', is_open=False)
-    ], fluid=True, style={'maxWidth': '1600px'})
\ No newline at end of file
+        modal
+    ], fluid=True, style={'maxWidth': '1600px'})
+
+register_layout('alertas', _alertas_page)
+
+def create_alertas_module():
+    """Página de alertas pre-serializada (los datos llegan por callbacks diferidos)"""
+    return get_layout('alertas')
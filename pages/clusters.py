@@ -1,6 +1,7 @@
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 from config import COLORS
+from figuras import create_cluster_map_base
 
 def create_clusters_module():
     return dbc.Container([
@@ -29,7 +30,7 @@ def create_clusters_module():
                 dbc.Card([
                     dbc.CardBody([
                         html.H5([html.I(className="bi bi-graph-up me-2", style={'color': COLORS['info']}), "Visualización de Clusters"], style={'color': COLORS['text'], 'fontWeight': '600', 'marginBottom': '20px'}),
-                        dcc.Graph(id="cluster-scatter", config={'displayModeBar': False}, style={'height': '500px'})
+                        dcc.Graph(id="cluster-scatter", figure=create_cluster_map_base(), config={'displayModeBar': False}, style={'height': '500px'})
                     ], style={'padding': '28px'})
                 ], className="shadow-sm", style={'borderRadius': '16px'})
             ], md=8)
@@ -1,5 +1,7 @@
-from dash import html, dcc, Input, Output, State
+from dash import html, dcc
 import dash_bootstrap_components as dbc
+from figuras import create_gauge_base
+from esquema import esquema_cliente
 from config import COLORS, SEXO_OPTIONS, GRUPO_EDAD_OPTIONS, CICLO_VITAL_OPTIONS, ESCOLARIDAD_OPTIONS, DEPARTAMENTOS
 
 def create_prediction_module():
@@ -304,197 +306,99 @@ def create_prediction_module():
                             style={'fontWeight': '600', 'padding': '14px'}
                         ),
                         
-                        html.Div(id="prediction-loading", className="text-center mt-3")
+                        html.Div(id="prediction-loading", className="text-center mt-3"),
+                        
+                        # Reglas de validación (esquema.py) y solicitud ya validada en el navegador
+                        dcc.Store(id="esquema-prediccion", data=esquema_cliente()),
+                        dcc.Store(id="prediction-request-store")
                     ], style={'padding': '28px'})
                 ], className="shadow-sm", style={'borderRadius': '16px'})
             ], md=5),
             
-            # Resultados
+            # Resultados: slot de errores + shell estático (oculto hasta predecir)
             dbc.Col([
-                html.Div(id="prediction-results")
+                html.Div(id="prediction-results"),
+                create_prediction_results_shell()
             ], md=7)
         ])
     ], fluid=True, style={'maxWidth': '1600px'})
 
 
-def register_validation_callbacks(app):
-    """Registrar callbacks para validaciones del formulario"""
-    
-    # Callback para calcular automáticamente población rural
-    @app.callback(
-        Output("porc_poblacion_rural", "value"),
-        Input("porc_poblacion_urbana", "value"),
-        prevent_initial_call=True
-    )
-    def calcular_poblacion_rural(urbana):
-        if urbana is not None and 0 <= urbana <= 100:
-            return round(100 - urbana, 1)
-        return None
-    
-    # Callback para validar todos los campos al hacer clic en predecir
-    @app.callback(
-        [
-            Output("poblacion_menores", "invalid"),
-            Output("feedback-poblacion_menores", "children"),
-            Output("porc_poblacion_urbana", "invalid"),
-            Output("feedback-porc_poblacion_urbana", "children"),
-            Output("ipm", "invalid"),
-            Output("feedback-ipm", "children"),
-            Output("cobertura_acueducto", "invalid"),
-            Output("feedback-cobertura_acueducto", "children"),
-            Output("cobertura_alcantarillado", "invalid"),
-            Output("feedback-cobertura_alcantarillado", "children"),
-            Output("cobertura_energia", "invalid"),
-            Output("feedback-cobertura_energia", "children"),
-            Output("pib_per_capita", "invalid"),
-            Output("feedback-pib_per_capita", "children"),
-            Output("tasa_homicidio", "invalid"),
-            Output("feedback-tasa_homicidio", "children"),
-            Output("validation-alert", "children"),
-        ],
-        Input("btn-predict", "n_clicks"),
-        [
-            State("poblacion_menores", "value"),
-            State("porc_poblacion_urbana", "value"),
-            State("ipm", "value"),
-            State("cobertura_acueducto", "value"),
-            State("cobertura_alcantarillado", "value"),
-            State("cobertura_energia", "value"),
-            State("pib_per_capita", "value"),
-            State("tasa_homicidio", "value"),
-            State("sexo_victima", "value"),
-            State("grupo_edad_victima", "value"),
-            State("ciclo_vital", "value"),
-            State("escolaridad", "value"),
-            State("depto_hecho_dane", "value"),
-        ],
-        prevent_initial_call=True
-    )
-    def validar_formulario(n_clicks, pob_menores, porc_urb, ipm, cob_acue, 
-                          cob_alcan, cob_ener, pib, tasa_hom,
-                          sexo, grupo_edad, ciclo, escolaridad, depto):
-        
-        errores = []
-        validaciones = []
-        
-        # Validar población menores
-        if pob_menores is None or pob_menores == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("Población menores")
-        elif pob_menores < 0:
-            validaciones.extend([True, "No puede ser negativo"])
-            errores.append("Población menores")
-        elif pob_menores > 10000000:
-            validaciones.extend([True, "Valor poco realista (máx: 10 millones)"])
-            errores.append("Población menores")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar % población urbana
-        if porc_urb is None or porc_urb == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("% Población urbana")
-        elif porc_urb < 0:
-            validaciones.extend([True, "No puede ser negativo"])
-            errores.append("% Población urbana")
-        elif porc_urb > 100:
-            validaciones.extend([True, "No puede ser mayor a 100%"])
-            errores.append("% Población urbana")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar IPM
-        if ipm is None or ipm == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("IPM")
-        elif ipm < 0:
-            validaciones.extend([True, "No puede ser negativo"])
-            errores.append("IPM")
-        elif ipm > 1:
-            validaciones.extend([True, "Debe estar entre 0 y 1"])
-            errores.append("IPM")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar cobertura acueducto
-        if cob_acue is None or cob_acue == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("Cobertura acueducto")
-        elif cob_acue < 0 or cob_acue > 100:
-            validaciones.extend([True, "Debe estar entre 0 y 100%"])
-            errores.append("Cobertura acueducto")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar cobertura alcantarillado
-        if cob_alcan is None or cob_alcan == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("Cobertura alcantarillado")
-        elif cob_alcan < 0 or cob_alcan > 100:
-            validaciones.extend([True, "Debe estar entre 0 y 100%"])
-            errores.append("Cobertura alcantarillado")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar cobertura energía
-        if cob_ener is None or cob_ener == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("Cobertura energía")
-        elif cob_ener < 0 or cob_ener > 100:
-            validaciones.extend([True, "Debe estar entre 0 y 100%"])
-            errores.append("Cobertura energía")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar PIB per cápita
-        if pib is None or pib == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("PIB per cápita")
-        elif pib < 0:
-            validaciones.extend([True, "No puede ser negativo"])
-            errores.append("PIB per cápita")
-        elif pib > 1000000000:
-            validaciones.extend([True, "Valor poco realista (máx: 1,000 millones)"])
-            errores.append("PIB per cápita")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar tasa homicidio
-        if tasa_hom is None or tasa_hom == "":
-            validaciones.extend([True, "Este campo es requerido"])
-            errores.append("Tasa homicidio")
-        elif tasa_hom < 0:
-            validaciones.extend([True, "No puede ser negativo"])
-            errores.append("Tasa homicidio")
-        elif tasa_hom > 500:
-            validaciones.extend([True, "Valor poco realista (máx: 500 por 100k)"])
-            errores.append("Tasa homicidio")
-        else:
-            validaciones.extend([False, ""])
-        
-        # Validar campos categóricos
-        if not sexo:
-            errores.append("Sexo")
-        if not grupo_edad:
-            errores.append("Grupo de edad")
-        if not ciclo:
-            errores.append("Ciclo vital")
-        if not escolaridad:
-            errores.append("Escolaridad")
-        if not depto:
-            errores.append("Departamento")
-        
-        # Crear alerta general si hay errores
-        if errores:
-            alert = dbc.Alert([
-                html.H6([
-                    html.I(className="bi bi-exclamation-triangle-fill me-2"),
-                    "Por favor corrija los siguientes campos:"
-                ], className="alert-heading mb-2"),
-                html.Ul([html.Li(error) for error in errores], className="mb-0")
-            ], color="danger", className="mt-3")
-            validaciones.append(alert)
-        else:
-            validaciones.append(None)
-        
-        return validaciones
+
+def _impact_card(icon, titulo, impacto, color, badge_color):
+    return dbc.Col([
+        dbc.Card([
+            dbc.CardBody([
+                html.I(className=f"bi {icon}", 
+                      style={'fontSize': '24px', 'color': color}),
+                html.H6(titulo, className="mt-2 mb-1",
+                       style={'fontSize': '14px', 'fontWeight': '600'}),
+                dbc.Badge(impacto, color=badge_color, 
+                         style={'fontSize': '11px'})
+            ], className="text-center py-3")
+        ], className="stat-card", 
+           style={'borderLeftColor': color, 
+                 'borderLeftWidth': '4px'})
+    ], md=3, className="mb-3")
+
+
+def create_prediction_results_shell():
+    """
+    Tarjeta de resultados estática. El callback de predicción solo aplica
+    un Patch al gauge y llena los slots 'prediction-resumen' y 'prediction-info'.
+    """
+    return html.Div([
+        dbc.Card([
+            dbc.CardBody([
+                # Título
+                html.H5([
+                    html.I(className="bi bi-check-circle-fill me-2", 
+                          style={'color': COLORS['secondary']}),
+                    "Resultados de la Predicción"
+                ], style={'color': COLORS['text'], 'fontWeight': '600', 
+                         'marginBottom': '24px'}),
+                
+                # Sección principal: Gauge + Badge
+                dbc.Row([
+                    dbc.Col([
+                        dcc.Graph(id="prediction-gauge", figure=create_gauge_base(), 
+                                 config={'displayModeBar': False})
+                    ], md=6),
+                    dbc.Col([
+                        html.Div(id="prediction-resumen", style={'marginTop': '16px'})
+                    ], md=6)
+                ]),
+                
+                html.Hr(style={'margin': '32px 0', 'borderColor': COLORS['border']}),
+                
+                # Variables de Mayor Impacto
+                html.Div([
+                    html.H6([
+                        html.I(className="bi bi-bar-chart-fill me-2"),
+                        "Variables de Mayor Impacto"
+                    ], style={'color': COLORS['text'], 'fontWeight': '600', 
+                             'marginBottom': '16px'}),
+                    
+                    dbc.Row([
+                        _impact_card("bi-exclamation-octagon-fill", "Tasa de Homicidio", "Impacto Alto", COLORS['danger'], "danger"),
+                        _impact_card("bi-graph-down", "IPM", "Impacto Alto", COLORS['warning'], "warning"),
+                        _impact_card("bi-cash-stack", "PIB per cápita", "Impacto Medio", COLORS['info'], "info"),
+                        _impact_card("bi-building", "Cobertura Servicios", "Impacto Medio", COLORS['secondary'], "success")
+                    ])
+                ]),
+                
+                html.Hr(style={'margin': '32px 0', 'borderColor': COLORS['border']}),
+                
+                # Información adicional
+                html.Div([
+                    html.H6([
+                        html.I(className="bi bi-info-circle-fill me-2"),
+                        "Información del Análisis"
+                    ], style={'color': COLORS['text'], 'fontWeight': '600', 
+                             'marginBottom': '16px'}),
+                    html.Div(id="prediction-info")
+                ])
+                
+            ], style={'padding': '32px'})
+        ], className="shadow-sm fade-in", style={'borderRadius': '16px'})
+    ], id="prediction-results-shell", style={'display': 'none'})
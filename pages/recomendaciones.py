@@ -1,4 +1,7 @@
-from dash import html, dcc
+import json
+from functools import lru_cache
+from dash import html, dcc, Patch
+from plotly.io.json import to_json_plotly
 import dash_bootstrap_components as dbc
 from config import COLORS
 
@@ -97,11 +100,276 @@ def create_recomendaciones_module():
         ], className="mb-4"),
         
         # Contenedor de recomendaciones
-        html.Div(id="recomendaciones-container")
+        html.Div(id="recomendaciones-container"),
+        # Clave (nivel, detalle, prioridad, adicionales) del contenido mostrado
+        dcc.Store(id="recomendaciones-clave-store"),
+        dcc.Download(id="recomendaciones-download")
         
     ], fluid=True, style={'maxWidth': '1600px'})
 
 
+# Base de recomendaciones por nivel de riesgo
+RECOMENDACIONES_BASE = {
+    'Bajo': {
+        'titulo': 'Estrategia de Mantenimiento y Fortalecimiento',
+        'descripcion': 'El municipio presenta indicadores favorables. Las acciones deben enfocarse en mantener y fortalecer los programas exitosos.',
+        'acciones': [
+            {
+                'categoria': 'Prevención',
+                'area': 'prevencion',
+                'icon': 'bi-shield-check',
+                'color': COLORS['secondary'],
+                'items': [
+                    'Mantener programas educativos en instituciones escolares',
+                    'Fortalecer redes comunitarias de protección',
+                    'Continuar campañas de sensibilización permanente',
+                    'Implementar sistema de monitoreo continuo de indicadores'
+                ]
+            },
+            {
+                'categoria': 'Institucional',
+                'area': 'institucional',
+                'icon': 'bi-building',
+                'color': COLORS['info'],
+                'items': [
+                    'Documentar buenas prácticas para replicar en otros municipios',
+                    'Capacitar equipos en detección temprana',
+                    'Crear protocolos de actuación preventiva',
+                    'Establecer alianzas interinstitucionales sólidas'
+                ]
+            }
+        ]
+    },
+    'Medio': {
+        'titulo': 'Estrategia de Refuerzo y Atención Prioritaria',
+        'descripcion': 'El municipio requiere atención focalizada. Es necesario implementar acciones preventivas específicas y fortalecer la respuesta institucional.',
+        'acciones': [
+            {
+                'categoria': 'Prevención Reforzada',
+                'area': 'prevencion',
+                'icon': 'bi-exclamation-triangle',
+                'color': COLORS['warning'],
+                'items': [
+                    'Intensificar programas educativos en zonas de mayor vulnerabilidad',
+                    'Implementar talleres de parentalidad positiva y crianza respetuosa',
+                    'Crear espacios seguros y recreativos para NNA',
+                    'Establecer líneas de reporte anónimo y seguro',
+                    'Desarrollar campañas focalizadas en grupos de riesgo'
+                ]
+            },
+            {
+                'categoria': 'Atención y Servicios',
+                'area': 'atencion',
+                'icon': 'bi-heart-pulse',
+                'color': COLORS['danger'],
+                'items': [
+                    'Fortalecer servicios de atención psicosocial',
+                    'Ampliar horarios de atención en comisarías de familia',
+                    'Capacitar personal de salud en detección de signos de alerta',
+                    'Crear rutas de atención clara y accesible',
+                    'Implementar seguimiento a casos identificados'
+                ]
+            },
+            {
+                'categoria': 'Fortalecimiento Institucional',
+                'area': 'institucional',
+                'icon': 'bi-gear',
+                'color': COLORS['info'],
+                'items': [
+                    'Aumentar personal especializado en protección infantil',
+                    'Mejorar coordinación entre instituciones (salud, educación, justicia)',
+                    'Implementar sistema de información integrado',
+                    'Realizar auditorías periódicas de protocolos'
+                ]
+            }
+        ]
+    },
+    'Alto': {
+        'titulo': 'Estrategia de Intervención Urgente y Transformación',
+        'descripcion': 'El municipio presenta nivel de riesgo alto. Se requiere intervención inmediata, coordinada y con asignación prioritaria de recursos.',
+        'acciones': [
+            {
+                'categoria': 'Acción Inmediata (0-3 meses)',
+                'area': 'atencion',
+                'icon': 'bi-exclamation-octagon-fill',
+                'color': COLORS['danger'],
+                'items': [
+                    'DECLARAR ALERTA MUNICIPAL - Activar comité de emergencia',
+                    'Asignar presupuesto de emergencia para protección de NNA',
+                    'Reforzar inmediatamente personal en comisarías y defensoría',
+                    'Implementar operativos de identificación de casos en zonas críticas',
+                    'Crear centro temporal de atención y protección 24/7',
+                    'Establecer mesa permanente de coordinación interinstitucional'
+                ]
+            },
+            {
+                'categoria': 'Prevención Intensiva (3-12 meses)',
+                'area': 'prevencion',
+                'icon': 'bi-shield-fill-exclamation',
+                'color': COLORS['warning'],
+                'items': [
+                    'Desplegar brigadas móviles de prevención en sectores de alto riesgo',
+                    'Implementar programa integral de educación sexual y prevención',
+                    'Crear red de líderes comunitarios capacitados en protección',
+                    'Establecer sistema de alerta temprana con indicadores específicos',
+                    'Realizar jornadas masivas de sensibilización casa a casa',
+                    'Implementar programa de mentoría para familias vulnerables'
+                ]
+            },
+            {
+                'categoria': 'Atención Especializada',
+                'area': 'atencion',
+                'icon': 'bi-hospital',
+                'color': COLORS['primary'],
+                'items': [
+                    'Crear unidad especializada de atención a víctimas (médica, psicológica, legal)',
+                    'Implementar modelo de atención integral con enfoque de trauma',
+                    'Establecer casas de acogida temporal para casos de emergencia',
+                    'Contratar equipo multidisciplinario especializado',
+                    'Implementar programa de seguimiento post-atención a largo plazo',
+                    'Crear protocolo de atención diferencial por edad y género'
+                ]
+            },
+            {
+                'categoria': 'Transformación Estructural (12+ meses)',
+                'area': 'institucional',
+                'icon': 'bi-building-gear',
+                'color': COLORS['info'],
+                'items': [
+                    'Reestructurar sistema municipal de protección infantil',
+                    'Implementar observatorio municipal de violencia contra NNA',
+                    'Crear política pública específica con metas medibles',
+                    'Establecer sistema de monitoreo y evaluación permanente',
+                    'Gestionar recursos nacionales e internacionales',
+                    'Desarrollar plan de sostenibilidad financiera a mediano plazo'
+                ]
+            }
+        ]
+    }
+}
+
+
+# Recomendaciones adicionales disparadas por variables específicas de la entrada
+RECOMENDACIONES_ADICIONALES = {
+    'ipm': {
+        'umbral': 0.3,
+        'titulo': 'Alto Índice de Pobreza Multidimensional',
+        'icon': 'bi-graph-down',
+        'color': COLORS['danger'],
+        'items': [
+            'Priorizar programas de transferencias condicionadas a familias vulnerables',
+            'Ampliar cobertura de programas de alimentación escolar',
+            'Implementar subsidios para servicios básicos en zonas críticas',
+            'Crear programas de generación de ingresos para madres cabeza de familia'
+        ]
+    },
+    'tasa_homicidio': {
+        'umbral': 15,
+        'titulo': 'Alta Tasa de Homicidios - Inseguridad',
+        'icon': 'bi-exclamation-diamond',
+        'color': COLORS['danger'],
+        'items': [
+            'Coordinar con policía para aumentar patrullaje en zonas escolares',
+            'Implementar rutas seguras para NNA (escuela-hogar)',
+            'Crear espacios comunitarios protegidos para actividades recreativas',
+            'Establecer programa de desarme y convivencia ciudadana',
+            'Iluminar vías y espacios públicos frecuentados por menores'
+        ]
+    }
+}
+
+# Acciones por categoría en el resumen ejecutivo (None = todas)
+ITEMS_POR_DETALLE = {'ejecutivo': 3, 'detallado': None, 'completo': None}
+
+
+# ============================================================
+# CATÁLOGO INDEXADO Y BLOQUES MEMOIZADOS
+# ============================================================
+# El catálogo se indexa una vez por proceso (nivel -> área -> categorías).
+# La selección y los bloques renderizados (ya serializados, como en
+# layout_cache) dependen solo de la clave (nivel, detalle, prioridad,
+# adicionales activas); la tasa proyectada va en la tarjeta de resumen,
+# que es lo único que se construye en cada clic.
+def _indexar_catalogo():
+    catalogo = {}
+    for nivel, recs in RECOMENDACIONES_BASE.items():
+        por_area = {}
+        for categoria in recs['acciones']:
+            por_area.setdefault(categoria['area'], []).append(categoria)
+        catalogo[nivel] = {**recs, 'por_area': por_area}
+    return catalogo
+
+
+CATALOGO = _indexar_catalogo()
+
+
+def clave_recomendaciones(nivel_riesgo, nivel_detalle='detallado', prioridad='integral',
+                          ipm=None, tasa_homicidio=None):
+    """Clave de memoización: nivel, detalle, prioridad y adicionales que aplican"""
+    valores = {'ipm': ipm, 'tasa_homicidio': tasa_homicidio}
+    adicionales = tuple(
+        variable for variable, rec in RECOMENDACIONES_ADICIONALES.items()
+        if valores[variable] and valores[variable] > rec['umbral']
+    )
+    nivel = nivel_riesgo if nivel_riesgo in CATALOGO else 'Medio'
+    return (nivel, nivel_detalle or 'detallado', prioridad or 'integral', adicionales)
+
+
+def clave_desde_store(data):
+    """Clave guardada en recomendaciones-clave-store (JSON: listas) como tupla"""
+    return (*data[:3], tuple(data[3])) if data else None
+
+
+@lru_cache(maxsize=None)
+def seleccionar_recomendaciones(clave):
+    """
+    Categorías del nivel (las del área priorizada primero) recortadas según
+    el nivel de detalle, y las recomendaciones adicionales de la clave.
+    """
+    nivel, detalle, prioridad, adicionales = clave
+    recs = CATALOGO[nivel]
+    acciones = recs['acciones']
+    if prioridad in recs['por_area']:
+        priorizadas = recs['por_area'][prioridad]
+        acciones = priorizadas + [cat for cat in acciones if cat not in priorizadas]
+
+    limite = ITEMS_POR_DETALLE.get(detalle)
+    if limite:
+        acciones = [dict(cat, items=cat['items'][:limite]) for cat in acciones]
+
+    recs_base = {'titulo': recs['titulo'], 'descripcion': recs['descripcion'], 'acciones': acciones}
+    return recs_base, [RECOMENDACIONES_ADICIONALES[variable] for variable in adicionales]
+
+
+def get_recomendaciones(nivel_riesgo, ipm=None, tasa_homicidio=None,
+                        nivel_detalle='detallado', prioridad='integral'):
+    """
+    Recomendaciones base del nivel de riesgo + adicionales según variables
+    específicas. Lo usan la página y el generador de informes.
+    """
+    clave = clave_recomendaciones(nivel_riesgo, nivel_detalle, prioridad, ipm, tasa_homicidio)
+    return seleccionar_recomendaciones(clave)
+
+
+def _serializar(componente):
+    return json.loads(to_json_plotly(componente))
+
+
+@lru_cache(maxsize=128)
+def _bloques_renderizados(clave):
+    """Tarjetas de categorías, adicionales, recursos y descarga (pre-serializadas)"""
+    recs_base, adicionales = seleccionar_recomendaciones(clave)
+    bloques = [
+        html.Div([create_categoria_card(cat) for cat in recs_base['acciones']]),
+        html.Div([create_recomendacion_adicional_card(rec) for rec in adicionales]) if adicionales else html.Div()
+    ]
+    # El resumen ejecutivo omite el directorio de recursos
+    if clave[1] != 'ejecutivo':
+        bloques.append(create_recursos_card())
+    bloques.append(create_descarga_recomendaciones())
+    return [_serializar(bloque) for bloque in bloques]
+
+
 def create_recomendaciones_content(nivel_riesgo, tasa_proyectada, nivel_detalle, prioridad, 
                                    departamento=None, ipm=None, tasa_homicidio=None):
     """
@@ -116,7 +384,25 @@ def create_recomendaciones_content(nivel_riesgo, tasa_proyectada, nivel_detalle,
         ipm: float (opcional)
         tasa_homicidio: float (opcional)
     """
-    
+    clave = clave_recomendaciones(nivel_riesgo, nivel_detalle, prioridad, ipm, tasa_homicidio)
+    return html.Div([
+        create_resumen_card(clave, tasa_proyectada),
+        *_bloques_renderizados(clave)
+    ])
+
+
+def patch_tasa_recomendaciones(clave, tasa_proyectada):
+    """Patch del contenido ya mostrado para la misma clave: solo cambia la tarjeta de resumen"""
+    patch = Patch()
+    patch['props']['children'][0] = create_resumen_card(clave, tasa_proyectada)
+    return patch
+
+
+def create_resumen_card(clave, tasa_proyectada):
+    """Card principal con el resumen (la única parte que depende de la tasa)"""
+    nivel_riesgo = clave[0]
+    recs_base, recomendaciones_adicionales = seleccionar_recomendaciones(clave)
+
     # Mapeo de colores por nivel
     color_map = {
         'Bajo': COLORS['secondary'],
@@ -127,345 +413,78 @@ def create_recomendaciones_content(nivel_riesgo, tasa_proyectada, nivel_detalle,
     
     color_nivel = color_map.get(nivel_riesgo, COLORS['neutral'])
     
-    # Base de recomendaciones por nivel de riesgo
-    recomendaciones_base = {
-        'Bajo': {
-            'titulo': 'Estrategia de Mantenimiento y Fortalecimiento',
-            'descripcion': 'El municipio presenta indicadores favorables. Las acciones deben enfocarse en mantener y fortalecer los programas exitosos.',
-            'acciones': [
-                {
-                    'categoria': 'Prevención',
-                    'icon': 'bi-shield-check',
-                    'color': COLORS['secondary'],
-                    'items': [
-                        'Mantener programas educativos en instituciones escolares',
-                        'Fortalecer redes comunitarias de protección',
-                        'Continuar campañas de sensibilización permanente',
-                        'Implementar sistema de monitoreo continuo de indicadores'
-                    ]
-                },
-                {
-                    'categoria': 'Institucional',
-                    'icon': 'bi-building',
-                    'color': COLORS['info'],
-                    'items': [
-                        'Documentar buenas prácticas para replicar en otros municipios',
-                        'Capacitar equipos en detección temprana',
-                        'Crear protocolos de actuación preventiva',
-                        'Establecer alianzas interinstitucionales sólidas'
-                    ]
-                }
-            ]
-        },
-        'Medio': {
-            'titulo': 'Estrategia de Refuerzo y Atención Prioritaria',
-            'descripcion': 'El municipio requiere atención focalizada. Es necesario implementar acciones preventivas específicas y fortalecer la respuesta institucional.',
-            'acciones': [
-                {
-                    'categoria': 'Prevención Reforzada',
-                    'icon': 'bi-exclamation-triangle',
-                    'color': COLORS['warning'],
-                    'items': [
-                        'Intensificar programas educativos en zonas de mayor vulnerabilidad',
-                        'Implementar talleres de parentalidad positiva y crianza respetuosa',
-                        'Crear espacios seguros y recreativos para NNA',
-                        'Establecer líneas de reporte anónimo y seguro',
-                        'Desarrollar campañas focalizadas en grupos de riesgo'
-                    ]
-                },
-                {
-                    'categoria': 'Atención y Servicios',
-                    'icon': 'bi-heart-pulse',
-                    'color': COLORS['danger'],
-                    'items': [
-                        'Fortalecer servicios de atención psicosocial',
-                        'Ampliar horarios de atención en comisarías de familia',
-                        'Capacitar personal de salud en detección de signos de alerta',
-                        'Crear rutas de atención clara y accesible',
-                        'Implementar seguimiento a casos identificados'
-                    ]
-                },
-                {
-                    'categoria': 'Fortalecimiento Institucional',
-                    'icon': 'bi-gear',
-                    'color': COLORS['info'],
-                    'items': [
-                        'Aumentar personal especializado en protección infantil',
-                        'Mejorar coordinación entre instituciones (salud, educación, justicia)',
-                        'Implementar sistema de información integrado',
-                        'Realizar auditorías periódicas de protocolos'
-                    ]
-                }
-            ]
-        },
-        'Alto': {
-            'titulo': 'Estrategia de Intervención Urgente y Transformación',
-            'descripcion': 'El municipio presenta nivel de riesgo alto. Se requiere intervención inmediata, coordinada y con asignación prioritaria de recursos.',
-            'acciones': [
-                {
-                    'categoria': 'Acción Inmediata (0-3 meses)',
-                    'icon': 'bi-exclamation-octagon-fill',
-                    'color': COLORS['danger'],
-                    'items': [
-                        'DECLARAR ALERTA MUNICIPAL - Activar comité de emergencia',
-                        'Asignar presupuesto de emergencia para protección de NNA',
-                        'Reforzar inmediatamente personal en comisarías y defensoría',
-                        'Implementar operativos de identificación de casos en zonas críticas',
-                        'Crear centro temporal de atención y protección 24/7',
-                        'Establecer mesa permanente de coordinación interinstitucional'
-                    ]
-                },
-                {
-                    'categoria': 'Prevención Intensiva (3-12 meses)',
-                    'icon': 'bi-shield-fill-exclamation',
-                    'color': COLORS['warning'],
-                    'items': [
-                        'Desplegar brigadas móviles de prevención en sectores de alto riesgo',
-                        'Implementar programa integral de educación sexual y prevención',
-                        'Crear red de líderes comunitarios capacitados en protección',
-                        'Establecer sistema de alerta temprana con indicadores específicos',
-                        'Realizar jornadas masivas de sensibilización casa a casa',
-                        'Implementar programa de mentoría para familias vulnerables'
-                    ]
-                },
-                {
-                    'categoria': 'Atención Especializada',
-                    'icon': 'bi-hospital',
-                    'color': COLORS['primary'],
-                    'items': [
-                        'Crear unidad especializada de atención a víctimas (médica, psicológica, legal)',
-                        'Implementar modelo de atención integral con enfoque de trauma',
-                        'Establecer casas de acogida temporal para casos de emergencia',
-                        'Contratar equipo multidisciplinario especializado',
-                        'Implementar programa de seguimiento post-atención a largo plazo',
-                        'Crear protocolo de atención diferencial por edad y género'
-                    ]
-                },
-                {
-                    'categoria': 'Transformación Estructural (12+ meses)',
-                    'icon': 'bi-building-gear',
-                    'color': COLORS['info'],
-                    'items': [
-                        'Reestructurar sistema municipal de protección infantil',
-                        'Implementar observatorio municipal de violencia contra NNA',
-                        'Crear política pública específica con metas medibles',
-                        'Establecer sistema de monitoreo y evaluación permanente',
-                        'Gestionar recursos nacionales e internacionales',
-                        'Desarrollar plan de sostenibilidad financiera a mediano plazo'
-                    ]
-                }
-            ]
-        }
-    }
-    
-    # Obtener recomendaciones base
-    recs_base = recomendaciones_base.get(nivel_riesgo, recomendaciones_base['Medio'])
-    
-    # Recomendaciones adicionales basadas en variables específicas
-    recomendaciones_adicionales = []
-    
-    if ipm and ipm > 0.3:
-        recomendaciones_adicionales.append({
-            'titulo': 'Alto Índice de Pobreza Multidimensional',
-            'icon': 'bi-graph-down',
-            'color': COLORS['danger'],
-            'items': [
-                'Priorizar programas de transferencias condicionadas a familias vulnerables',
-                'Ampliar cobertura de programas de alimentación escolar',
-                'Implementar subsidios para servicios básicos en zonas críticas',
-                'Crear programas de generación de ingresos para madres cabeza de familia'
-            ]
-        })
-    
-    if tasa_homicidio and tasa_homicidio > 15:
-        recomendaciones_adicionales.append({
-            'titulo': 'Alta Tasa de Homicidios - Inseguridad',
-            'icon': 'bi-exclamation-diamond',
-            'color': COLORS['danger'],
-            'items': [
-                'Coordinar con policía para aumentar patrullaje en zonas escolares',
-                'Implementar rutas seguras para NNA (escuela-hogar)',
-                'Crear espacios comunitarios protegidos para actividades recreativas',
-                'Establecer programa de desarme y convivencia ciudadana',
-                'Iluminar vías y espacios públicos frecuentados por menores'
-            ]
-        })
-    
-    # Construir el contenido visual
-    content = html.Div([
-        # Card principal con resumen
-        dbc.Card([
-            dbc.CardBody([
+    return dbc.Card([
+        dbc.CardBody([
+            html.Div([
+                # Ícono y título
                 html.Div([
-                    # Ícono y título
-                    html.Div([
-                        html.I(className="bi bi-clipboard-check-fill", 
-                              style={'fontSize': '48px', 'color': color_nivel, 
-                                    'marginBottom': '16px'})
-                    ], className="text-center"),
-                    
-                    html.H3(recs_base['titulo'], 
-                           style={'color': COLORS['text'], 'fontWeight': '700', 
-                                 'textAlign': 'center', 'marginBottom': '12px'}),
-                    
-                    html.Div([
-                        dbc.Badge([
-                            html.I(className="bi bi-info-circle me-2"),
-                            f"Nivel de Riesgo: {nivel_riesgo}"
-                        ], color=color_nivel.replace('#', ''),
-                           style={'fontSize': '14px', 'padding': '8px 16px', 'fontWeight': '500'})
-                    ], className="text-center mb-3"),
-                    
-                    html.Hr(style={'margin': '24px 0', 'borderColor': COLORS['border']}),
-                    
-                    # Descripción
-                    html.P(recs_base['descripcion'],
-                          style={'fontSize': '15px', 'color': COLORS['neutral'], 
-                                'lineHeight': '1.8', 'textAlign': 'center', 
-                                'marginBottom': '24px', 'padding': '0 20px'}),
-                    
-                    # Estadísticas clave
-                    dbc.Row([
-                        dbc.Col([
-                            html.Div([
-                                html.Small("Tasa Proyectada", 
-                                          style={'color': COLORS['text_muted'], 
-                                                'fontSize': '12px', 'display': 'block'}),
-                                html.H4(f"{tasa_proyectada:.2f}", 
-                                       style={'color': color_nivel, 'fontWeight': '700', 
-                                             'marginTop': '8px', 'marginBottom': '4px'}),
-                                html.Small("por 100k hab.", 
-                                          style={'color': COLORS['text_muted'], 'fontSize': '11px'})
-                            ], className="text-center")
-                        ], md=4),
-                        dbc.Col([
-                            html.Div([
-                                html.Small("Categorías de Acción", 
-                                          style={'color': COLORS['text_muted'], 
-                                                'fontSize': '12px', 'display': 'block'}),
-                                html.H4(f"{len(recs_base['acciones']) + len(recomendaciones_adicionales)}", 
-                                       style={'color': COLORS['primary'], 'fontWeight': '700', 
-                                             'marginTop': '8px', 'marginBottom': '4px'}),
-                                html.Small("áreas de intervención", 
-                                          style={'color': COLORS['text_muted'], 'fontSize': '11px'})
-                            ], className="text-center")
-                        ], md=4),
-                        dbc.Col([
-                            html.Div([
-                                html.Small("Acciones Sugeridas", 
-                                          style={'color': COLORS['text_muted'], 
-                                                'fontSize': '12px', 'display': 'block'}),
-                                html.H4(f"{sum(len(cat['items']) for cat in recs_base['acciones'])}", 
-                                       style={'color': COLORS['secondary'], 'fontWeight': '700', 
-                                             'marginTop': '8px', 'marginBottom': '4px'}),
-                                html.Small("recomendaciones", 
-                                          style={'color': COLORS['text_muted'], 'fontSize': '11px'})
-                            ], className="text-center")
-                        ], md=4)
-                    ], className="mb-3")
-                ])
-            ], style={'padding': '32px'})
-        ], className="shadow-sm mb-4", style={'borderRadius': '16px'}),
-        
-        # Cards de recomendaciones por categoría
-        html.Div([
-            create_categoria_card(cat) for cat in recs_base['acciones']
-        ]),
-        
-        # Recomendaciones adicionales específicas
-        html.Div([
-            create_recomendacion_adicional_card(rec) for rec in recomendaciones_adicionales
-        ]) if recomendaciones_adicionales else html.Div(),
-        
-        # Card de recursos y contactos
-        dbc.Card([
-            dbc.CardBody([
-                html.H5([
-                    html.I(className="bi bi-telephone-fill me-2", 
-                          style={'color': COLORS['primary']}),
-                    "Recursos y Líneas de Contacto"
-                ], style={'color': COLORS['text'], 'fontWeight': '600', 
-                         'marginBottom': '20px'}),
+                    html.I(className="bi bi-clipboard-check-fill", 
+                          style={'fontSize': '48px', 'color': color_nivel, 
+                                'marginBottom': '16px'})
+                ], className="text-center"),
+                
+                html.H3(recs_base['titulo'], 
+                       style={'color': COLORS['text'], 'fontWeight': '700', 
+                             'textAlign': 'center', 'marginBottom': '12px'}),
+                
+                html.Div([
+                    dbc.Badge([
+                        html.I(className="bi bi-info-circle me-2"),
+                        f"Nivel de Riesgo: {nivel_riesgo}"
+                    ], color=color_nivel.replace('#', ''),
+                       style={'fontSize': '14px', 'padding': '8px 16px', 'fontWeight': '500'})
+                ], className="text-center mb-3"),
+                
+                html.Hr(style={'margin': '24px 0', 'borderColor': COLORS['border']}),
                 
+                # Descripción
+                html.P(recs_base['descripcion'],
+                      style={'fontSize': '15px', 'color': COLORS['neutral'], 
+                            'lineHeight': '1.8', 'textAlign': 'center', 
+                            'marginBottom': '24px', 'padding': '0 20px'}),
+                
+                # Estadísticas clave
                 dbc.Row([
                     dbc.Col([
                         html.Div([
-                            html.I(className="bi bi-shield-fill-check", 
-                                  style={'fontSize': '24px', 'color': COLORS['primary']}),
-                            html.H6("ICBF", className="mt-2", 
-                                   style={'fontSize': '14px', 'fontWeight': '600'}),
-                            html.P("Línea 141", style={'fontSize': '13px', 'color': COLORS['neutral'], 
-                                                       'marginBottom': '4px'}),
-                            html.Small("Atención 24/7", style={'fontSize': '11px', 
-                                                               'color': COLORS['text_muted']})
-                        ], className="text-center p-3", 
-                           style={'backgroundColor': COLORS['bg'], 'borderRadius': '12px'})
-                    ], md=3, className="mb-3"),
-                    
+                            html.Small("Tasa Proyectada", 
+                                      style={'color': COLORS['text_muted'], 
+                                            'fontSize': '12px', 'display': 'block'}),
+                            html.H4(f"{tasa_proyectada:.2f}", 
+                                   style={'color': color_nivel, 'fontWeight': '700', 
+                                         'marginTop': '8px', 'marginBottom': '4px'}),
+                            html.Small("por 100k hab.", 
+                                      style={'color': COLORS['text_muted'], 'fontSize': '11px'})
+                        ], className="text-center")
+                    ], md=4),
                     dbc.Col([
                         html.Div([
-                            html.I(className="bi bi-hospital", 
-                                  style={'fontSize': '24px', 'color': COLORS['danger']}),
-                            html.H6("Emergencias", className="mt-2", 
-                                   style={'fontSize': '14px', 'fontWeight': '600'}),
-                            html.P("Línea 123", style={'fontSize': '13px', 'color': COLORS['neutral'], 
-                                                       'marginBottom': '4px'}),
-                            html.Small("Nacional", style={'fontSize': '11px', 
-                                                         'color': COLORS['text_muted']})
-                        ], className="text-center p-3", 
-                           style={'backgroundColor': COLORS['bg'], 'borderRadius': '12px'})
-                    ], md=3, className="mb-3"),
-                    
+                            html.Small("Categorías de Acción", 
+                                      style={'color': COLORS['text_muted'], 
+                                            'fontSize': '12px', 'display': 'block'}),
+                            html.H4(f"{len(recs_base['acciones']) + len(recomendaciones_adicionales)}", 
+                                   style={'color': COLORS['primary'], 'fontWeight': '700', 
+                                         'marginTop': '8px', 'marginBottom': '4px'}),
+                            html.Small("áreas de intervención", 
+                                      style={'color': COLORS['text_muted'], 'fontSize': '11px'})
+                        ], className="text-center")
+                    ], md=4),
                     dbc.Col([
                         html.Div([
-                            html.I(className="bi bi-heart-fill", 
-                                  style={'fontSize': '24px', 'color': COLORS['secondary']}),
-                            html.H6("Te Protejo", className="mt-2", 
-                                   style={'fontSize': '14px', 'fontWeight': '600'}),
-                            html.P("www.teprotejo.org", style={'fontSize': '13px', 
-                                                               'color': COLORS['neutral'], 
-                                                               'marginBottom': '4px'}),
-                            html.Small("Denuncias online", style={'fontSize': '11px', 
-                                                                  'color': COLORS['text_muted']})
-                        ], className="text-center p-3", 
-                           style={'backgroundColor': COLORS['bg'], 'borderRadius': '12px'})
-                    ], md=3, className="mb-3"),
-                    
-                    dbc.Col([
-                        html.Div([
-                            html.I(className="bi bi-people-fill", 
-                                  style={'fontSize': '24px', 'color': COLORS['info']}),
-                            html.H6("Comisaría", className="mt-2", 
-                                   style={'fontSize': '14px', 'fontWeight': '600'}),
-                            html.P("Local", style={'fontSize': '13px', 'color': COLORS['neutral'], 
-                                                  'marginBottom': '4px'}),
-                            html.Small("Familia y protección", style={'fontSize': '11px', 
-                                                                      'color': COLORS['text_muted']})
-                        ], className="text-center p-3", 
-                           style={'backgroundColor': COLORS['bg'], 'borderRadius': '12px'})
-                    ], md=3, className="mb-3")
-                ])
-            ], style={'padding': '28px'})
-        ], className="shadow-sm mt-4", style={'borderRadius': '16px'}),
-        
-        # Botón de descarga
-        html.Div([
-            dbc.Button(
-                [
-                    html.I(className="bi bi-file-pdf me-2"),
-                    "Descargar Recomendaciones en PDF"
-                ],
-                id="btn-download-recomendaciones",
-                color="success",
-                size="lg",
-                className="w-100",
-                outline=True,
-                style={'fontWeight': '600', 'padding': '14px'}
-            )
-        ], className="mt-4")
-    ])
-    
-    return content
+                            html.Small("Acciones Sugeridas", 
+                                      style={'color': COLORS['text_muted'], 
+                                            'fontSize': '12px', 'display': 'block'}),
+                            html.H4(f"{sum(len(cat['items']) for cat in recs_base['acciones'])}", 
+                                   style={'color': COLORS['secondary'], 'fontWeight': '700', 
+                                         'marginTop': '8px', 'marginBottom': '4px'}),
+                            html.Small("recomendaciones", 
+                                      style={'color': COLORS['text_muted'], 'fontSize': '11px'})
+                        ], className="text-center")
+                    ], md=4)
+                ], className="mb-3")
+            ])
+        ], style={'padding': '32px'})
+    ], className="shadow-sm mb-4", style={'borderRadius': '16px'})
 
 
 def create_categoria_card(categoria):
@@ -506,4 +525,95 @@ def create_recomendacion_adicional_card(rec):
                 for item in rec['items']
             ], style={'paddingLeft': '20px', 'marginBottom': '0'})
         ], style={'padding': '24px'})
-    ], className="shadow-sm mb-3", style={'borderRadius': '16px'})
\ No newline at end of file
+    ], className="shadow-sm mb-3", style={'borderRadius': '16px'})
+
+
+def create_recursos_card():
+    """Card de recursos y líneas de contacto"""
+    return dbc.Card([
+        dbc.CardBody([
+            html.H5([
+                html.I(className="bi bi-telephone-fill me-2", 
+                      style={'color': COLORS['primary']}),
+                "Recursos y Líneas de Contacto"
+            ], style={'color': COLORS['text'], 'fontWeight': '600', 
+                     'marginBottom': '20px'}),
+
+            dbc.Row([
+                dbc.Col([
+                    html.Div([
+                        html.I(className="bi bi-shield-fill-check", 
+                              style={'fontSize': '24px', 'color': COLORS['primary']}),
+                        html.H6("ICBF", className="mt-2", 
+                               style={'fontSize': '14px', 'fontWeight': '600'}),
+                        html.P("Línea 141", style={'fontSize': '13px', 'color': COLORS['neutral'], 
+                                                   'marginBottom': '4px'}),
+                        html.Small("Atención 24/7", style={'fontSize': '11px', 
+                                                           'color': COLORS['text_muted']})
+                    ], className="text-center p-3", 
+                       style={'backgroundColor': COLORS['bg'], 'borderRadius': '12px'})
+                ], md=3, className="mb-3"),
+
+                dbc.Col([
+                    html.Div([
+                        html.I(className="bi bi-hospital", 
+                              style={'fontSize': '24px', 'color': COLORS['danger']}),
+                        html.H6("Emergencias", className="mt-2", 
+                               style={'fontSize': '14px', 'fontWeight': '600'}),
+                        html.P("Línea 123", style={'fontSize': '13px', 'color': COLORS['neutral'], 
+                                                   'marginBottom': '4px'}),
+                        html.Small("Nacional", style={'fontSize': '11px', 
+                                                     'color': COLORS['text_muted']})
+                    ], className="text-center p-3", 
+                       style={'backgroundColor': COLORS['bg'], 'borderRadius': '12px'})
+                ], md=3, className="mb-3"),
+
+                dbc.Col([
+                    html.Div([
+                        html.I(className="bi bi-heart-fill", 
+                              style={'fontSize': '24px', 'color': COLORS['secondary']}),
+                        html.H6("Te Protejo", className="mt-2", 
+                               style={'fontSize': '14px', 'fontWeight': '600'}),
+                        html.P("www.teprotejo.org", style={'fontSize': '13px', 
+                                                           'color': COLORS['neutral'], 
+                                                           'marginBottom': '4px'}),
+                        html.Small("Denuncias online", style={'fontSize': '11px', 
+                                                              'color': COLORS['text_muted']})
+                    ], className="text-center p-3", 
+                       style={'backgroundColor': COLORS['bg'], 'borderRadius': '12px'})
+                ], md=3, className="mb-3"),
+
+                dbc.Col([
+                    html.Div([
+                        html.I(className="bi bi-people-fill", 
+                              style={'fontSize': '24px', 'color': COLORS['info']}),
+                        html.H6("Comisaría", className="mt-2", 
+                               style={'fontSize': '14px', 'fontWeight': '600'}),
+                        html.P("Local", style={'fontSize': '13px', 'color': COLORS['neutral'], 
+                                              'marginBottom': '4px'}),
+                        html.Small("Familia y protección", style={'fontSize': '11px', 
+                                                                  'color': COLORS['text_muted']})
+                    ], className="text-center p-3", 
+                       style={'backgroundColor': COLORS['bg'], 'borderRadius': '12px'})
+                ], md=3, className="mb-3")
+            ])
+        ], style={'padding': '28px'})
+    ], className="shadow-sm mt-4", style={'borderRadius': '16px'})
+
+
+def create_descarga_recomendaciones():
+    """Botón de descarga del PDF de recomendaciones"""
+    return html.Div([
+        dbc.Button(
+            [
+                html.I(className="bi bi-file-pdf me-2"),
+                "Descargar Recomendaciones en PDF"
+            ],
+            id="btn-download-recomendaciones",
+            color="success",
+            size="lg",
+            className="w-100",
+            outline=True,
+            style={'fontWeight': '600', 'padding': '14px'}
+        )
+    ], className="mt-4")
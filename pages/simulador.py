@@ -28,11 +28,30 @@ def create_simulador_module():
                             # IPM
                             html.Div([html.Label([html.I(className="bi bi-graph-down me-2", style={'color': COLORS['info'], 'fontSize': '18px'}), html.Span("Índice de Pobreza (IPM)", style={'fontWeight': '500', 'fontSize': '14px'})], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '8px'}), html.Div([html.Span(id="sim-ipm-value", style={'fontSize': '20px', 'fontWeight': '600', 'color': COLORS['primary']}), html.Span("% de cambio", style={'fontSize': '13px', 'color': COLORS['text_muted'], 'marginLeft': '8px'})], style={'marginBottom': '12px'}), dcc.Slider(id="sim-ipm", min=-30, max=30, step=5, value=0, marks={-30: '-30%', -15: '-15%', 0: '0%', 15: '+15%', 30: '+30%'})], className="mb-4", style={'padding': '16px', 'backgroundColor': COLORS_ALPHA['primary_10'], 'borderRadius': '12px'})
                         ]),
+                        # Clave de la línea base ya validada: dispara el cálculo de la superficie
+                        dcc.Store(id="sim-superficie-base"),
+                        # Estimación en vivo (interpolada en el navegador desde la superficie de respuesta)
+                        dcc.Store(id="sim-superficie-store"),
+                        html.Div([html.Small("Estimación en vivo", style={'color': COLORS['text_muted'], 'fontSize': '12px', 'display': 'block'}), html.Span(id="sim-live-valor", children="—", style={'fontSize': '22px', 'fontWeight': '700', 'color': COLORS['text']}), html.Span(id="sim-live-cambio", style={'fontSize': '13px', 'color': COLORS['neutral'], 'marginLeft': '8px'})], className="text-center", style={'padding': '12px', 'border': f"1px dashed {COLORS['border']}", 'borderRadius': '12px'}),
+                        dbc.Switch(id="sim-incertidumbre", label="Modo incertidumbre (Monte Carlo)", value=False, className="mt-3", style={'fontSize': '14px'}),
                         html.Hr(style={'margin': '24px 0', 'borderColor': COLORS['border']}),
-                        dbc.Row([dbc.Col([dbc.Button([html.I(className="bi bi-arrow-clockwise me-2"), "Restablecer"], id="btn-reset-simulador", color="light", className="w-100", outline=True, style={'fontWeight': '500', 'padding': '12px'})], md=6), dbc.Col([dbc.Button([html.I(className="bi bi-play-circle-fill me-2"), "Simular"], id="btn-simular", color="primary", className="w-100", style={'fontWeight': '600', 'padding': '12px'})], md=6)])
+                        dbc.Row([dbc.Col([dbc.Button([html.I(className="bi bi-arrow-clockwise me-2"), "Restablecer"], id="btn-reset-simulador", color="light", className="w-100", outline=True, style={'fontWeight': '500', 'padding': '12px'})], md=6), dbc.Col([dbc.Button([html.I(className="bi bi-play-circle-fill me-2"), "Simular"], id="btn-simular", color="primary", className="w-100", style={'fontWeight': '600', 'padding': '12px'})], md=6)]),
+                        # Avance del trabajo en segundo plano (visible solo mientras corre)
+                        html.Div([dbc.Progress(id="sim-progress", value=0, striped=True, animated=True, className="mb-2", style={'height': '18px'}), dbc.Button([html.I(className="bi bi-x-circle me-2"), "Cancelar"], id="btn-cancelar-simulacion", color="danger", outline=True, size="sm", className="w-100")], id="sim-progress-container", className="mt-3", style={'display': 'none'})
                     ], style={'padding': '28px'})
                 ], className="shadow-sm", style={'borderRadius': '16px'})
             ], md=4),
-            dbc.Col([html.Div(id="simulador-results")], md=8)
+            dbc.Col([
+                html.Div(id="simulador-results"),
+                dbc.Card([
+                    dbc.CardBody([
+                        dbc.Row([
+                            dbc.Col([html.H5([html.I(className="bi bi-distribute-horizontal me-2", style={'color': COLORS['primary']}), "Sensibilidad por Variable"], style={'color': COLORS['text'], 'fontWeight': '600', 'marginBottom': '4px'}), html.Small("Cada variable recorre su rango manteniendo las demás en la línea base", style={'color': COLORS['text_muted'], 'fontSize': '13px'})], md=8),
+                            dbc.Col([dbc.Button([html.I(className="bi bi-bar-chart-steps me-2"), "Analizar Sensibilidad"], id="btn-sensibilidad", color="primary", outline=True, className="w-100", style={'fontWeight': '500'})], md=4, className="d-flex align-items-center")
+                        ], className="mb-3"),
+                        html.Div(id="sensibilidad-container")
+                    ], style={'padding': '28px'})
+                ], className="shadow-sm mt-4", style={'borderRadius': '16px'})
+            ], md=8)
         ])
     ], fluid=True, style={'maxWidth': '1600px'})
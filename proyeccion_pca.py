@@ -0,0 +1,92 @@
+import argparse
+import os
+from functools import lru_cache
+import numpy as np
+from config import PCA_PROYECCION_PATH
+
+# ============================================================
+# PROYECCIÓN PCA DEL ESPACIO DE CLUSTERS (KMEANS)
+# ============================================================
+# La proyección se precalcula fuera de línea y se guarda como arreglos
+# binarios compactos (.npz, float32/uint8). El dashboard solo la carga y
+# proyecta el punto del usuario con la misma transformación:
+#
+#   z = ((x - escala_media) / escala_desv - pca_media) @ componentes.T
+#
+# Regenerar con los datos de entrenamiento del KMeans:
+#   python proyeccion_pca.py --datos entrenamiento.csv
+# Sin --datos, el PCA se ajusta sobre los centroides (sin nube de municipios).
+
+
+def construir_proyeccion(scaler, kmeans, datos=None, n_componentes=2):
+    """Ajusta PCA (SVD) sobre los datos escalados y proyecta datos y centroides"""
+    centroides = np.asarray(kmeans.cluster_centers_, dtype=float)
+
+    if datos is not None:
+        columnas = getattr(scaler, 'feature_names_in_', None)
+        if columnas is not None and hasattr(datos, 'columns'):
+            datos = datos[list(columnas)]
+        escalados = scaler.transform(datos)
+        etiquetas = kmeans.predict(escalados)
+        base = escalados
+    else:
+        escalados = np.empty((0, centroides.shape[1]))
+        etiquetas = np.empty(0, dtype=int)
+        base = centroides
+
+    pca_media = base.mean(axis=0)
+    _, valores_singulares, vt = np.linalg.svd(base - pca_media, full_matrices=False)
+    componentes = vt[:n_componentes]
+    varianza = valores_singulares ** 2
+    varianza_explicada = varianza[:n_componentes] / varianza.sum()
+
+    return {
+        'escala_media': np.asarray(scaler.mean_, dtype=np.float64),
+        'escala_desv': np.asarray(scaler.scale_, dtype=np.float64),
+        'pca_media': pca_media,
+        'componentes': componentes,
+        'varianza_explicada': varianza_explicada,
+        'centroides': ((centroides - pca_media) @ componentes.T).astype(np.float32),
+        'puntos': ((escalados - pca_media) @ componentes.T).astype(np.float32),
+        'etiquetas': etiquetas.astype(np.uint8)
+    }
+
+
+def guardar_proyeccion(proyeccion, path=PCA_PROYECCION_PATH):
+    np.savez_compressed(path, **proyeccion)
+
+
+@lru_cache(maxsize=1)
+def cargar_proyeccion(path=PCA_PROYECCION_PATH):
+    """Carga la proyección precalculada (una vez por proceso); None si no existe"""
+    if not os.path.exists(path):
+        print(f"[WARN] Proyección PCA no encontrada en {path}")
+        return None
+    with np.load(path) as archivo:
+        return {clave: archivo[clave] for clave in archivo.files}
+
+
+def proyectar(proyeccion, valores):
+    """Proyecta vectores en el orden del scaler al plano PCA"""
+    x = np.atleast_2d(np.asarray(valores, dtype=float))
+    escalados = (x - proyeccion['escala_media']) / proyeccion['escala_desv']
+    return (escalados - proyeccion['pca_media']) @ proyeccion['componentes'].T
+
+
+if __name__ == '__main__':
+    import joblib
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Precalcula la proyección PCA del KMeans")
+    parser.add_argument('--datos', help="CSV con las 6 variables de entrenamiento del KMeans")
+    parser.add_argument('--scaler', default='scaler.pkl')
+    parser.add_argument('--kmeans', default='kmeans_model.pkl')
+    parser.add_argument('--salida', default=PCA_PROYECCION_PATH)
+    args = parser.parse_args()
+
+    datos = pd.read_csv(args.datos) if args.datos else None
+    proyeccion = construir_proyeccion(joblib.load(args.scaler), joblib.load(args.kmeans), datos)
+    guardar_proyeccion(proyeccion, args.salida)
+    print(f"✅ Proyección guardada en {args.salida}: {len(proyeccion['puntos'])} municipios, "
+          f"{len(proyeccion['centroides'])} centroides, "
+          f"varianza explicada {proyeccion['varianza_explicada'].sum():.1%}")
@@ -0,0 +1,364 @@
+import hashlib
+import html
+import io
+import json
+import os
+from datetime import datetime
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import Flowable, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from config import COLORS, REPORTES_DIR, RESULTADOS_TTL, RECOMENDACIONES_PDF_TRAMO, UMBRALES_RIESGO
+from utils import get_risk_level, get_vulnerability_level
+from simulacion import NOMBRES_VARIABLES
+from pages.recomendaciones import get_recomendaciones, seleccionar_recomendaciones
+from background import cache
+
+# ============================================================
+# GENERADOR DE INFORMES (HTML + PDF) CON SECCIONES CACHEADAS
+# ============================================================
+# Cada sección se describe con datos planos (título, párrafos, tabla,
+# barras, listas). Su HTML y su lista de flowables PDF se cachean en disco
+# por hash del contenido: al regenerar tras un cambio pequeño solo se
+# vuelven a renderizar las secciones que cambiaron.
+
+# Subir al cambiar el formato de las secciones (invalida la caché)
+VERSION_PLANTILLA = 1
+
+
+# ============================================================
+# CONTENIDO DE LAS SECCIONES
+# ============================================================
+def seccion_prediccion(prediccion):
+    entrada = prediccion.get('entrada') or {}
+    tasa = prediccion.get('prediccion', 0)
+    nivel, _ = get_risk_level(tasa)
+    return {
+        'clave': 'prediccion',
+        'titulo': 'Predicción de riesgo (CatBoost)',
+        'parrafos': [
+            f"La tasa proyectada es de {tasa:.2f} casos por cada 100,000 habitantes menores de edad.",
+            f"El municipio se clasifica en nivel de riesgo {nivel.lower()}."
+        ],
+        'tabla': [[campo.replace('_', ' ').capitalize(), _formato_valor(valor)] for campo, valor in entrada.items()]
+    }
+
+
+def seccion_cluster(cluster):
+    numero = cluster.get('cluster_asignado', 0)
+    nivel, _ = get_vulnerability_level(numero)
+    valores = cluster.get('valores') or []
+    features = cluster.get('features') or [f"Variable {i + 1}" for i in range(len(valores))]
+    return {
+        'clave': 'cluster',
+        'titulo': 'Clasificación de vulnerabilidad (KMeans)',
+        'parrafos': [f"El perfil municipal fue asignado al cluster {numero} (vulnerabilidad: {nivel})."],
+        'tabla': [[nombre, _formato_valor(valor)] for nombre, valor in zip(features, valores)]
+    }
+
+
+def seccion_simulacion(simulacion):
+    base, simulado = simulacion['base'], simulacion['simulado']
+    cambios = {v: c for v, c in simulacion['cambios'].items() if c}
+    seccion = {
+        'clave': 'simulacion',
+        'titulo': 'Simulación de escenarios',
+        'parrafos': [
+            "Cambios aplicados: " + (", ".join(f"{NOMBRES_VARIABLES[v]} {c:+d}%" for v, c in cambios.items()) or "ninguno") + ".",
+            f"Tasa base {base:.1f} → simulada {simulado:.1f} ({simulado - base:+.1f})."
+        ],
+        'barras': {
+            'etiquetas': [NOMBRES_VARIABLES[v] for v in simulacion['por_variable']],
+            'valores': [p - base for p in simulacion['por_variable'].values()]
+        }
+    }
+    incertidumbre = simulacion.get('incertidumbre')
+    if incertidumbre:
+        # Las claves llegan como texto tras pasar por el store (JSON)
+        p = {str(k): v for k, v in incertidumbre['percentiles'].items()}
+        seccion['parrafos'].append(
+            f"Incertidumbre ({incertidumbre['n']:,} muestras): mediana {p['50']:.1f}, "
+            f"banda P5–P95 {p['5']:.1f}–{p['95']:.1f}; "
+            + ", ".join(f"P(riesgo {n.lower()}) {v:.0%}" for n, v in incertidumbre['prob_niveles'].items()) + "."
+        )
+        if incertidumbre.get('prob_superar'):
+            seccion['parrafos'].append(
+                "Probabilidad de superar los umbrales de riesgo: "
+                + ", ".join(f"P(tasa ≥ {UMBRALES_RIESGO[u]:g}) {v:.0%}" for u, v in incertidumbre['prob_superar'].items()) + "."
+            )
+    return seccion
+
+
+def _listas_recomendaciones(recs_base, adicionales):
+    return ([{'titulo': cat['categoria'], 'items': cat['items']} for cat in recs_base['acciones']]
+            + [{'titulo': rec['titulo'], 'items': rec['items']} for rec in adicionales])
+
+
+def seccion_recomendaciones(prediccion):
+    entrada = prediccion.get('entrada') or {}
+    nivel, _ = get_risk_level(prediccion.get('prediccion', 0))
+    recs_base, adicionales = get_recomendaciones(nivel, entrada.get('ipm'), entrada.get('tasa_homicidio'))
+    return {
+        'clave': 'recomendaciones',
+        'titulo': f"Recomendaciones: {recs_base['titulo']}",
+        'parrafos': [recs_base['descripcion']],
+        'listas': _listas_recomendaciones(recs_base, adicionales)
+    }
+
+
+def construir_secciones(sesion):
+    """Secciones disponibles según lo que se haya calculado en la sesión"""
+    secciones = []
+    if sesion.get('prediccion'):
+        secciones.append(seccion_prediccion(sesion['prediccion']))
+    if sesion.get('cluster'):
+        secciones.append(seccion_cluster(sesion['cluster']))
+    if sesion.get('simulacion'):
+        secciones.append(seccion_simulacion(sesion['simulacion']))
+    if sesion.get('prediccion'):
+        secciones.append(seccion_recomendaciones(sesion['prediccion']))
+    return secciones
+
+
+def _formato_valor(valor):
+    if isinstance(valor, float):
+        return f"{valor:,.2f}"
+    if isinstance(valor, int):
+        return f"{valor:,}"
+    return str(valor)
+
+
+def hash_seccion(seccion):
+    contenido = json.dumps(seccion, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{VERSION_PLANTILLA}:{contenido}".encode('utf-8')).hexdigest()
+
+
+# ============================================================
+# RENDER HTML
+# ============================================================
+ESTILO_HTML = f"""
+body {{ font-family: Inter, Arial, sans-serif; color: {COLORS['text']}; max-width: 900px; margin: 32px auto; padding: 0 24px; }}
+h1 {{ margin-bottom: 4px; }} h2 {{ border-bottom: 2px solid {COLORS['border']}; padding-bottom: 6px; margin-top: 32px; }}
+.meta {{ color: {COLORS['neutral']}; font-size: 14px; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 14px; }}
+td {{ border-bottom: 1px solid {COLORS['border']}; padding: 6px 8px; }}
+.barra {{ display: flex; align-items: center; font-size: 13px; margin: 4px 0; }}
+.barra span {{ width: 200px; }} .barra div {{ height: 14px; border-radius: 3px; margin-right: 8px; }}
+"""
+
+
+def render_seccion_html(seccion):
+    partes = [f"<section><h2>{html.escape(seccion['titulo'])}</h2>"]
+    partes += [f"<p>{html.escape(p)}</p>" for p in seccion.get('parrafos', [])]
+    if seccion.get('tabla'):
+        filas = "".join(f"<tr><td>{html.escape(str(a))}</td><td>{html.escape(str(b))}</td></tr>" for a, b in seccion['tabla'])
+        partes.append(f"<table>{filas}</table>")
+    barras = seccion.get('barras')
+    if barras and barras['valores']:
+        escala = max(abs(v) for v in barras['valores']) or 1
+        for etiqueta, valor in zip(barras['etiquetas'], barras['valores']):
+            color = COLORS['danger'] if valor > 0 else COLORS['secondary']
+            partes.append(
+                f"<div class='barra'><span>{html.escape(etiqueta)}</span>"
+                f"<div style='width:{abs(valor) / escala * 300:.0f}px;background:{color}'></div>{valor:+.1f}</div>"
+            )
+    for lista in seccion.get('listas', []):
+        items = "".join(f"<li>{html.escape(i)}</li>" for i in lista['items'])
+        partes.append(f"<h3>{html.escape(lista['titulo'])}</h3><ul>{items}</ul>")
+    partes.append("</section>")
+    return "\n".join(partes)
+
+
+# ============================================================
+# RENDER PDF
+# ============================================================
+_estilos = getSampleStyleSheet()
+ESTILOS_PDF = {
+    'titulo': ParagraphStyle('InformeTitulo', parent=_estilos['Title'], textColor=colors.HexColor(COLORS['text'])),
+    'meta': ParagraphStyle('InformeMeta', parent=_estilos['Normal'], textColor=colors.HexColor(COLORS['neutral'])),
+    'seccion': ParagraphStyle('InformeSeccion', parent=_estilos['Heading2'], textColor=colors.HexColor(COLORS['primary'])),
+    'subtitulo': ParagraphStyle('InformeSubtitulo', parent=_estilos['Heading4']),
+    'parrafo': ParagraphStyle('InformeParrafo', parent=_estilos['Normal'], leading=15, spaceAfter=6),
+    'item': ParagraphStyle('InformeItem', parent=_estilos['Normal'], leftIndent=12, bulletIndent=2, leading=14)
+}
+
+
+class GraficoBarras(Flowable):
+    """Barras horizontales centradas en cero (solo datos: se puede cachear con pickle)"""
+
+    def __init__(self, etiquetas, valores, ancho=16 * cm, alto_barra=14):
+        super().__init__()
+        self.etiquetas, self.valores = list(etiquetas), list(valores)
+        self.ancho, self.alto_barra = ancho, alto_barra
+
+    def wrap(self, disponible_ancho, disponible_alto):
+        return self.ancho, len(self.valores) * (self.alto_barra + 6) + 6
+
+    def draw(self):
+        lienzo = self.canv
+        margen = 5 * cm
+        centro = margen + (self.ancho - margen) / 2
+        escala = (self.ancho - margen) / 2 / (max(abs(v) for v in self.valores) or 1)
+        y = len(self.valores) * (self.alto_barra + 6)
+        for etiqueta, valor in zip(self.etiquetas, self.valores):
+            y -= self.alto_barra + 6
+            lienzo.setFillColor(colors.HexColor(COLORS['text']))
+            lienzo.setFont('Helvetica', 9)
+            lienzo.drawString(0, y + 3, etiqueta)
+            lienzo.setFillColor(colors.HexColor(COLORS['danger'] if valor > 0 else COLORS['secondary']))
+            ancho = valor * escala
+            lienzo.rect(min(centro, centro + ancho), y, abs(ancho), self.alto_barra, stroke=0, fill=1)
+            lienzo.setFillColor(colors.HexColor(COLORS['text']))
+            lienzo.drawString(centro + ancho + (4 if valor >= 0 else -30), y + 3, f"{valor:+.1f}")
+        lienzo.setStrokeColor(colors.HexColor(COLORS['neutral']))
+        lienzo.line(centro, 0, centro, len(self.valores) * (self.alto_barra + 6))
+
+
+def render_seccion_pdf(seccion):
+    """Flowables de una sección (los Paragraph ya quedan parseados)"""
+    story = [Paragraph(html.escape(seccion['titulo']), ESTILOS_PDF['seccion'])]
+    story += [Paragraph(html.escape(p), ESTILOS_PDF['parrafo']) for p in seccion.get('parrafos', [])]
+    if seccion.get('tabla'):
+        tabla = Table([[str(a), str(b)] for a, b in seccion['tabla']], colWidths=[8 * cm, 8 * cm])
+        tabla.setStyle(TableStyle([
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('LINEBELOW', (0, 0), (-1, -1), 0.5, colors.HexColor(COLORS['border'])),
+            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor(COLORS['neutral']))
+        ]))
+        story += [Spacer(1, 6), tabla]
+    barras = seccion.get('barras')
+    if barras and barras['valores']:
+        story += [Spacer(1, 8), GraficoBarras(barras['etiquetas'], barras['valores'])]
+    for lista in seccion.get('listas', []):
+        story.append(Paragraph(html.escape(lista['titulo']), ESTILOS_PDF['subtitulo']))
+        story += [Paragraph(html.escape(item), ESTILOS_PDF['item'], bulletText='•') for item in lista['items']]
+    story.append(Spacer(1, 12))
+    return story
+
+
+# ============================================================
+# CACHÉ POR HASH DE CONTENIDO
+# ============================================================
+RENDERIZADORES = {'html': render_seccion_html, 'pdf': render_seccion_pdf}
+
+
+def render_cacheado(formato, seccion):
+    """(render, reutilizado) de una sección; la caché en disco devuelve una copia nueva"""
+    clave = ('reporte-seccion', formato, hash_seccion(seccion))
+    render = cache.get(clave)
+    if render is not None:
+        return render, True
+    render = RENDERIZADORES[formato](seccion)
+    cache.set(clave, render, expire=RESULTADOS_TTL, tag='reportes')
+    return render, False
+
+
+# ============================================================
+# DOCUMENTOS
+# ============================================================
+def documento_html(metadatos, fragmentos, hoja_estilo=None):
+    """Documento completo; con `hoja_estilo` enlaza un CSS compartido en vez de incrustarlo"""
+    estilo = (f"<link rel='stylesheet' href='{html.escape(hoja_estilo)}'>" if hoja_estilo
+              else f"<style>{ESTILO_HTML}</style>")
+    encabezado = (
+        f"<h1>{html.escape(metadatos['titulo'])}</h1>"
+        f"<p class='meta'>Municipio: {html.escape(metadatos.get('municipio') or '—')} · "
+        f"Responsable: {html.escape(metadatos.get('responsable') or '—')} · "
+        f"Fecha: {html.escape(metadatos['fecha'])}</p>"
+    )
+    return (
+        "<!DOCTYPE html><html lang='es'><head><meta charset='utf-8'>"
+        f"<title>{html.escape(metadatos['titulo'])}</title>{estilo}</head>"
+        f"<body>{encabezado}{''.join(fragmentos)}</body></html>"
+    )
+
+
+def documento_pdf(path, metadatos, historias):
+    doc = SimpleDocTemplate(path, pagesize=A4, title=metadatos['titulo'],
+                            leftMargin=2 * cm, rightMargin=2 * cm, topMargin=2 * cm, bottomMargin=2 * cm)
+    story = [
+        Paragraph(html.escape(metadatos['titulo']), ESTILOS_PDF['titulo']),
+        Paragraph(html.escape(
+            f"Municipio: {metadatos.get('municipio') or '—'} · Responsable: {metadatos.get('responsable') or '—'} · "
+            f"Fecha: {metadatos['fecha']}"
+        ), ESTILOS_PDF['meta']),
+        Spacer(1, 16)
+    ]
+    for historia in historias:
+        story += historia
+    doc.build(story)
+
+
+def generar_informe(sesion, metadatos, directorio=REPORTES_DIR, nombre_base=None, al_avanzar=None,
+                    hoja_estilo=None):
+    """
+    Genera el informe HTML y PDF de la sesión en `directorio`. Devuelve los
+    nombres de archivo y cuántas secciones se reutilizaron de la caché.
+    """
+    secciones = construir_secciones(sesion)
+    if not secciones:
+        return None
+
+    metadatos = dict(metadatos, fecha=metadatos.get('fecha') or datetime.now().strftime('%d/%m/%Y %H:%M'))
+    fragmentos, historias, reutilizadas = [], [], 0
+    for i, seccion in enumerate(secciones):
+        fragmento, html_cacheado = render_cacheado('html', seccion)
+        historia, pdf_cacheado = render_cacheado('pdf', seccion)
+        fragmentos.append(fragmento)
+        historias.append(historia)
+        reutilizadas += html_cacheado and pdf_cacheado
+        if al_avanzar:
+            al_avanzar((i + 1) / (len(secciones) + 1))
+
+    os.makedirs(directorio, exist_ok=True)
+    if nombre_base is None:
+        huella = hashlib.sha256("".join(hash_seccion(s) for s in secciones).encode()).hexdigest()[:8]
+        nombre_base = f"informe_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{huella}"
+
+    with open(os.path.join(directorio, f"{nombre_base}.html"), 'w', encoding='utf-8') as archivo:
+        archivo.write(documento_html(metadatos, fragmentos, hoja_estilo))
+    documento_pdf(os.path.join(directorio, f"{nombre_base}.pdf"), metadatos, historias)
+
+    return {
+        'html': f"{nombre_base}.html",
+        'pdf': f"{nombre_base}.pdf",
+        'secciones': [s['titulo'] for s in secciones],
+        'reutilizadas': reutilizadas
+    }
+
+
+# ============================================================
+# PDF DE RECOMENDACIONES (DESCARGA DIRECTA)
+# ============================================================
+def pdf_recomendaciones(clave, tasa):
+    """
+    (bytes, reutilizado) del PDF del conjunto de recomendaciones mostrado.
+    Se cachea en disco por clave (nivel, detalle, prioridad, adicionales) y
+    tramo de tasa, así descargas repetidas no vuelven a renderizar.
+    """
+    tramo = round(tasa / RECOMENDACIONES_PDF_TRAMO) * RECOMENDACIONES_PDF_TRAMO
+    llave = ('recomendaciones-pdf', VERSION_PLANTILLA, clave, tramo)
+    contenido = cache.get(llave)
+    if contenido is not None:
+        return contenido, True
+
+    recs_base, adicionales = seleccionar_recomendaciones(clave)
+    seccion = {
+        'clave': 'recomendaciones',
+        'titulo': recs_base['titulo'],
+        'parrafos': [
+            f"Nivel de riesgo: {clave[0]} · Tasa proyectada: {tramo:.1f} por 100,000 hab.",
+            recs_base['descripcion']
+        ],
+        'listas': _listas_recomendaciones(recs_base, adicionales)
+    }
+    historia, _ = render_cacheado('pdf', seccion)
+    buffer = io.BytesIO()
+    documento_pdf(buffer, {
+        'titulo': "Recomendaciones Estratégicas - Violencia Sexual NNA",
+        'fecha': datetime.now().strftime('%d/%m/%Y')
+    }, [historia])
+    contenido = buffer.getvalue()
+    cache.set(llave, contenido, expire=RESULTADOS_TTL, tag='reportes')
+    return contenido, False
@@ -0,0 +1,179 @@
+import glob
+import json
+import mimetypes
+import os
+import re
+from collections import deque
+from datetime import datetime
+import numpy as np
+from flask import Response, jsonify, request, send_file, send_from_directory, stream_with_context
+from flask_compress import Compress
+from werkzeug.security import safe_join
+from alertas_data import get_alertas_index
+from build_assets import FUENTES, MANIFEST, ICONOS_CSS
+from config import (
+    REPORTES_DIR, COMPRESION_MIN_BYTES, ASSETS_DIST_DIR, ASSETS_MAX_AGE, METRICAS_CARGA_MAX, ICONOS_CDN_URL
+)
+
+# ============================================================
+# RUTAS HTTP ADICIONALES DEL SERVIDOR FLASK
+# ============================================================
+
+# Variantes precomprimidas por build_assets.py, en orden de preferencia
+PRECOMPRIMIDOS = (('br', '.br'), ('gzip', '.gz'))
+
+# Assets con hash de contenido en el nombre (build_assets.py): styles.<hash>.css
+ASSET_CON_HASH = re.compile(r'\.[0-9a-f]{10}\.\w+$')
+
+# Métricas de carga (assets/metricas.js), en ms desde el inicio de la navegación
+METRICAS_CARGA = ('ttfb', 'fcp', 'primer_pintado', 'tti')
+metricas_carga = deque(maxlen=METRICAS_CARGA_MAX)
+
+TIPOS_COMPRIMIBLES = [
+    'text/html', 'text/css', 'text/csv', 'text/javascript', 'application/javascript',
+    'application/json', 'image/svg+xml'
+]
+
+
+def configurar_compresion(app):
+    """
+    Compresión br/gzip de las respuestas dinámicas (layout, callbacks, CSV).
+    Los assets que ya tienen variante precomprimida (build_assets.py) se
+    sirven directamente y no se vuelven a comprimir en cada petición.
+    """
+    server = app.server
+    server.config.update(
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_MIN_SIZE=COMPRESION_MIN_BYTES,
+        COMPRESS_MIMETYPES=TIPOS_COMPRIMIBLES
+    )
+    Compress(server)
+
+    prefijo = f"{app.config.routes_pathname_prefix}{app.config.assets_url_path.strip('/')}/"
+    carpeta = app.config.assets_folder
+
+    @server.before_request
+    def servir_asset_precomprimido():
+        if not request.path.startswith(prefijo):
+            return None
+        original = safe_join(carpeta, request.path[len(prefijo):])
+        if original is None or not os.path.isfile(original):
+            return None
+        for encoding, extension in PRECOMPRIMIDOS:
+            comprimido = original + extension
+            # Solo si el navegador lo acepta y no quedó desactualizado
+            if (request.accept_encodings[encoding] and os.path.isfile(comprimido)
+                    and os.path.getmtime(comprimido) >= os.path.getmtime(original)):
+                response = send_file(comprimido, mimetype=mimetypes.guess_type(original)[0],
+                                     conditional=True, etag=True)
+                response.headers['Content-Encoding'] = encoding
+                response.headers['Vary'] = 'Accept-Encoding'
+                return response
+        return None
+
+
+def carpeta_assets():
+    """
+    Carpeta de assets para Dash: la de build_assets.py si ya se construyó
+    (tiene manifest.json) y sigue al día, si no assets/ tal cual. Un build
+    más antiguo que assets/ o que el código escaneado al depurar el CSS no
+    se sirve: le faltarían scripts nuevos o reglas de clases nuevas.
+    """
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    manifest = os.path.join(raiz, ASSETS_DIST_DIR, MANIFEST)
+    if not os.path.isfile(manifest):
+        print("⚠️ [assets] Sin build de assets; ejecute python build_assets.py")
+        return 'assets'
+    fuentes = glob.glob(os.path.join(raiz, 'assets', '*'))
+    fuentes += [f for patron in FUENTES for f in glob.glob(os.path.join(raiz, patron))]
+    if any(os.path.getmtime(f) > os.path.getmtime(manifest) for f in fuentes):
+        print("⚠️ [assets] Build de assets desactualizado; se sirve assets/. Ejecute python build_assets.py")
+        return 'assets'
+    return ASSETS_DIST_DIR
+
+
+def iconos_externos(carpeta):
+    """
+    Hoja de estilo externa de Bootstrap Icons: solo si la carpeta servida no
+    trae el subconjunto local y se configuró ICONOS_CDN_URL (opcional)
+    """
+    manifest = os.path.join(os.path.dirname(os.path.abspath(__file__)), carpeta, MANIFEST)
+    if os.path.isfile(manifest):
+        with open(manifest, encoding='utf-8') as archivo:
+            if ICONOS_CSS in json.load(archivo):
+                return []
+    if ICONOS_CDN_URL:
+        print(f"⚠️ [iconos] Sin subconjunto local de Bootstrap Icons; se cargan de {ICONOS_CDN_URL}")
+        return [ICONOS_CDN_URL]
+    print("⚠️ [iconos] Sin subconjunto local de Bootstrap Icons: los iconos no se mostrarán. "
+          "Copie vendor/bootstrap-icons (python build_assets.py --descargar-iconos) y ejecute python build_assets.py")
+    return []
+
+
+def configurar_cache_assets(app):
+    """Los assets con hash en el nombre no cambian nunca: caché inmutable de un año"""
+    prefijo = f"{app.config.routes_pathname_prefix}{app.config.assets_url_path.strip('/')}/"
+
+    @app.server.after_request
+    def cache_inmutable(response):
+        if request.path.startswith(prefijo) and ASSET_CON_HASH.search(request.path) and response.status_code < 400:
+            response.headers['Cache-Control'] = f'public, max-age={ASSETS_MAX_AGE}, immutable'
+        return response
+
+
+def register_routes(app):
+    """
+    Registra rutas Flask que no encajan en un callback de Dash
+    (descargas transmitidas en bloques, etc.)
+    """
+    server = app.server
+    configurar_compresion(app)
+    configurar_cache_assets(app)
+    # Mismo prefijo que las rutas de Dash: los enlaces se arman con app.get_relative_path
+    prefijo = app.config.routes_pathname_prefix.rstrip('/')
+
+    @server.route(f'{prefijo}/exportar/alertas.csv')
+    def exportar_alertas():
+        """CSV de alertas con los mismos filtros y orden que la tabla"""
+        index = get_alertas_index()
+        ids = index.query(
+            request.args.get('departamento', 'all'),
+            request.args.get('nivel', 'all'),
+            request.args.get('orden', 'tasa_desc')
+        )
+        filename = f"alertas_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
+        return Response(
+            stream_with_context(index.iter_csv(ids)),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+
+    @server.route(f'{prefijo}/metricas/carga', methods=['POST'])
+    def registrar_metricas_carga():
+        """Tiempos de una carga inicial enviados con sendBeacon"""
+        try:
+            datos = json.loads(request.get_data(as_text=True))
+        except ValueError:
+            return '', 400
+        if not isinstance(datos, dict):
+            return '', 400
+        metricas_carga.append({
+            m: float(datos[m]) for m in METRICAS_CARGA if isinstance(datos.get(m), (int, float))
+        })
+        return '', 204
+
+    @server.route(f'{prefijo}/metricas/carga', methods=['GET'])
+    def resumen_metricas_carga():
+        """Percentiles 50/90 de cada métrica sobre las últimas cargas de este proceso"""
+        resumen = {'cargas': len(metricas_carga)}
+        for metrica in METRICAS_CARGA:
+            valores = [m[metrica] for m in metricas_carga if metrica in m]
+            if valores:
+                p50, p90 = np.percentile(valores, [50, 90])
+                resumen[metrica] = {'p50': round(float(p50)), 'p90': round(float(p90)), 'n': len(valores)}
+        return jsonify(resumen)
+
+    @server.route(f'{prefijo}/reportes/<path:nombre>')
+    def descargar_reporte(nombre):
+        """Informes generados por el módulo Informe (HTML o PDF)"""
+        return send_from_directory(os.path.abspath(REPORTES_DIR), nombre)
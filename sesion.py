@@ -0,0 +1,39 @@
+import uuid
+import diskcache
+from config import SESION_CACHE_DIR, SESION_TTL
+
+# ============================================================
+# ESTADO DE SESIÓN EN EL SERVIDOR
+# ============================================================
+# Los resultados (predicción, cluster, simulación, features del KMeans) se
+# guardan en una caché SQLite en disco compartida por todos los workers y
+# procesos en segundo plano. Los dcc.Store del navegador solo guardan la
+# clave, así cada callback que los lee como State recibe unos pocos bytes
+# aunque los resultados crezcan. Cada entrada vence tras SESION_TTL
+# segundos sin uso (cada lectura renueva el plazo); diskcache borra entradas
+# vencidas en cada escritura y limpiar_sesiones() fuerza una limpieza completa.
+
+# Sin política de desalojo por tamaño: solo vence por TTL
+sesiones = diskcache.Cache(SESION_CACHE_DIR, eviction_policy='none')
+
+
+def guardar_sesion(tipo, datos, ttl=SESION_TTL):
+    """Guarda `datos` en el servidor y devuelve la clave para el dcc.Store"""
+    clave = f"{tipo}:{uuid.uuid4().hex}"
+    sesiones.set(clave, datos, expire=ttl)
+    return clave
+
+
+def cargar_sesion(clave, ttl=SESION_TTL):
+    """Datos de una clave de sesión (None si no hay clave o ya venció)"""
+    if not isinstance(clave, str):
+        return None
+    datos = sesiones.get(clave)
+    if datos is not None:
+        sesiones.touch(clave, expire=ttl)
+    return datos
+
+
+def limpiar_sesiones():
+    """Elimina las entradas vencidas; devuelve cuántas se borraron"""
+    return sesiones.expire()
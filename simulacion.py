@@ -0,0 +1,274 @@
+import itertools
+import json
+import time
+import numpy as np
+from config import (
+    RANGOS_SENSIBILIDAD, SENSIBILIDAD_PUNTOS, SUPERFICIE_LOTE, UMBRALES_RIESGO,
+    RUIDO_RELATIVO, MONTE_CARLO_PRESUPUESTO, MONTE_CARLO_LOTE, MONTE_CARLO_MAX
+)
+from utils import predict_catboost_batch
+from background import memoizar
+from esquema import CAMPOS_NUMERICOS
+
+# ============================================================
+# SIMULADOR DE ESCENARIOS RESPALDADO POR EL MODELO
+# ============================================================
+# Cada escenario es el vector de entrada base (la 'entrada' de la predicción
+# guardada en la sesión del servidor) con algunas variables ajustadas.
+# Todos los escenarios de una interacción se puntúan con CatBoost en una
+# sola llamada por lotes.
+
+# Slider del simulador -> campos de la entrada CatBoost
+VARIABLES_SIMULACION = {
+    'pib': ['pib_per_capita'],
+    'homicidio': ['tasa_homicidio'],
+    'servicios': ['cobertura_acueducto', 'cobertura_alcantarillado', 'cobertura_energia'],
+    'ipm': ['ipm']
+}
+
+NOMBRES_VARIABLES = {
+    'pib': 'PIB per cápita',
+    'homicidio': 'Tasa de homicidio',
+    'servicios': 'Cobertura de servicios',
+    'ipm': 'IPM'
+}
+
+
+def ajustar_entrada(entrada, cambios):
+    """
+    Copia de la entrada con cada variable escalada por (1 + cambio%/100)
+    y recortada a su rango válido según el esquema (esquema.py).
+    """
+    ajustada = dict(entrada)
+    for variable, porcentaje in cambios.items():
+        if not porcentaje:
+            continue
+        for campo in VARIABLES_SIMULACION[variable]:
+            regla = CAMPOS_NUMERICOS[campo]
+            valor = float(entrada[campo]) * (1 + porcentaje / 100)
+            ajustada[campo] = min(max(valor, regla['min']), regla['max'])
+    return ajustada
+
+
+def construir_escenarios(entrada, cambios):
+    """
+    Escenario combinado (todos los cambios) + un escenario por cada variable
+    modificada, para separar el efecto individual de cada una.
+    """
+    escenarios = [('combinado', ajustar_entrada(entrada, cambios))]
+    for variable, porcentaje in cambios.items():
+        if porcentaje:
+            escenarios.append((variable, ajustar_entrada(entrada, {variable: porcentaje})))
+    return escenarios
+
+
+def simular_escenarios(entrada, cambios):
+    """
+    Puntúa todos los escenarios en un solo lote. Devuelve
+    {'simulado': float, 'por_variable': {variable: float}} o None si la API falla.
+    """
+    escenarios = construir_escenarios(entrada, cambios)
+    predicciones = predict_catboost_batch([registro for _, registro in escenarios])
+    if predicciones is None or len(predicciones) != len(escenarios):
+        return None
+
+    resultados = dict(zip((nombre for nombre, _ in escenarios), predicciones))
+    return {
+        'simulado': resultados.pop('combinado'),
+        'por_variable': resultados
+    }
+
+
+# ============================================================
+# ANÁLISIS DE SENSIBILIDAD (TORNADO)
+# ============================================================
+NOMBRES_CAMPOS = {
+    'poblacion_menores': 'Población menores',
+    'porc_poblacion_urbana': '% Población urbana',
+    'ipm': 'IPM',
+    'cobertura_acueducto': 'Cobertura acueducto',
+    'cobertura_alcantarillado': 'Cobertura alcantarillado',
+    'cobertura_energia': 'Cobertura energía',
+    'pib_per_capita': 'PIB per cápita',
+    'tasa_homicidio': 'Tasa de homicidio'
+}
+
+
+def _filas_sensibilidad(entrada, puntos):
+    """
+    Fila base + `puntos` filas por variable, variando una variable a la vez
+    sobre su rango (RANGOS_SENSIBILIDAD) y dejando el resto en la línea base.
+    """
+    filas = [dict(entrada)]
+    grillas = {}
+    for campo, (minimo, maximo) in RANGOS_SENSIBILIDAD.items():
+        grillas[campo] = np.linspace(minimo, maximo, puntos)
+        for valor in grillas[campo]:
+            fila = dict(entrada)
+            fila[campo] = float(valor)
+            # La población rural es el complemento de la urbana
+            if campo == 'porc_poblacion_urbana':
+                fila['porc_poblacion_rural'] = 100 - float(valor)
+            filas.append(fila)
+    return filas, grillas
+
+
+@memoizar('simulacion.sensibilidad')
+def _sensibilidad_cacheada(clave, puntos):
+    entrada = json.loads(clave)
+    filas, grillas = _filas_sensibilidad(entrada, puntos)
+    predicciones = predict_catboost_batch(filas)
+    if predicciones is None or len(predicciones) != len(filas):
+        # Sin cachear: se reintenta en la próxima llamada
+        raise ConnectionError("Predicción por lotes no disponible")
+
+    base = predicciones[0]
+    matriz = np.asarray(predicciones[1:], dtype=float).reshape(len(grillas), puntos)
+    variables = []
+    for (campo, grilla), preds in zip(grillas.items(), matriz):
+        variables.append({
+            'campo': campo,
+            'nombre': NOMBRES_CAMPOS[campo],
+            'valor_base': float(entrada[campo]),
+            'minimo': float(preds.min()), 'valor_minimo': float(grilla[preds.argmin()]),
+            'maximo': float(preds.max()), 'valor_maximo': float(grilla[preds.argmax()])
+        })
+    variables.sort(key=lambda v: v['maximo'] - v['minimo'], reverse=True)
+    return {'base': base, 'variables': variables}
+
+
+def analisis_sensibilidad(entrada, puntos=SENSIBILIDAD_PUNTOS):
+    """
+    Sensibilidad una-variable-a-la-vez de la predicción base, puntuada en un
+    solo lote y memoizada por línea base. Variables ordenadas por amplitud.
+    None si la API no responde.
+    """
+    clave = json.dumps(entrada, sort_keys=True)
+    try:
+        return _sensibilidad_cacheada(clave, puntos)
+    except ConnectionError:
+        return None
+
+
+# ============================================================
+# SUPERFICIE DE RESPUESTA (SIMULACIÓN EN VIVO)
+# ============================================================
+# Grilla gruesa sobre las marcas de los sliders (5 x 5 x 5 x 5 = 625
+# escenarios). Se calcula una vez por línea base y viaja al navegador, que
+# interpola (multilineal) mientras se arrastran los sliders, sin peticiones.
+EJES_SUPERFICIE = {
+    'pib': [-50, -25, 0, 25, 50],
+    'homicidio': [-50, -25, 0, 25, 50],
+    'servicios': [-20, -10, 0, 10, 20],
+    'ipm': [-30, -15, 0, 15, 30]
+}
+
+
+@memoizar('simulacion.superficie')
+def _superficie_cacheada(clave):
+    entrada = json.loads(clave)
+    variables = list(EJES_SUPERFICIE)
+    filas = [
+        ajustar_entrada(entrada, dict(zip(variables, combinacion)))
+        for combinacion in itertools.product(*EJES_SUPERFICIE.values())
+    ]
+
+    valores = []
+    for inicio in range(0, len(filas), SUPERFICIE_LOTE):
+        lote = predict_catboost_batch(filas[inicio:inicio + SUPERFICIE_LOTE])
+        if lote is None:
+            raise ConnectionError("Predicción por lotes no disponible")
+        valores.extend(lote)
+
+    # El escenario sin cambios está en el centro de la grilla
+    centro = np.ravel_multi_index(
+        [eje.index(0) for eje in EJES_SUPERFICIE.values()],
+        [len(eje) for eje in EJES_SUPERFICIE.values()]
+    )
+    return {
+        'variables': variables,
+        'ejes': [EJES_SUPERFICIE[v] for v in variables],
+        'valores': [round(v, 4) for v in valores],
+        'base': valores[int(centro)]
+    }
+
+
+def superficie_respuesta(entrada):
+    """
+    Predicciones sobre la grilla EJES_SUPERFICIE (orden C: pib, homicidio,
+    servicios, ipm) para la línea base, por lotes de SUPERFICIE_LOTE filas y
+    memoizadas por línea base. None si la API no responde.
+    """
+    clave = json.dumps(entrada, sort_keys=True)
+    try:
+        return _superficie_cacheada(clave)
+    except ConnectionError:
+        return None
+
+
+# ============================================================
+# MODO INCERTIDUMBRE (MONTE CARLO)
+# ============================================================
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def muestrear_entradas(entrada, n, rng):
+    """
+    n copias de la entrada con ruido gaussiano relativo (RUIDO_RELATIVO) en
+    las variables estimadas, generadas como una matriz y recortadas al rango del esquema.
+    """
+    campos = list(RUIDO_RELATIVO)
+    base = np.array([float(entrada[c]) for c in campos])
+    sigma = np.array([RUIDO_RELATIVO[c] for c in campos])
+    matriz = base * (1 + rng.standard_normal((n, len(campos))) * sigma)
+
+    minimos = np.array([CAMPOS_NUMERICOS[c]['min'] for c in campos])
+    maximos = np.array([CAMPOS_NUMERICOS[c]['max'] for c in campos])
+    matriz = np.clip(matriz, minimos, maximos)
+
+    return [dict(entrada, **dict(zip(campos, fila))) for fila in matriz.tolist()]
+
+
+def monte_carlo(entrada, presupuesto=MONTE_CARLO_PRESUPUESTO, lote=MONTE_CARLO_LOTE,
+                maximo=MONTE_CARLO_MAX, rng=None, al_avanzar=None):
+    """
+    Puntúa lotes de entradas perturbadas mientras quepa otro lote en el
+    presupuesto de latencia (siempre al menos uno). Devuelve percentiles,
+    probabilidad de cada nivel de riesgo y de superar cada umbral, o None.
+    `al_avanzar(fraccion)` recibe el avance estimado tras cada lote.
+    """
+    rng = rng or np.random.default_rng()
+    predicciones = []
+    inicio = time.perf_counter()
+    duracion_lote = 0.0
+
+    while len(predicciones) < maximo:
+        transcurrido = time.perf_counter() - inicio
+        if predicciones and transcurrido + duracion_lote > presupuesto:
+            break
+        t0 = time.perf_counter()
+        n = min(lote, maximo - len(predicciones))
+        resultado = predict_catboost_batch(muestrear_entradas(entrada, n, rng))
+        if resultado is None:
+            if not predicciones:
+                return None
+            break
+        predicciones.extend(resultado)
+        duracion_lote = time.perf_counter() - t0
+        if al_avanzar:
+            al_avanzar(max(len(predicciones) / maximo, (time.perf_counter() - inicio) / presupuesto))
+
+    muestras = np.asarray(predicciones, dtype=np.float32)
+    bajo, medio = UMBRALES_RIESGO['bajo'], UMBRALES_RIESGO['medio']
+    return {
+        'n': len(muestras),
+        'tiempo': time.perf_counter() - inicio,
+        'muestras': muestras,
+        'percentiles': dict(zip(PERCENTILES, np.percentile(muestras, PERCENTILES).tolist())),
+        'prob_niveles': {
+            'Bajo': float(np.mean(muestras < bajo)),
+            'Medio': float(np.mean((muestras >= bajo) & (muestras < medio))),
+            'Alto': float(np.mean(muestras >= medio))
+        },
+        'prob_superar': {'bajo': float(np.mean(muestras >= bajo)), 'medio': float(np.mean(muestras >= medio))}
+    }
@@ -1,6 +1,10 @@
+import threading
+import time
 import requests
-import plotly.graph_objects as go
-from config import API_URL, COLORS, COLORS_ALPHA, UMBRALES_RIESGO, UMBRALES_CLUSTER
+from config import (
+    API_URL, COLORS, UMBRALES_RIESGO, UMBRALES_CLUSTER,
+    HEALTH_POLL_INTERVAL, HEALTH_STALE_AFTER
+)
 
 def check_api_health():
     try:
@@ -12,6 +16,46 @@ def check_api_health():
         print(f"Error verificando salud de API: {e}")
         return None
 
+# Instantánea de salud compartida por todas las pestañas del proceso
+_health_lock = threading.Lock()
+_health_snapshot = {'data': None, 'timestamp': None}
+_health_thread = None
+
+def _refresh_health_snapshot():
+    data = check_api_health()
+    with _health_lock:
+        _health_snapshot['data'] = data
+        _health_snapshot['timestamp'] = time.monotonic()
+
+def _health_poll_loop():
+    while True:
+        time.sleep(HEALTH_POLL_INTERVAL)
+        _refresh_health_snapshot()
+
+def start_health_poller():
+    """Arranca (una vez por proceso) el hilo que refresca la salud de la API"""
+    global _health_thread
+    with _health_lock:
+        # Tras un fork (gunicorn) el hilo del padre no existe en el hijo
+        if _health_thread is not None and _health_thread.is_alive():
+            return
+        _health_thread = threading.Thread(
+            target=_health_poll_loop, name='api-health-poller', daemon=True
+        )
+        primed = _health_snapshot['timestamp'] is not None
+        _health_thread.start()
+    if not primed:
+        _refresh_health_snapshot()
+
+def get_api_health_snapshot():
+    """Última respuesta de /health, o None si no hay datos recientes"""
+    start_health_poller()
+    with _health_lock:
+        data, timestamp = _health_snapshot['data'], _health_snapshot['timestamp']
+    if timestamp is None or time.monotonic() - timestamp > HEALTH_STALE_AFTER:
+        return None
+    return data
+
 def get_kmeans_features():
     try:
         response = requests.get(f"{API_URL}/kmeans/features", timeout=5)
@@ -33,6 +77,19 @@ def predict_catboost(data):
         print(f"Error en predicción CatBoost: {e}")
         return None
 
+def predict_catboost_batch(registros):
+    """Predicciones CatBoost de varios registros en una sola petición (mismo orden)"""
+    if not registros:
+        return []
+    try:
+        response = requests.post(f"{API_URL}/predict/catboost/batch", json={"registros": registros}, timeout=30)
+        if response.status_code == 200:
+            return response.json().get('predicciones')
+        return None
+    except Exception as e:
+        print(f"Error en predicción CatBoost (lote): {e}")
+        return None
+
 def predict_kmeans(valores):
     try:
         response = requests.post(f"{API_URL}/predict/kmeans", json={"valores": valores}, timeout=10)
@@ -60,33 +117,3 @@ def get_vulnerability_level(cluster):
         'Crítico': COLORS['danger']
     }
     return nivel, color_map.get(nivel, COLORS['neutral'])
-
-def create_gauge_chart(value, title, max_value=100):
-    nivel, color = get_risk_level(value)
-    
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=value,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': title, 'font': {'size': 16, 'color': COLORS['text'], 'family': 'Inter, sans-serif'}},
-        number={'suffix': " /100k", 'font': {'size': 32, 'color': COLORS['text'], 'family': 'Inter, sans-serif'}},
-        gauge={
-            'axis': {'range': [None, max_value], 'tickwidth': 1, 'tickcolor': COLORS['border'], 'tickfont': {'size': 11, 'color': COLORS['neutral']}},
-            'bar': {'color': color, 'thickness': 0.7},
-            'bgcolor': 'white',
-            'borderwidth': 2,
-            'bordercolor': COLORS['border'],
-            'steps': [
-                {'range': [0, UMBRALES_RIESGO['bajo']], 'color': COLORS_ALPHA['secondary_10']},
-                {'range': [UMBRALES_RIESGO['bajo'], UMBRALES_RIESGO['medio']], 'color': COLORS_ALPHA['warning_10']},
-                {'range': [UMBRALES_RIESGO['medio'], max_value], 'color': COLORS_ALPHA['danger_10']}
-            ],
-            'threshold': {'line': {'color': color, 'width': 3}, 'thickness': 0.8, 'value': value}
-        }
-    ))
-    
-    fig.update_layout(
-        height=320, margin=dict(l=20, r=20, t=50, b=20),
-        paper_bgcolor='rgba(0,0,0,0)', font={'family': 'Inter, sans-serif'}
-    )
-    return fig
\ No newline at end of file
@@ -0,0 +1,149 @@
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+from alertas_data import ALERTAS_DEMO, NIVELES_ALERTA, SORT_KEYS, AlertasIndex
+
+# ============================================================
+# CONSISTENCIA DE AlertasIndex.update_municipio
+# ============================================================
+# Uso:
+#   python verificar_alertas.py [--municipios 2000] [--actualizaciones 5000] [--semilla 0]
+#
+# Sobre una tabla sintética:
+#   secuencial:  tras cada lote de actualizaciones aleatorias compara
+#                query() con pandas (filtro + sort_values), los conteos
+#                incrementales con value_counts y la permutación con su rango
+#   concurrente: un hilo escribe mientras otro consulta; cada consulta debe
+#                devolver cada fila una sola vez y los niveles deben cubrir
+#                la tabla sin repetir filas
+# Sale con error ante la primera inconsistencia.
+
+
+def tabla_sintetica(n, rng):
+    departamentos = sorted(set(ALERTAS_DEMO['Departamento']))
+    return pd.DataFrame({
+        'Municipio': [f"Municipio {i:05d}" for i in range(n)],
+        'Departamento': rng.choice(departamentos, n),
+        # Valores redondeados para que haya empates en la tasa
+        'Tasa_Proyectada': np.round(rng.uniform(10, 60, n), 1),
+        'Cluster': rng.integers(0, 4, n),
+        'Nivel_Alerta': rng.choice(NIVELES_ALERTA, n),
+        'Poblacion_Menores': rng.integers(1000, 300000, n)
+    })
+
+
+def actualizacion_aleatoria(index, rng):
+    row_id = int(rng.integers(len(index)))
+    return row_id, float(np.round(rng.uniform(10, 60), 1)), str(rng.choice(NIVELES_ALERTA))
+
+
+def _falla(mensaje):
+    raise SystemExit(f"❌ {mensaje}")
+
+
+def verificar_orden(index, ids, filtro, option):
+    """Mismas filas que pandas y claves de orden en secuencia (los empates pueden variar)"""
+    column, descending = SORT_KEYS[option]
+    esperado = index.data[filtro].sort_values(column, ascending=not descending, kind='stable')
+    if sorted(ids.tolist()) != sorted(esperado.index.tolist()):
+        _falla(f"{option}: filas distintas a pandas")
+    if index.data[column].to_numpy()[ids].tolist() != esperado[column].tolist():
+        _falla(f"{option}: orden distinto a pandas")
+
+
+def verificar_estado(index):
+    data = index.data
+    for option, (order, rank) in index.orders.items():
+        if not np.array_equal(rank[order], np.arange(len(order))):
+            _falla(f"{option}: rango desalineado con la permutación")
+    for nivel, ids in index.by_nivel.items():
+        if not np.array_equal(ids, np.flatnonzero(data['Nivel_Alerta'].to_numpy() == nivel)):
+            _falla(f"índice de nivel '{nivel}' desactualizado")
+
+    for departamento in ['all'] + sorted(index.by_departamento):
+        filas = data if departamento == 'all' else data[data['Departamento'] == departamento]
+        esperado = filas['Nivel_Alerta'].value_counts()
+        if index.agregados.counts(departamento) != {n: int(esperado.get(n, 0)) for n in NIVELES_ALERTA}:
+            _falla(f"conteos de '{departamento}' distintos a value_counts")
+
+    for departamento in ['all'] + sorted(index.by_departamento):
+        for nivel in ['all'] + NIVELES_ALERTA:
+            filtro = pd.Series(True, index=data.index)
+            if departamento != 'all':
+                filtro &= data['Departamento'] == departamento
+            if nivel != 'all':
+                filtro &= data['Nivel_Alerta'] == nivel
+            for option in SORT_KEYS:
+                verificar_orden(index, index.query(departamento, nivel, option), filtro, option)
+
+
+def secuencial(index, actualizaciones, rng, lotes=10):
+    verificar_estado(index)
+    por_lote = max(1, actualizaciones // lotes)
+    for _ in range(lotes):
+        for _ in range(por_lote):
+            index.update_municipio(*actualizacion_aleatoria(index, rng))
+        verificar_estado(index)
+
+
+def concurrente(index, actualizaciones, semilla):
+    errores = []
+    terminado = threading.Event()
+    total = len(index)
+
+    def escritor():
+        rng = np.random.default_rng(semilla + 1)
+        try:
+            for _ in range(actualizaciones):
+                index.update_municipio(*actualizacion_aleatoria(index, rng))
+        finally:
+            terminado.set()
+
+    def lector():
+        consultas = 0
+        while not terminado.is_set() or consultas == 0:
+            consultas += 1
+            for option in SORT_KEYS:
+                ids = index.query(sort_option=option)
+                if len(ids) != total or len(np.unique(ids)) != total:
+                    errores.append(f"{option}: la tabla completa no trae cada fila una vez")
+                for nivel in NIVELES_ALERTA:
+                    ids = index.query(nivel=nivel, sort_option=option)
+                    if len(np.unique(ids)) != len(ids):
+                        errores.append(f"{option}/{nivel}: filas repetidas")
+            particion = np.concatenate(list(index.by_nivel.values()))
+            if len(particion) != total or len(np.unique(particion)) != total:
+                errores.append("los niveles no cubren la tabla exactamente una vez")
+            if errores:
+                return
+        print(f"   {consultas} rondas de consultas durante las escrituras")
+
+    hilos = [threading.Thread(target=escritor), threading.Thread(target=lector)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    if errores:
+        _falla(errores[0])
+    verificar_estado(index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica la consistencia del índice de alertas")
+    parser.add_argument('--municipios', type=int, default=2000)
+    parser.add_argument('--actualizaciones', type=int, default=5000)
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semilla)
+    index = AlertasIndex(tabla_sintetica(args.municipios, rng))
+
+    secuencial(index, args.actualizaciones, rng)
+    print(f"✅ Secuencial: {args.actualizaciones} actualizaciones coinciden con pandas")
+    concurrente(index, args.actualizaciones, args.semilla)
+    print(f"✅ Concurrente: {args.actualizaciones} actualizaciones sin lecturas inconsistentes")
+
+
+if __name__ == '__main__':
+    main()